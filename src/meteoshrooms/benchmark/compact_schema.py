@@ -0,0 +1,135 @@
+"""Compare the memory and file size of the plain and compact weather layouts
+
+Run with ``python -m meteoshrooms.benchmark.compact_schema``. Synthetic weather
+data of 30 days is written to weather_data.parquet once with station_abbr and
+station_name as strings and once in the compact layout, which is measured
+together with its station join table.
+"""
+
+import tempfile
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.data_preparation.compact_schema import (
+    compact_weather_frame,
+    create_weather_stations,
+    save_weather_stations,
+)
+from meteoshrooms.data_preparation.constants import WEATHER_STATIONS_FILE_NAME
+from meteoshrooms.data_preparation.data_preparation import (
+    save_weather_data_to_parquet,
+)
+
+app = typer.Typer()
+
+
+@dataclass(frozen=True)
+class LayoutResult:
+    """In-memory and on-disk size of weather data in one layout"""
+
+    layout: str
+    memory_bytes: int
+    file_bytes: int
+
+
+def benchmark_layouts(
+    n_stations: int = 300, n_days: int = 30
+) -> tuple[LayoutResult, LayoutResult]:
+    """Write weather data in the plain and the compact layout and read it back
+
+    Parameters
+    ----------
+    n_stations: int
+        Number of stations
+    n_days: int
+        Days of hourly weather data per station
+
+    Returns
+    -------
+        LayoutResult of the plain and of the compact layout
+    """
+    frame_weather: pl.DataFrame = generate_weather_frame(n_stations, n_days)
+    frame_stations: pl.DataFrame = create_weather_stations(
+        generate_meta_stations_frame(n_stations).lazy(), frame_weather.lazy()
+    )
+    frame_compact: pl.LazyFrame = compact_weather_frame(
+        frame_weather.lazy(), frame_stations.schema['station_abbr']
+    )
+    results: list[LayoutResult] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for layout, frame_layout in (
+            ('plain', frame_weather.lazy()),
+            ('compact', frame_compact),
+        ):
+            layout_path: Path = Path(tmpdir, layout)
+            layout_path.mkdir()
+            save_weather_data_to_parquet(frame_layout, layout_path)
+            file_paths: list[Path] = [Path(layout_path, 'weather_data.parquet')]
+            if layout == 'compact':
+                file_paths.append(save_weather_stations(frame_stations, layout_path))
+            results.append(
+                LayoutResult(
+                    layout=layout,
+                    memory_bytes=sum(
+                        int(pl.read_parquet(file_path).estimated_size())
+                        for file_path in file_paths
+                    ),
+                    file_bytes=sum(
+                        file_path.stat().st_size for file_path in file_paths
+                    ),
+                )
+            )
+    plain, compact = results
+    return plain, compact
+
+
+def calculate_saving(plain: int, compact: int) -> float:
+    return 1 - compact / plain
+
+
+def create_results_table(results: Sequence[LayoutResult]) -> Table:
+    """Tabulate the sizes of each layout and its saving over the first one"""
+    table: Table = Table(title='Weather data layouts')
+    for column in ('Layout', 'Memory (MiB)', 'Saving', 'File (MiB)', 'Saving'):
+        table.add_column(column, justify='left' if column == 'Layout' else 'right')
+    plain: LayoutResult = results[0]
+    for result in results:
+        table.add_row(
+            result.layout,
+            f'{result.memory_bytes / 2**20:.2f}',
+            f'{calculate_saving(plain.memory_bytes, result.memory_bytes):.1%}',
+            f'{result.file_bytes / 2**20:.2f}',
+            f'{calculate_saving(plain.file_bytes, result.file_bytes):.1%}',
+        )
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    n_days: Annotated[
+        int, typer.Option('--days', min=1, help='Days of hourly data per station')
+    ] = 30,
+) -> None:
+    Console().print(
+        create_results_table(benchmark_layouts(n_stations, n_days)),
+        f'{n_stations} stations over {n_days} days, the compact layout includes '
+        f'{WEATHER_STATIONS_FILE_NAME}',
+    )
+
+
+if __name__ == '__main__':
+    app()
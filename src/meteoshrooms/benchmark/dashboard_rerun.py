@@ -0,0 +1,273 @@
+"""Measure the rerun latency of the dashboard without a browser
+
+Run with ``python -m meteoshrooms.benchmark.dashboard_rerun``. The dashboard
+is run headless with Streamlit's AppTest on synthetic Parquet files, and
+typical interactions are replayed. For every interaction the p50 and p95 of
+the rerun time are reported, in total and per section of the dashboard.
+
+The runs happen in a fresh process, which reads the synthetic data through
+the METEOSHROOMS_DATA_PATH environment variable.
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from streamlit.testing.v1 import AppTest
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.meta_map import generate_parameter_catalogue
+from meteoshrooms.benchmark.streaming_pipeline import run_in_subprocess
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.constants import DATA_PATH_ENVIRONMENT_VARIABLE
+from meteoshrooms.dashboard.constants import SECTION_SECONDS_KEY, TIME_PERIODS
+from meteoshrooms.data_preparation.constants import TIME_PERIODS as METRICS_PERIODS
+from meteoshrooms.data_preparation.data_preparation import (
+    create_metrics,
+    save_metadata_to_parquet,
+    save_metrics_to_parquet,
+)
+from meteoshrooms.data_preparation.map_frame import save_map_frame
+from meteoshrooms.data_preparation.rollups import save_weather_rollups
+
+app = typer.Typer()
+
+DASHBOARD_MODULE: str = 'meteoshrooms.dashboard.dashboard'
+# Station selected when the dashboard opens, which must exist in the data
+DASHBOARD_DEFAULT_STATION: str = 'Airolo'
+DASHBOARD_RERUN_TIMEOUT: float = 60.0
+# Selections the station interaction alternates between, as list positions
+STATION_SELECTIONS: tuple[tuple[int, ...], ...] = ((0,), (0, 1, 2))
+
+
+@dataclass(frozen=True)
+class RerunResult:
+    """Rerun time percentiles of one interaction, in total or of a section"""
+
+    interaction: str
+    section: str
+    samples: int
+    p50_seconds: float
+    p95_seconds: float
+
+
+def write_dashboard_data(data_path: Path, n_stations: int, n_days: int) -> None:
+    """Write the synthetic Parquet files the dashboard reads
+
+    Parameters
+    ----------
+    data_path: Path
+        Directory to write the files to
+    n_stations: int
+        Number of stations, the first one is named after the default station
+    n_days: int
+        Days of hourly weather data per station
+    """
+    rename_default_station: pl.Expr = pl.col('station_name').replace(
+        {'Aaa': DASHBOARD_DEFAULT_STATION}
+    )
+    weather_data: pl.LazyFrame = (
+        generate_weather_frame(n_stations, n_days)
+        .with_columns(rename_default_station)
+        .lazy()
+    )
+    meta_stations: pl.LazyFrame = (
+        generate_meta_stations_frame(n_stations)
+        .with_columns(rename_default_station)
+        .lazy()
+    )
+    save_weather_rollups(weather_data, data_path)
+    save_metrics_to_parquet(create_metrics(weather_data, METRICS_PERIODS), data_path)
+    save_map_frame(
+        meta_stations, pl.scan_parquet(Path(data_path, 'metrics.parquet')), data_path
+    )
+    save_metadata_to_parquet(meta_stations, data_path, 'stations')
+    save_metadata_to_parquet(
+        generate_parameter_catalogue().lazy(), data_path, 'parameters'
+    )
+
+
+def find_module_path(module: str) -> str:
+    spec: ModuleSpec | None = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None:
+        raise ModuleNotFoundError(f'{module} not found')
+    return spec.origin
+
+
+def change_stations(at: AppTest, i: int) -> None:
+    station_names: list[str] = at.multiselect(
+        key='stations_options_multiselect'
+    ).options
+    at.multiselect(key='stations_options_multiselect').set_value(
+        [station_names[j] for j in STATION_SELECTIONS[i % len(STATION_SELECTIONS)]]
+    )
+
+
+def switch_time_period(at: AppTest, i: int) -> None:
+    time_periods: list[int] = list(TIME_PERIODS)
+    at.button_group[0].set_value([time_periods[i % len(time_periods)]])
+
+
+def toggle_map(at: AppTest, i: int) -> None:
+    at.toggle[0].set_value(not at.toggle[0].value)
+
+
+INTERACTIONS: dict[str, Callable[[AppTest, int], None]] = {
+    'rerun': lambda at, i: None,
+    'change stations': change_stations,
+    'switch time period': switch_time_period,
+    'toggle map': toggle_map,
+}
+
+
+def set_single_select_values(at: AppTest) -> None:
+    """Pass the value of single select pills on as AppTest expects it
+
+    Streamlit keeps the value of single select pills as the option itself,
+    but AppTest sends the value of every button group as a list of options.
+    """
+    for button_group in at.button_group:
+        value: object = button_group.value
+        if not isinstance(value, list):
+            button_group.set_value([] if value is None else [value])
+
+
+def run_timed(at: AppTest) -> dict[str, float]:
+    set_single_select_values(at)
+    start: float = time.perf_counter()
+    at.run(timeout=DASHBOARD_RERUN_TIMEOUT)
+    seconds: float = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return {'total': seconds} | dict(at.session_state[SECTION_SECONDS_KEY])
+
+
+def summarize_samples(
+    interaction: str, samples: Iterable[dict[str, float]]
+) -> list[RerunResult]:
+    samples_per_section: dict[str, list[float]] = {}
+    for sample in samples:
+        for section, seconds in sample.items():
+            samples_per_section.setdefault(section, []).append(seconds)
+    return [
+        RerunResult(
+            interaction=interaction,
+            section=section,
+            samples=len(section_samples),
+            p50_seconds=float(np.percentile(section_samples, 50)),
+            p95_seconds=float(np.percentile(section_samples, 95)),
+        )
+        for section, section_samples in samples_per_section.items()
+    ]
+
+
+def measure_dashboard_reruns(repeat: int = 20) -> list[RerunResult]:
+    """Replay the interactions on the dashboard and time each rerun
+
+    The data is read from the path set in METEOSHROOMS_DATA_PATH when the
+    dashboard modules were first imported.
+
+    Parameters
+    ----------
+    repeat: int
+        Reruns per interaction
+
+    Returns
+    -------
+        One RerunResult per interaction for the whole rerun and for each
+        section, starting with the first run of a new session
+    """
+    at: AppTest = AppTest.from_file(
+        find_module_path(DASHBOARD_MODULE), default_timeout=DASHBOARD_RERUN_TIMEOUT
+    )
+    results: list[RerunResult] = summarize_samples('first run', [run_timed(at)])
+    for interaction, interact in INTERACTIONS.items():
+        samples: list[dict[str, float]] = []
+        for i in range(repeat):
+            interact(at, i)
+            samples.append(run_timed(at))
+        results += summarize_samples(interaction, samples)
+    return results
+
+
+def measure_dashboard_reruns_in_subprocess(
+    data_path: Path, repeat: int
+) -> list[RerunResult]:
+    previous_data_path: str | None = os.environ.get(DATA_PATH_ENVIRONMENT_VARIABLE)
+    os.environ[DATA_PATH_ENVIRONMENT_VARIABLE] = str(data_path)
+    try:
+        return run_in_subprocess(measure_dashboard_reruns, repeat)
+    finally:
+        if previous_data_path is None:
+            del os.environ[DATA_PATH_ENVIRONMENT_VARIABLE]
+        else:
+            os.environ[DATA_PATH_ENVIRONMENT_VARIABLE] = previous_data_path
+
+
+def benchmark_dashboard_reruns(
+    n_stations: int = 300, n_days: int = 31, repeat: int = 20
+) -> list[RerunResult]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        write_dashboard_data(Path(tmpdir), n_stations, n_days)
+        return measure_dashboard_reruns_in_subprocess(Path(tmpdir), repeat)
+
+
+def write_results_json(results: Iterable[RerunResult], file_path: Path) -> None:
+    with file_path.open('w', encoding='utf-8') as f:
+        json.dump({'results': [asdict(result) for result in results]}, f, indent=1)
+
+
+def create_results_table(results: Iterable[RerunResult]) -> Table:
+    table: Table = Table(title='Dashboard reruns')
+    for column in ('Interaction', 'Section', 'Runs', 'p50 (ms)', 'p95 (ms)'):
+        table.add_column(
+            column, justify='left' if column in {'Interaction', 'Section'} else 'right'
+        )
+    for result in results:
+        table.add_row(
+            result.interaction if result.section == 'total' else '',
+            result.section,
+            str(result.samples),
+            f'{result.p50_seconds * 1000:.1f}',
+            f'{result.p95_seconds * 1000:.1f}',
+        )
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=3, help='Number of stations')
+    ] = 300,
+    n_days: Annotated[
+        int, typer.Option('--days', min=1, help='Days of hourly weather data')
+    ] = 31,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Reruns per interaction')
+    ] = 20,
+    output: Annotated[
+        Path | None, typer.Option('--output', help='Write the results to JSON')
+    ] = None,
+) -> None:
+    results: list[RerunResult] = benchmark_dashboard_reruns(n_stations, n_days, repeat)
+    Console().print(create_results_table(results))
+    if output is not None:
+        write_results_json(results, output)
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,152 @@
+"""Measure the import time of the dashboard with ``python -X importtime``
+
+Run with ``python -m meteoshrooms.benchmark.import_time``, which exits with
+status 1 if the modules of this package take longer to import than the
+budget given with ``--budget-ms``.
+"""
+
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from re import Pattern
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+app = typer.Typer()
+
+IMPORT_TIME_PATTERN: Pattern[str] = re.compile(
+    r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$'
+)
+IMPORT_TIME_MODULE_DEFAULT: str = 'meteoshrooms.dashboard.dashboard'
+IMPORT_TIME_PACKAGE: str = 'meteoshrooms'
+
+
+@dataclass(frozen=True)
+class ImportTimeEntry:
+    """Import time of a single module, as reported by -X importtime"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(stderr: str) -> list[ImportTimeEntry]:
+    """Parse the -X importtime report written to stderr
+
+    Parameters
+    ----------
+    stderr: str
+        Standard error of a Python process run with -X importtime
+
+    Returns
+    -------
+        One ImportTimeEntry per imported module, in the order of the report
+    """
+    return [
+        ImportTimeEntry(
+            module=match.group(4),
+            self_us=int(match.group(1)),
+            cumulative_us=int(match.group(2)),
+            depth=len(match.group(3)) // 2,
+        )
+        for line in stderr.splitlines()
+        if (match := IMPORT_TIME_PATTERN.match(line))
+    ]
+
+
+def measure_import_times(
+    module: str = IMPORT_TIME_MODULE_DEFAULT,
+) -> list[ImportTimeEntry]:
+    """Import a module in a fresh interpreter and report its import times
+
+    Parameters
+    ----------
+    module: str
+        Module to import
+
+    Returns
+    -------
+        One ImportTimeEntry per module imported
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        If the import fails
+    """
+    completed: subprocess.CompletedProcess = subprocess.run(  # noqa: S603
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_import_times(completed.stderr)
+
+
+def calculate_package_import_us(
+    entries: list[ImportTimeEntry], package: str = IMPORT_TIME_PACKAGE
+) -> int:
+    """Sum the self import time of the modules of a package
+
+    Third-party modules such as streamlit and polars are excluded, so that
+    the sum covers the work done at import time by the package itself.
+    """
+    return sum(
+        entry.self_us
+        for entry in entries
+        if entry.module == package or entry.module.startswith(f'{package}.')
+    )
+
+
+def create_results_table(entries: list[ImportTimeEntry], top: int) -> Table:
+    table: Table = Table(title='Slowest imports (self time)')
+    table.add_column('Module')
+    table.add_column('Self (ms)', justify='right')
+    table.add_column('Cumulative (ms)', justify='right')
+    for entry in sorted(entries, key=lambda e: e.self_us, reverse=True)[:top]:
+        table.add_row(
+            entry.module,
+            f'{entry.self_us / 1000:.1f}',
+            f'{entry.cumulative_us / 1000:.1f}',
+        )
+    return table
+
+
+@app.command()
+def main(
+    module: Annotated[
+        str, typer.Option('--module', help='Module to import')
+    ] = IMPORT_TIME_MODULE_DEFAULT,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs, fastest counts')
+    ] = 5,
+    top: Annotated[int, typer.Option('--top', min=1, help='Modules listed')] = 15,
+    budget_ms: Annotated[
+        float | None,
+        typer.Option(
+            '--budget-ms', help=f'Maximum import time of {IMPORT_TIME_PACKAGE}'
+        ),
+    ] = None,
+) -> None:
+    runs: list[list[ImportTimeEntry]] = [
+        measure_import_times(module) for _ in range(repeat)
+    ]
+    fastest: list[ImportTimeEntry] = min(
+        runs, key=lambda entries: entries[-1].cumulative_us
+    )
+    package_ms: float = calculate_package_import_us(fastest) / 1000
+    Console().print(
+        create_results_table(fastest, top),
+        f'{module}: {fastest[-1].cumulative_us / 1000:.1f} ms in total, '
+        f'{package_ms:.1f} ms in {IMPORT_TIME_PACKAGE} modules',
+    )
+    if budget_ms is not None and package_ms > budget_ms:
+        raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,136 @@
+"""Compare rendering the station map with Plotly Express and by recolouring
+
+Run with ``python -m meteoshrooms.benchmark.map_render``. Each render builds
+the figure and serializes it to JSON, as st.plotly_chart does.
+"""
+
+import time
+from collections.abc import Callable
+
+import plotly.io as pio
+import polars as pl
+import typer
+from plotly import graph_objects as go
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.dashboard.constants import WEATHER_SHORT_LABEL_DICT
+from meteoshrooms.dashboard.map_figure import (
+    create_base_map_figure_json,
+    create_map_figure_express,
+    recolor_map_figure,
+)
+from meteoshrooms.data_preparation.constants import (
+    MAP_FRAME_STATION_COLUMNS,
+    TIME_PERIODS,
+)
+from meteoshrooms.data_preparation.data_preparation import create_metrics
+from meteoshrooms.data_preparation.map_frame import create_map_frame
+
+app = typer.Typer()
+
+
+def generate_map_frame(n_stations: int = 300) -> pl.DataFrame:
+    """Generate the map frame of all time periods from synthetic data"""
+    return create_map_frame(
+        generate_meta_stations_frame(n_stations).lazy(),
+        create_metrics(
+            generate_weather_frame(n_stations, n_days=31).lazy(), TIME_PERIODS
+        ),
+    ).collect()
+
+
+def time_render(render: Callable[[], go.Figure], repeat: int) -> float:
+    durations: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        pio.to_json(render(), validate=False)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def benchmark_map_render(
+    frame_map: pl.DataFrame,
+    param_short_code: str = 'rre150h0',
+    time_period: int = 7,
+    repeat: int = 10,
+) -> dict[str, float]:
+    """Time the Plotly Express and the prebuilt map rendering
+
+    Parameters
+    ----------
+    frame_map: pl.DataFrame
+        Map frame of all time periods, as prepared
+    param_short_code: str
+        Parameter to colour the stations by
+    time_period: int
+        Time period to render
+    repeat: int
+        Number of renders per path, the fastest counts
+
+    Returns
+    -------
+        Seconds of the fastest render per path, and of building the base
+        figure once
+    """
+    frame_period: pl.DataFrame = (
+        frame_map.filter(pl.col('time_period') == time_period)
+        .drop('time_period')
+        .rename(WEATHER_SHORT_LABEL_DICT)
+    )
+    frame_stations: pl.DataFrame = frame_map.select(MAP_FRAME_STATION_COLUMNS).unique(
+        subset='station_name', maintain_order=True
+    )
+    start: float = time.perf_counter()
+    base_figure_json: str = create_base_map_figure_json(frame_stations)
+    base_seconds: float = time.perf_counter() - start
+    return {
+        'express': time_render(
+            lambda: create_map_figure_express(
+                frame_period, param_short_code, time_period
+            ),
+            repeat,
+        ),
+        'prebuilt': time_render(
+            lambda: recolor_map_figure(
+                base_figure_json, frame_period, param_short_code, time_period
+            ),
+            repeat,
+        ),
+        'prebuilt (base figure, once)': base_seconds,
+    }
+
+
+def create_results_table(results: dict[str, float]) -> Table:
+    table: Table = Table(title='Map render')
+    table.add_column('Path')
+    table.add_column('Time (ms)', justify='right')
+    for name, seconds in results.items():
+        table.add_row(name, f'{seconds * 1000:.1f}')
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Renders per path, fastest counts')
+    ] = 10,
+) -> None:
+    Console().print(
+        create_results_table(
+            benchmark_map_render(generate_map_frame(n_stations), repeat=repeat)
+        ),
+        f'{n_stations} stations',
+    )
+
+
+if __name__ == '__main__':
+    app()
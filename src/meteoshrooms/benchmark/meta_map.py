@@ -0,0 +1,194 @@
+"""Compare the row-wise and the vectorized parameter label extraction
+
+Run with ``python -m meteoshrooms.benchmark.meta_map``, optionally with
+``--catalogue`` pointing to the MeteoSwiss ogd-smn_meta_parameters.csv.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.constants import parameter_description_extraction_pattern
+from meteoshrooms.dashboard.constants import METRICS_STRINGS
+from meteoshrooms.dashboard.dashboard_utils import (
+    create_meta_map,
+    create_metrics_names_dict,
+)
+from meteoshrooms.data_preparation.constants import (
+    COLS_TO_KEEP_META_PARAMETERS,
+    METEO_CSV_ENCODING,
+    SCHEMA_META_PARAMETERS,
+)
+
+app = typer.Typer()
+
+PARAMETER_DESCRIPTIONS: tuple[tuple[str, str], ...] = (
+    ('rre150h0', 'Precipitation; hourly total'),
+    ('tre200h0', 'Air temperature 2 m above ground; hourly mean'),
+    ('ure200h0', 'Relative air humidity 2 m above ground; hourly mean'),
+    ('fu3010h0', 'Wind speed scalar; hourly mean in m/s'),
+    ('tde200h0', 'Dew point 2 m above ground; hourly mean'),
+)
+
+
+def create_meta_map_rowwise(metadata: pl.DataFrame) -> dict[str, str | None]:
+    """Previous implementation of create_meta_map(), searching row by row"""
+    return {
+        r['parameter_shortname']: (
+            result.group()
+            if (
+                result := re.search(
+                    parameter_description_extraction_pattern,
+                    r['parameter_description_en'],
+                )
+            )
+            is not None
+            else None
+        )
+        for r in metadata.to_dicts()
+    }
+
+
+def create_metrics_names_dict_rowwise(
+    meta_params_df: pl.DataFrame,
+) -> dict[str, str | None]:
+    """Previous implementation of create_metrics_names_dict()"""
+    return {
+        m: create_meta_map_rowwise(meta_params_df).get(m, '') for m in METRICS_STRINGS
+    }
+
+
+def generate_parameter_catalogue(n_rows: int = 5000) -> pl.DataFrame:
+    """Generate a parameters metadata table of the size of the MeteoSwiss one
+
+    Parameters
+    ----------
+    n_rows: int
+        Number of parameters, the metrics of the dashboard included
+
+    Returns
+    -------
+        Polars DataFrame with the parameters metadata columns kept by the
+        data preparation
+    """
+    n_filler: int = max(n_rows - len(PARAMETER_DESCRIPTIONS), 0)
+    return (
+        pl.DataFrame(
+            {
+                'parameter_shortname': [
+                    *(shortname for shortname, _ in PARAMETER_DESCRIPTIONS),
+                    *(f'x{i:05d}h0' for i in range(n_filler)),
+                ],
+                'parameter_description_en': [
+                    *(description for _, description in PARAMETER_DESCRIPTIONS),
+                    *(
+                        f'Parameter {i} (level {i % 7}); hourly mean'
+                        for i in range(n_filler)
+                    ),
+                ],
+            }
+        )
+        .with_columns(
+            pl.col('parameter_description_en').alias('parameter_description_de'),
+            pl.lit('Unknown').alias('parameter_group_de'),
+            pl.lit('unknown').alias('parameter_group_en'),
+            pl.lit('H').alias('parameter_granularity'),
+            pl.lit(1).alias('parameter_decimals'),
+            pl.lit('Float').alias('parameter_datatype'),
+            pl.lit('-').alias('parameter_unit'),
+        )
+        .select(COLS_TO_KEEP_META_PARAMETERS)
+        .head(n_rows)
+    )
+
+
+def load_parameter_catalogue(file_path: Path) -> pl.DataFrame:
+    return pl.read_csv(
+        file_path,
+        encoding=METEO_CSV_ENCODING,
+        separator=';',
+        schema=SCHEMA_META_PARAMETERS,
+        columns=COLS_TO_KEEP_META_PARAMETERS,
+    )
+
+
+def time_function(
+    function: Callable[[pl.DataFrame], Any], metadata: pl.DataFrame, repeat: int
+) -> float:
+    durations: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function(metadata)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def benchmark_meta_map(metadata: pl.DataFrame, repeat: int = 5) -> dict[str, float]:
+    """Time the row-wise and the vectorized label extraction
+
+    Parameters
+    ----------
+    metadata: pl.DataFrame
+        Parameters metadata
+    repeat: int
+        Number of runs per function, the fastest counts
+
+    Returns
+    -------
+        Seconds of the fastest run per function
+    """
+    functions: dict[str, Callable[[pl.DataFrame], Any]] = {
+        'create_meta_map (row-wise)': create_meta_map_rowwise,
+        'create_meta_map (vectorized)': create_meta_map,
+        'create_metrics_names_dict (row-wise)': create_metrics_names_dict_rowwise,
+        'create_metrics_names_dict (vectorized)': create_metrics_names_dict,
+    }
+    return {
+        name: time_function(function, metadata, repeat)
+        for name, function in functions.items()
+    }
+
+
+def create_results_table(results: dict[str, float]) -> Table:
+    table: Table = Table(title='Parameter label extraction')
+    table.add_column('Function')
+    table.add_column('Time (ms)', justify='right')
+    for name, seconds in results.items():
+        table.add_row(name, f'{seconds * 1000:.2f}')
+    return table
+
+
+@app.command()
+def main(
+    catalogue: Annotated[
+        Path | None,
+        typer.Option('--catalogue', help='MeteoSwiss parameters metadata CSV'),
+    ] = None,
+    n_rows: Annotated[
+        int, typer.Option('--rows', min=1, help='Rows of the synthetic catalogue')
+    ] = 5000,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs per function, fastest counts')
+    ] = 5,
+) -> None:
+    metadata: pl.DataFrame = (
+        load_parameter_catalogue(catalogue)
+        if catalogue is not None
+        else generate_parameter_catalogue(n_rows)
+    )
+    Console().print(
+        create_results_table(benchmark_meta_map(metadata, repeat)),
+        f'{metadata.height} parameters',
+    )
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,193 @@
+"""Compare the per-tile and the batched evaluation of the metric tiles
+
+Run with ``python -m meteoshrooms.benchmark.metric_tiles``. The per-tile
+functions below are the implementation the dashboard used before
+evaluate_metric_tiles() and the MetricsIndex, kept as reference.
+"""
+
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIME_PERIOD_VALUES, TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.dashboard.constants import (
+    METRICS_STRINGS,
+    NUM_DAYS_DELTA,
+    NUM_DAYS_VAL,
+    PARAMETER_AGGREGATION_TYPES,
+)
+from meteoshrooms.dashboard.ux_metrics import evaluate_metric_tiles
+from meteoshrooms.data_preparation.data_preparation import create_metrics
+
+app = typer.Typer()
+
+
+def filter_metrics_time_period(
+    metrics: pl.LazyFrame, station_name: str, number_days: int, metric_short_code: str
+) -> pl.LazyFrame | None:
+    return (
+        metrics.filter(
+            (pl.col('station_name') == station_name)
+            & (pl.col('time_period') == number_days)
+        ).select(pl.col(metric_short_code))
+        if metrics.select(pl.len()).collect().item() > 0
+        else None
+    )
+
+
+def calculate_metric_value(
+    df_metrics: pl.LazyFrame,
+    metric_short_code: str,
+    station_name: str,
+    number_days: int,
+) -> float | None:
+    try:
+        df_filtered: pl.LazyFrame | None = filter_metrics_time_period(
+            df_metrics, station_name, number_days, metric_short_code
+        )
+        if df_filtered is not None:
+            if metric_short_code in PARAMETER_AGGREGATION_TYPES['sum']:
+                df_filtered = df_filtered.select(
+                    pl.col(metric_short_code) / number_days
+                )
+            return df_filtered.collect().item()
+        return None
+    except ValueError:
+        # If a station has data missing, return None
+        return None
+
+
+def calculate_metric_delta(
+    metric_name: str, metrics: pl.LazyFrame, station_name: str, val: float
+) -> str:
+    val_delta: float | None = calculate_metric_value(
+        metrics, metric_name, station_name, number_days=NUM_DAYS_DELTA
+    )
+    if val_delta:
+        return str(
+            round(val - val_delta, 1),
+        )
+    return '-'
+
+
+def evaluate_metric_tiles_per_tile(
+    metrics: pl.LazyFrame, station_names: list[str]
+) -> list[tuple[float | None, str | None]]:
+    """Previous implementation of the tiles, with two queries per tile"""
+    tiles: list[tuple[float | None, str | None]] = []
+    for station_name in station_names:
+        for metric_name in METRICS_STRINGS:
+            val: float | None = calculate_metric_value(
+                metrics, metric_name, station_name, NUM_DAYS_VAL
+            )
+            tiles.append(
+                (
+                    val,
+                    calculate_metric_delta(metric_name, metrics, station_name, val)
+                    if val is not None
+                    else None,
+                )
+            )
+    return tiles
+
+
+def generate_metrics_frame(n_stations: int, n_days: int) -> pl.DataFrame:
+    end: datetime = datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+    return (
+        create_metrics(
+            generate_weather_frame(n_stations, n_days, end=end).lazy(),
+            {period: end - timedelta(days=period) for period in TIME_PERIOD_VALUES},
+        )
+        .collect()
+        .pivot(
+            'parameter',
+            index=('station_abbr', 'station_name', 'time_period'),
+            values='value',
+        )
+    )
+
+
+def time_function(
+    function: Callable[[pl.LazyFrame, list[str]], Any],
+    metrics: pl.DataFrame,
+    station_names: list[str],
+    repeat: int,
+) -> float:
+    durations: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        function(metrics.lazy(), station_names)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def benchmark_metric_tiles(
+    metrics: pl.DataFrame, station_names: list[str], repeat: int = 5
+) -> dict[str, float]:
+    """Time the per-tile and the batched evaluation of the tiles
+
+    Parameters
+    ----------
+    metrics: pl.DataFrame
+        Metrics with one column per parameter
+    station_names: list[str]
+        Stations whose tiles are evaluated
+    repeat: int
+        Number of runs per function, the fastest counts
+
+    Returns
+    -------
+        Seconds of the fastest run per function
+    """
+    functions: dict[str, Callable[[pl.LazyFrame, list[str]], Any]] = {
+        'per tile': evaluate_metric_tiles_per_tile,
+        'batch': evaluate_metric_tiles,
+    }
+    return {
+        name: time_function(function, metrics, station_names, repeat)
+        for name, function in functions.items()
+    }
+
+
+def create_results_table(results: dict[str, float]) -> Table:
+    table: Table = Table(title='Metric tiles')
+    table.add_column('Evaluation')
+    table.add_column('Time (ms)', justify='right')
+    for name, seconds in results.items():
+        table.add_row(name, f'{seconds * 1000:.2f}')
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    n_selected: Annotated[
+        int, typer.Option('--selected', min=1, help='Stations shown as tiles')
+    ] = 5,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs per function, fastest counts')
+    ] = 5,
+) -> None:
+    metrics: pl.DataFrame = generate_metrics_frame(n_stations, n_days=31)
+    station_names: list[str] = (
+        metrics['station_name'].unique().sort()[:n_selected].to_list()
+    )
+    Console().print(
+        create_results_table(benchmark_metric_tiles(metrics, station_names, repeat)),
+        f'{len(station_names)} of {n_stations} stations',
+    )
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,110 @@
+"""Compare the per-period and the single-pass aggregation of the metrics
+
+Run with ``python -m meteoshrooms.benchmark.metrics``.
+"""
+
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIME_PERIOD_VALUES, TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.constants import EXPR_WEATHER_AGGREGATION_TYPES
+from meteoshrooms.data_preparation.data_preparation import aggregate_metrics_frame
+
+app = typer.Typer()
+
+
+def concat_metrics_frame(
+    time_periods: Mapping[int, datetime], weather_data: pl.LazyFrame
+) -> pl.LazyFrame:
+    """Previous implementation of aggregate_metrics_frame(), once per period"""
+    return pl.concat(
+        tuple(
+            weather_data.filter(pl.col('reference_timestamp') >= datetime_period)
+            .drop(
+                'reference_timestamp',
+            )
+            .group_by(('station_abbr', 'station_name'))
+            .agg(*EXPR_WEATHER_AGGREGATION_TYPES)
+            .with_columns(pl.lit(period).alias('time_period').cast(pl.Int8))
+            for period, datetime_period in time_periods.items()
+        )
+    )
+
+
+def benchmark_metrics(
+    weather_data: pl.DataFrame, time_periods: Mapping[int, datetime], repeat: int = 5
+) -> dict[str, float]:
+    """Time the per-period and the single-pass aggregation of the metrics
+
+    Parameters
+    ----------
+    weather_data: pl.DataFrame
+        Hourly weather data
+    time_periods: Mapping[int, datetime]
+        Start of each time period
+    repeat: int
+        Number of runs per function, the fastest counts
+
+    Returns
+    -------
+        Seconds of the fastest run per function
+    """
+    functions: dict[
+        str, Callable[[Mapping[int, datetime], pl.LazyFrame], pl.LazyFrame]
+    ] = {
+        'per period': concat_metrics_frame,
+        'single pass': aggregate_metrics_frame,
+    }
+    results: dict[str, float] = {}
+    for name, function in functions.items():
+        durations: list[float] = []
+        for _ in range(repeat):
+            start: float = time.perf_counter()
+            function(time_periods, weather_data.lazy()).collect()
+            durations.append(time.perf_counter() - start)
+        results[name] = min(durations)
+    return results
+
+
+def create_results_table(results: dict[str, float]) -> Table:
+    table: Table = Table(title='Metrics aggregation')
+    table.add_column('Aggregation')
+    table.add_column('Time (ms)', justify='right')
+    for name, seconds in results.items():
+        table.add_row(name, f'{seconds * 1000:.2f}')
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs per function, fastest counts')
+    ] = 5,
+) -> None:
+    end: datetime = datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+    Console().print(
+        create_results_table(
+            benchmark_metrics(
+                generate_weather_frame(n_stations, n_days=31, end=end),
+                {period: end - timedelta(days=period) for period in TIME_PERIOD_VALUES},
+                repeat,
+            )
+        ),
+        f'{n_stations} stations over 31 days',
+    )
+
+
+if __name__ == '__main__':
+    app()
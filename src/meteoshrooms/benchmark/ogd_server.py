@@ -0,0 +1,447 @@
+"""Serve generated MeteoSwiss OGD files from a local HTTP server
+
+The server stands in for the OGD endpoint, so that the data preparation can
+run end to end without the network. Latency, server errors and a bandwidth
+limit can be configured to exercise the retries and the concurrency of
+download_files().
+
+Run ``python -m meteoshrooms.benchmark.ogd_server serve`` and point the data
+preparation to the printed URL with ``--base-url``, or run
+``python -m meteoshrooms.benchmark.ogd_server download`` to time the
+downloads of all station files.
+"""
+
+import random
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.meta_map import PARAMETER_DESCRIPTIONS
+from meteoshrooms.benchmark.pipeline import create_synthetic_metadata
+from meteoshrooms.benchmark.synthetic import (
+    generate_weather_frame,
+    write_station_csv_dataset,
+)
+from meteoshrooms.data_preparation.constants import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MAX_WORKERS,
+    DOWNLOAD_RETRY_KWARGS,
+    META_FILE_PATH_DICT,
+    SCHEMA_META_DATAINVENTORY,
+    SCHEMA_META_PARAMETERS,
+    SCHEMA_META_STATIONS,
+)
+from meteoshrooms.data_preparation.data_preparation import (
+    filter_stations_to_series,
+    filter_unique_station_names,
+    generate_file_path_series,
+)
+from meteoshrooms.data_preparation.download import DownloadResult, download_files
+
+app = typer.Typer()
+
+OGD_SERVER_HOST: str = '127.0.0.1'
+
+
+@dataclass(frozen=True)
+class OGDServerConfig:
+    """Network conditions simulated by the server
+
+    Attributes
+    ----------
+    latency_seconds: float
+        Delay before every response
+    error_rate: float
+        Share of requests answered with one of error_statuses
+    error_statuses: tuple[int, ...]
+        Statuses of the simulated errors, by default those that are retried
+    bandwidth_bytes_per_second: int | None
+        Transfer rate of every response body, unlimited if None
+    seed: int
+        Seed of the random number generator choosing the failing requests
+    """
+
+    latency_seconds: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = tuple(DOWNLOAD_RETRY_KWARGS['status_forcelist'])
+    bandwidth_bytes_per_second: int | None = None
+    seed: int = 0
+
+
+@dataclass
+class OGDServerStats:
+    """Responses sent by the server, counted per status"""
+
+    status_counts: Counter[int] = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def count(self, status: int) -> None:
+        with self.lock:
+            self.status_counts[status] += 1
+
+
+class OGDRequestHandler(SimpleHTTPRequestHandler):
+    """Serve files by the last part of the URL path under simulated conditions
+
+    As the file names of the OGD endpoint are unique, the files are served
+    from a flat directory instead of the directory layout of the endpoint.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        config: OGDServerConfig,
+        stats: OGDServerStats,
+        rng: random.Random,
+        **kwargs: Any,
+    ) -> None:
+        self.config: OGDServerConfig = config
+        self.stats: OGDServerStats = stats
+        self.rng: random.Random = rng
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        time.sleep(self.config.latency_seconds)
+        if self.rng.random() < self.config.error_rate:
+            self.send_error(self.rng.choice(self.config.error_statuses))
+            return
+        super().do_GET()
+
+    def translate_path(self, path: str) -> str:
+        return super().translate_path('/' + Path(path.split('?')[0]).name)
+
+    # The handler only serves files opened in binary mode
+    def copyfile(  # type: ignore[override]
+        self, source: BinaryIO, outputfile: BinaryIO
+    ) -> None:
+        if self.config.bandwidth_bytes_per_second is None:
+            super().copyfile(source, outputfile)
+            return
+        while chunk := source.read(DOWNLOAD_CHUNK_SIZE):
+            # Sleeping before the write keeps the last chunk from arriving early
+            time.sleep(len(chunk) / self.config.bandwidth_bytes_per_second)
+            outputfile.write(chunk)
+
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self.stats.count(code)
+        super().send_response(code, message)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def serve_ogd_files(
+    served_path: Path,
+    config: OGDServerConfig | None = None,
+    stats: OGDServerStats | None = None,
+    port: int = 0,
+) -> Iterator[str]:
+    """Serve a directory of OGD files in a background thread
+
+    Parameters
+    ----------
+    served_path: Path
+        Directory with the files, as written by write_ogd_files()
+    config: OGDServerConfig | None
+        Simulated network conditions, none if None
+    stats: OGDServerStats | None
+        Counter of the responses sent
+    port: int
+        Port to listen on, any free port if 0
+
+    Yields
+    ------
+        Base URL of the server, to be used in place of URL_GEO_ADMIN_BASE
+    """
+    if config is None:
+        config = OGDServerConfig()
+    if stats is None:
+        stats = OGDServerStats()
+    server: ThreadingHTTPServer = ThreadingHTTPServer(
+        (OGD_SERVER_HOST, port),
+        partial(
+            OGDRequestHandler,
+            config=config,
+            stats=stats,
+            rng=random.Random(config.seed),  # noqa: S311
+            directory=str(served_path),
+        ),
+    )
+    thread: threading.Thread = threading.Thread(
+        target=server.serve_forever, daemon=True
+    )
+    thread.start()
+    try:
+        yield f'http://{OGD_SERVER_HOST}:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def fill_schema(frame: pl.DataFrame, schema: dict) -> pl.DataFrame:
+    """Add the columns of a MeteoSwiss metadata file missing in frame"""
+    return frame.with_columns(
+        pl.lit(None, dtype=dtype).alias(column)
+        for column, dtype in schema.items()
+        if column not in frame.columns
+    ).select(list(schema))
+
+
+def write_ogd_files(served_path: Path, n_stations: int, n_days: int) -> None:
+    """Write the metadata and station files of the OGD endpoint
+
+    Parameters
+    ----------
+    served_path: Path
+        Directory to write the files to
+    n_stations: int
+        Number of stations, every few of which are precipitation stations
+    n_days: int
+        Days of hourly data in the recent files
+    """
+    frame_stations: pl.DataFrame = fill_schema(
+        create_synthetic_metadata(n_stations), SCHEMA_META_STATIONS
+    )
+    frame_parameters: pl.DataFrame = fill_schema(
+        pl.DataFrame(
+            {
+                'parameter_shortname': [name for name, _ in PARAMETER_DESCRIPTIONS],
+                'parameter_description_en': [
+                    description for _, description in PARAMETER_DESCRIPTIONS
+                ],
+                'parameter_granularity': 'H',
+                'parameter_decimals': 1,
+                'parameter_datatype': 'Float',
+            },
+            schema_overrides={'parameter_decimals': pl.Int8},
+        ),
+        SCHEMA_META_PARAMETERS,
+    )
+    frame_datainventory: pl.DataFrame = fill_schema(
+        frame_stations.select('station_abbr').join(
+            frame_parameters.select('parameter_shortname'), how='cross'
+        ),
+        SCHEMA_META_DATAINVENTORY,
+    )
+    is_precipitation: pl.Expr = pl.col('station_type_en').str.contains('precipitation')
+    for meta_type, frame_meta in (
+        ('stations', frame_stations),
+        ('parameters', frame_parameters),
+        ('datainventory', frame_datainventory),
+    ):
+        for url in META_FILE_PATH_DICT[meta_type]:
+            file_name: str = Path(url).name
+            if meta_type == 'stations':
+                frame_meta = frame_stations.filter(
+                    is_precipitation
+                    if file_name.startswith('ogd-smn-precip_')
+                    else ~is_precipitation
+                    if file_name.startswith('ogd-smn_')
+                    else pl.lit(False)
+                )
+            frame_meta.write_csv(Path(served_path, file_name), separator=';')
+    write_station_csv_dataset(
+        generate_weather_frame(n_stations, n_days),
+        served_path,
+        precipitation_stations=frame_stations.filter(is_precipitation)[
+            'station_abbr'
+        ].to_list(),
+    )
+
+
+def generate_station_urls(served_path: Path, base_url: str) -> list[str]:
+    """URLs of all station files, as load_weather() generates them"""
+    stations: pl.DataFrame = filter_unique_station_names(
+        pl.scan_csv(
+            [
+                Path(served_path, Path(url).name)
+                for url in META_FILE_PATH_DICT['stations']
+            ],
+            separator=';',
+            schema=SCHEMA_META_STATIONS,
+        )
+    ).collect()
+    return [
+        url
+        for timeframe in ('now', 'recent')
+        for url in generate_file_path_series(
+            filter_stations_to_series(stations, 'Automatic precipitation stations'),
+            filter_stations_to_series(stations, 'Automatic weather stations'),
+            timeframe=timeframe,
+            base_url=base_url,
+        )
+    ]
+
+
+@dataclass(frozen=True)
+class DownloadBenchmarkResult:
+    """Throughput of download_files() under one server configuration"""
+
+    files: int
+    failed: int
+    bytes_written: int
+    seconds: float
+    status_counts: dict[int, int]
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_written / self.seconds
+
+
+def benchmark_downloads(
+    served_path: Path,
+    down_path: Path,
+    config: OGDServerConfig,
+    max_workers: int = DOWNLOAD_MAX_WORKERS,
+) -> DownloadBenchmarkResult:
+    """Download all station files from the local server and time it
+
+    Parameters
+    ----------
+    served_path: Path
+        Directory with the files, as written by write_ogd_files()
+    down_path: Path
+        Directory to download the files to
+    config: OGDServerConfig
+        Simulated network conditions
+    max_workers: int
+        Maximum number of downloads in flight
+
+    Returns
+    -------
+        DownloadBenchmarkResult of the downloads
+    """
+    stats: OGDServerStats = OGDServerStats()
+    with serve_ogd_files(served_path, config, stats) as base_url:
+        urls: list[str] = generate_station_urls(served_path, base_url)
+        start: float = time.perf_counter()
+        results: list[DownloadResult] = download_files(
+            urls, down_path, max_workers=max_workers
+        )
+        seconds: float = time.perf_counter() - start
+    return DownloadBenchmarkResult(
+        files=len(results),
+        failed=sum(not result.ok for result in results),
+        bytes_written=sum(result.bytes_written for result in results),
+        seconds=seconds,
+        status_counts=dict(sorted(stats.status_counts.items())),
+    )
+
+
+def create_results_table(
+    results: Sequence[tuple[int, DownloadBenchmarkResult]],
+) -> Table:
+    table: Table = Table(title='Downloads from the local OGD server')
+    for column in ('Workers', 'Files', 'Failed', 'Time (s)', 'MiB/s', 'Responses'):
+        table.add_column(column, justify='right')
+    for max_workers, result in results:
+        table.add_row(
+            str(max_workers),
+            str(result.files),
+            str(result.failed),
+            f'{result.seconds:.2f}',
+            f'{result.bytes_per_second / 2**20:.1f}',
+            ', '.join(
+                f'{status}: {count}' for status, count in result.status_counts.items()
+            ),
+        )
+    return table
+
+
+OptionStations = Annotated[
+    int, typer.Option('--stations', min=1, help='Number of stations')
+]
+OptionDays = Annotated[
+    int, typer.Option('--days', min=1, help='Days of hourly data per station')
+]
+OptionLatency = Annotated[
+    float, typer.Option('--latency', min=0, help='Delay before every response in s')
+]
+OptionErrorRate = Annotated[
+    float,
+    typer.Option(
+        '--error-rate', min=0, max=1, help='Share of requests answered with 5xx'
+    ),
+]
+OptionBandwidth = Annotated[
+    int | None,
+    typer.Option('--bandwidth', min=1, help='Bytes per second per response'),
+]
+
+
+@app.command()
+def serve(
+    n_stations: OptionStations = 300,
+    n_days: OptionDays = 365,
+    latency: OptionLatency = 0.0,
+    error_rate: OptionErrorRate = 0.0,
+    bandwidth: OptionBandwidth = None,
+    port: Annotated[int, typer.Option('--port', help='Port to listen on')] = 8000,
+) -> None:
+    """Serve generated OGD files until interrupted"""
+    config: OGDServerConfig = OGDServerConfig(
+        latency_seconds=latency,
+        error_rate=error_rate,
+        bandwidth_bytes_per_second=bandwidth,
+    )
+    with (
+        tempfile.TemporaryDirectory() as tmpdir,
+        serve_ogd_files(Path(tmpdir), config, port=port) as base_url,
+    ):
+        write_ogd_files(Path(tmpdir), n_stations, n_days)
+        Console().print(f'Serving {n_stations} stations at {base_url}')
+        with suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+
+@app.command()
+def download(
+    n_stations: OptionStations = 300,
+    n_days: OptionDays = 365,
+    latency: OptionLatency = 0.05,
+    error_rate: OptionErrorRate = 0.0,
+    bandwidth: OptionBandwidth = None,
+    max_workers: Annotated[
+        list[int] | None,
+        typer.Option('--max-workers', min=1, help='Concurrent downloads to compare'),
+    ] = None,
+) -> None:
+    """Time the downloads of all station files from a local OGD server"""
+    if max_workers is None:
+        max_workers = [1, DOWNLOAD_MAX_WORKERS]
+    config: OGDServerConfig = OGDServerConfig(
+        latency_seconds=latency,
+        error_rate=error_rate,
+        bandwidth_bytes_per_second=bandwidth,
+    )
+    results: list[tuple[int, DownloadBenchmarkResult]] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        served_path: Path = Path(tmpdir, 'served')
+        served_path.mkdir()
+        write_ogd_files(served_path, n_stations, n_days)
+        for workers in max_workers:
+            down_path: Path = Path(tmpdir, f'down_{workers}')
+            down_path.mkdir()
+            results.append(
+                (workers, benchmark_downloads(served_path, down_path, config, workers))
+            )
+    Console().print(create_results_table(results))
+
+
+if __name__ == '__main__':
+    app()
@@ -0,0 +1,397 @@
+"""Time the steps of the data preparation pipeline on synthetic station files
+
+Run with ``python -m meteoshrooms.benchmark.pipeline``. The station CSV files
+are generated as MeteoSwiss publishes them and parsed as if downloaded, so
+the benchmark runs offline. Results can be written to JSON with ``--output``
+and compared against an earlier run with ``--baseline``, in which case the
+command exits with status 1 if a step got slower than the tolerance allows.
+"""
+
+import json
+import platform
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import (
+    WEATHER_COLUMNS,
+    generate_meta_stations_frame,
+    generate_weather_frame,
+    write_station_csv_dataset,
+)
+from meteoshrooms.data_preparation.constants import TIME_PERIODS
+from meteoshrooms.data_preparation.data_preparation import (
+    concat_rainfall_weather_lazyframes,
+    create_kwargs_lazyframe,
+    create_metrics,
+    create_rainfall_weather_lazyframes,
+    filter_stations_to_series,
+    filter_unique_station_names,
+    generate_file_path_series,
+    parse_weather_files,
+    save_metrics_to_parquet,
+    save_weather_data_to_parquet,
+    update_weather_data,
+)
+from meteoshrooms.data_preparation.download import DownloadResult
+from meteoshrooms.data_preparation.rollups import save_weather_rollups
+
+app = typer.Typer()
+
+PIPELINE_SCALES: dict[str, tuple[int, int]] = {
+    'small': (20, 31),
+    'medium': (100, 120),
+    'large': (300, 365),
+}
+PIPELINE_SCALE_DEFAULT: tuple[str, ...] = ('small', 'medium')
+# Every fourth station only measures precipitation, roughly as in SwissMetNet
+PIPELINE_PRECIPITATION_STATION_EVERY: int = 4
+REGRESSION_TOLERANCE_DEFAULT: float = 0.2
+# Slowdowns below this are treated as noise, whatever the tolerance
+REGRESSION_MIN_SECONDS: float = 0.01
+
+
+@dataclass(frozen=True)
+class StepResult:
+    """Fastest duration of a single pipeline step at one scale"""
+
+    scale: str
+    n_stations: int
+    n_days: int
+    step: str
+    seconds: float
+    rows: int
+
+
+@dataclass(frozen=True)
+class Regression:
+    """Step that got slower than the baseline allows"""
+
+    scale: str
+    step: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds
+
+
+def create_synthetic_metadata(n_stations: int) -> pl.DataFrame:
+    """Stations metadata with every few stations a precipitation station"""
+    return (
+        generate_meta_stations_frame(n_stations)
+        .with_row_index()
+        .with_columns(
+            pl.when(pl.col('index') % PIPELINE_PRECIPITATION_STATION_EVERY == 0)
+            .then(pl.lit('Automatic precipitation stations'))
+            .otherwise(pl.col('station_type_en'))
+            .alias('station_type_en')
+        )
+        .drop('index')
+    )
+
+
+def create_download_results(
+    metadata: pl.LazyFrame, down_path: Path, timeframe: str
+) -> list[DownloadResult]:
+    """Report the files in down_path as load_weather() downloads them"""
+    stations: pl.DataFrame = filter_unique_station_names(metadata).collect()
+    urls: pl.Series = generate_file_path_series(
+        filter_stations_to_series(stations, 'Automatic precipitation stations'),
+        filter_stations_to_series(stations, 'Automatic weather stations'),
+        timeframe=timeframe,
+    )
+    return [
+        DownloadResult(
+            url=url,
+            file_path=Path(down_path, Path(url).name),
+            status=200,
+            bytes_written=Path(down_path, Path(url).name).stat().st_size,
+            duration=0.0,
+        )
+        for url in urls
+        if Path(down_path, Path(url).name).exists()
+    ]
+
+
+def time_step(step: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    durations: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        result: Any = step()
+        durations.append(time.perf_counter() - start)
+    return min(durations), result
+
+
+def count_rows(frame: pl.DataFrame | Path) -> int:
+    if isinstance(frame, Path):
+        return pl.scan_parquet(frame).select(pl.len()).collect().item()
+    return frame.height
+
+
+def benchmark_pipeline_scale(
+    scale: str, n_stations: int, n_days: int, work_path: Path, repeat: int = 3
+) -> list[StepResult]:
+    """Generate station files of one scale and time every pipeline step
+
+    Parameters
+    ----------
+    scale: str
+        Name of the scale, reported with the results
+    n_stations: int
+        Number of stations
+    n_days: int
+        Days of hourly data per station, as in the recent files
+    work_path: Path
+        Directory for the CSV and Parquet files
+    repeat: int
+        Runs per step, the fastest counts
+
+    Returns
+    -------
+        One StepResult per step, in pipeline order
+    """
+    down_path: Path = Path(work_path, 'csv')
+    out_path: Path = Path(work_path, 'parquet')
+    down_path.mkdir(parents=True)
+    out_path.mkdir(parents=True)
+    frame_meta: pl.DataFrame = create_synthetic_metadata(n_stations)
+    metadata: pl.LazyFrame = frame_meta.lazy()
+    write_station_csv_dataset(
+        generate_weather_frame(n_stations, n_days),
+        down_path,
+        precipitation_stations=frame_meta.filter(
+            pl.col('station_type_en').str.contains('precipitation')
+        )['station_abbr'].to_list(),
+    )
+    stations: pl.DataFrame = filter_unique_station_names(metadata).collect()
+    station_series_precipitation: pl.Series = filter_stations_to_series(
+        stations, 'Automatic precipitation stations'
+    )
+    station_series_weather: pl.Series = filter_stations_to_series(
+        stations, 'Automatic weather stations'
+    )
+    kwargs_lazyframe: dict = create_kwargs_lazyframe(
+        dict.fromkeys(WEATHER_COLUMNS, pl.Float32)
+    )
+    download_results: list[DownloadResult] = [
+        *create_download_results(metadata, down_path, 'now'),
+        *create_download_results(metadata, down_path, 'recent'),
+    ]
+    url_series: pl.Series = pl.Series([result.url for result in download_results])
+    frames_parsed: tuple[pl.LazyFrame, ...] = tuple(
+        create_rainfall_weather_lazyframes(
+            down_path,
+            url_series.filter(url_series.str.contains(station_type_string)),
+            kwargs_lazyframe,
+        )
+        .collect()
+        .lazy()
+        for station_type_string in ('/ogd-smn-precip_', '/ogd-smn_')
+    )
+    weather_data_path: Path = Path(out_path, 'weather_data.parquet')
+
+    def sink_weather_data() -> Path:
+        save_weather_data_to_parquet(
+            concat_rainfall_weather_lazyframes(metadata, *frames_parsed), out_path
+        )
+        return weather_data_path
+
+    def sink_metrics() -> Path:
+        save_metrics_to_parquet(
+            create_metrics(pl.scan_parquet(weather_data_path), TIME_PERIODS), out_path
+        )
+        return Path(out_path, 'metrics.parquet')
+
+    steps: dict[str, Callable[[], pl.DataFrame | Path]] = {
+        'load_weather': lambda: parse_weather_files(
+            down_path,
+            kwargs_lazyframe,
+            metadata,
+            station_series_precipitation,
+            station_series_weather,
+            download_results,
+        ).collect(),
+        'concat_rainfall_weather_lazyframes': lambda: (
+            concat_rainfall_weather_lazyframes(metadata, *frames_parsed).collect()
+        ),
+        'sink weather_data': sink_weather_data,
+        'update_weather_data': lambda: update_weather_data(
+            down_path,
+            kwargs_lazyframe,
+            metadata,
+            station_series_precipitation,
+            station_series_weather,
+            weather=pl.scan_parquet(weather_data_path),
+        ).collect(),
+        'create_metrics': lambda: create_metrics(
+            pl.scan_parquet(weather_data_path), TIME_PERIODS
+        ).collect(),
+        'sink metrics': sink_metrics,
+        'sink weather rollups': lambda: save_weather_rollups(
+            pl.scan_parquet(weather_data_path), out_path
+        ),
+    }
+    results: list[StepResult] = []
+    for step, run_step in steps.items():
+        seconds, output = time_step(run_step, repeat)
+        results.append(
+            StepResult(
+                scale=scale,
+                n_stations=n_stations,
+                n_days=n_days,
+                step=step,
+                seconds=seconds,
+                rows=count_rows(output),
+            )
+        )
+    return results
+
+
+def benchmark_pipeline(
+    scales: Iterable[str] = PIPELINE_SCALE_DEFAULT, repeat: int = 3
+) -> list[StepResult]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return [
+            result
+            for scale in scales
+            for result in benchmark_pipeline_scale(
+                scale, *PIPELINE_SCALES[scale], Path(tmpdir, scale), repeat
+            )
+        ]
+
+
+def write_results_json(results: Iterable[StepResult], file_path: Path) -> None:
+    with file_path.open('w', encoding='utf-8') as f:
+        json.dump(
+            {
+                'python': platform.python_version(),
+                'polars': pl.__version__,
+                'machine': platform.machine(),
+                'results': [asdict(result) for result in results],
+            },
+            f,
+            indent=1,
+        )
+
+
+def load_results_json(file_path: Path) -> list[StepResult]:
+    with file_path.open(encoding='utf-8') as f:
+        return [StepResult(**result) for result in json.load(f)['results']]
+
+
+def compare_results(
+    baseline: Iterable[StepResult],
+    results: Iterable[StepResult],
+    tolerance: float = REGRESSION_TOLERANCE_DEFAULT,
+) -> list[Regression]:
+    """Find the steps that got slower than the baseline allows
+
+    Parameters
+    ----------
+    baseline: Iterable[StepResult]
+        Results of an earlier run
+    results: Iterable[StepResult]
+        Results of this run, steps and scales missing from the baseline are
+        not compared
+    tolerance: float
+        Allowed slowdown, as a fraction of the baseline duration
+
+    Returns
+    -------
+        One Regression per step slower than the baseline by more than the
+        tolerance and by more than REGRESSION_MIN_SECONDS
+    """
+    baseline_seconds: dict[tuple[str, str], float] = {
+        (result.scale, result.step): result.seconds for result in baseline
+    }
+    return [
+        Regression(
+            scale=result.scale,
+            step=result.step,
+            baseline_seconds=baseline_seconds[(result.scale, result.step)],
+            seconds=result.seconds,
+        )
+        for result in results
+        if (result.scale, result.step) in baseline_seconds
+        and result.seconds
+        > baseline_seconds[(result.scale, result.step)] * (1 + tolerance)
+        and result.seconds - baseline_seconds[(result.scale, result.step)]
+        > REGRESSION_MIN_SECONDS
+    ]
+
+
+def create_results_table(
+    results: Iterable[StepResult], regressions: Sequence[Regression] = ()
+) -> Table:
+    regressed: dict[tuple[str, str], Regression] = {
+        (regression.scale, regression.step): regression for regression in regressions
+    }
+    table: Table = Table(title='Data preparation pipeline')
+    for column in ('Scale', 'Step', 'Time (s)', 'Rows', 'vs. baseline'):
+        table.add_column(
+            column, justify='left' if column in {'Scale', 'Step'} else 'right'
+        )
+    for result in results:
+        regression: Regression | None = regressed.get((result.scale, result.step))
+        table.add_row(
+            f'{result.scale} ({result.n_stations}x{result.n_days}d)',
+            result.step,
+            f'{result.seconds:.3f}',
+            f'{result.rows:,}',
+            '' if regression is None else f'[red]{regression.ratio:.2f}x[/red]',
+        )
+    return table
+
+
+@app.command()
+def main(
+    scales: Annotated[
+        list[str] | None,
+        typer.Option('--scale', help=f'Scales to run, of {", ".join(PIPELINE_SCALES)}'),
+    ] = None,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs per step, fastest counts')
+    ] = 3,
+    output: Annotated[
+        Path | None, typer.Option('--output', help='Write the results to JSON')
+    ] = None,
+    baseline: Annotated[
+        Path | None,
+        typer.Option('--baseline', help='JSON results of a run to compare with'),
+    ] = None,
+    tolerance: Annotated[
+        float,
+        typer.Option('--tolerance', min=0, help='Allowed slowdown per step'),
+    ] = REGRESSION_TOLERANCE_DEFAULT,
+) -> None:
+    if scales is None:
+        scales = list(PIPELINE_SCALE_DEFAULT)
+    unknown_scales: set[str] = set(scales) - set(PIPELINE_SCALES)
+    if unknown_scales:
+        raise typer.BadParameter(f'unknown scales {", ".join(sorted(unknown_scales))}')
+    results: list[StepResult] = benchmark_pipeline(scales, repeat)
+    regressions: list[Regression] = (
+        compare_results(load_results_json(baseline), results, tolerance)
+        if baseline is not None
+        else []
+    )
+    Console().print(create_results_table(results, regressions))
+    if output is not None:
+        write_results_json(results, output)
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+if __name__ == '__main__':
+    app()
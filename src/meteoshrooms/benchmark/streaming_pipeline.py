@@ -0,0 +1,189 @@
+"""Compare peak memory of the in-memory and the streaming preparation path
+
+Every run parses synthetic station CSV files, aggregates them to hourly
+weather data of the retention period and writes weather_data.parquet. Each
+run happens in a fresh process, so that its peak resident set size (RSS) is
+not inflated by the runs before it. Peak RSS is read from getrusage and
+therefore only available on Unix.
+
+Run with ``python -m meteoshrooms.benchmark.streaming_pipeline``.
+"""
+
+import multiprocessing
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import (
+    WEATHER_COLUMNS,
+    generate_weather_frame,
+    write_station_csv_files,
+)
+from meteoshrooms.data_preparation.constants import PARQUET_WRITE_PROFILES
+from meteoshrooms.data_preparation.data_preparation import (
+    concat_rainfall_weather_lazyframes,
+    create_kwargs_lazyframe,
+    create_rainfall_weather_lazyframes,
+    save_weather_data_to_parquet,
+)
+from meteoshrooms.data_preparation.instrumentation import read_peak_rss_bytes
+
+app = typer.Typer()
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    """Duration and peak memory of a single preparation run"""
+
+    mode: str
+    seconds: float
+    peak_rss_bytes: int
+    rows: int
+
+
+def run_preparation(
+    down_path: Path, station_urls: list[str], out_path: Path, streaming: bool
+) -> PipelineResult:
+    """Prepare weather_data.parquet from CSV files, meant to run in a subprocess
+
+    Parameters
+    ----------
+    down_path: Path
+        Directory with the station CSV files
+    station_urls: list[str]
+        URLs of the station CSV files
+    out_path: Path
+        Directory to write weather_data.parquet to
+    streaming: bool
+        Use the streaming path instead of parsing the files into memory
+
+    Returns
+    -------
+        PipelineResult of the run
+    """
+    metadata: pl.LazyFrame = pl.LazyFrame(
+        {'station_abbr': [Path(url).name.split('_')[1].upper() for url in station_urls]}
+    ).with_columns(pl.col('station_abbr').str.to_titlecase().alias('station_name'))
+    start: float = time.perf_counter()
+    save_weather_data_to_parquet(
+        concat_rainfall_weather_lazyframes(
+            metadata,
+            create_rainfall_weather_lazyframes(
+                down_path,
+                pl.Series(station_urls),
+                create_kwargs_lazyframe(dict.fromkeys(WEATHER_COLUMNS, pl.Float32)),
+                streaming=streaming,
+            ),
+        ),
+        out_path,
+        parquet_kwargs=PARQUET_WRITE_PROFILES['balanced'],
+        engine='streaming' if streaming else 'auto',
+    )
+    seconds: float = time.perf_counter() - start
+    return PipelineResult(
+        mode='streaming' if streaming else 'in-memory',
+        seconds=seconds,
+        peak_rss_bytes=read_peak_rss_bytes(),
+        rows=pl.scan_parquet(Path(out_path, 'weather_data.parquet'))
+        .select(pl.len())
+        .collect()
+        .item(),
+    )
+
+
+def write_synthetic_csv_files(
+    n_stations: int, n_days: int, down_path: Path
+) -> list[str]:
+    return write_station_csv_files(
+        generate_weather_frame(n_stations, n_days), down_path
+    ).to_list()
+
+
+def run_in_subprocess[T](fn: Callable[..., T], *args: Any) -> T:
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def benchmark_streaming_pipeline(
+    n_stations: int, n_days: int, work_path: Path
+) -> list[PipelineResult]:
+    """Write synthetic station CSV files and prepare them with both paths
+
+    The files are generated in a subprocess as well, since a spawned process
+    starts out with the peak RSS of its parent on Linux.
+
+    Parameters
+    ----------
+    n_stations: int
+        Number of stations, one CSV file each
+    n_days: int
+        Days of hourly data per CSV file
+    work_path: Path
+        Directory for the CSV files and the Parquet files written
+
+    Returns
+    -------
+        PipelineResult of the in-memory and of the streaming path
+    """
+    down_path: Path = Path(work_path, 'csv')
+    down_path.mkdir()
+    station_urls: list[str] = run_in_subprocess(
+        write_synthetic_csv_files, n_stations, n_days, down_path
+    )
+    results: list[PipelineResult] = []
+    for streaming in (False, True):
+        out_path: Path = Path(work_path, 'streaming' if streaming else 'in-memory')
+        out_path.mkdir()
+        results.append(
+            run_in_subprocess(
+                run_preparation, down_path, station_urls, out_path, streaming
+            )
+        )
+    return results
+
+
+def create_results_table(results: list[PipelineResult]) -> Table:
+    table: Table = Table(title='Weather data preparation')
+    for column in ('Mode', 'Time (s)', 'Peak RSS (MiB)', 'Rows'):
+        table.add_column(column, justify='left' if column == 'Mode' else 'right')
+    for result in results:
+        table.add_row(
+            result.mode,
+            f'{result.seconds:.2f}',
+            f'{result.peak_rss_bytes / 2**20:.0f}',
+            str(result.rows),
+        )
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    n_days: Annotated[
+        int, typer.Option('--days', min=1, help='Days of hourly data per CSV file')
+    ] = 365,
+) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        Console().print(
+            create_results_table(
+                benchmark_streaming_pipeline(n_stations, n_days, Path(tmpdir))
+            )
+        )
+
+
+if __name__ == '__main__':
+    app()
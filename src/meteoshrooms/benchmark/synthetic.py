@@ -0,0 +1,244 @@
+"""Generate synthetic weather data shaped like the prepared MeteoSwiss data"""
+
+import math
+from collections.abc import Collection
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import cast
+from zoneinfo import ZoneInfo
+
+import polars as pl
+
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.constants import COLS_TO_KEEP_META_STATIONS
+
+WEATHER_COLUMNS: tuple[str, ...] = (
+    'rre150h0',
+    'tre200h0',
+    'ure200h0',
+    'fu3010h0',
+    'tde200h0',
+)
+SYNTHETIC_URL_BASE: str = 'https://synthetic.invalid'
+
+
+def create_station_abbrs(n_stations: int) -> list[str]:
+    return [
+        ''.join(chr(ord('A') + (i // 26**power) % 26) for power in (2, 1, 0))
+        for i in range(n_stations)
+    ]
+
+
+def expr_uniform(seed: int) -> pl.Expr:
+    """Pseudo-random numbers in [0, 1), one per row, reproducible by seed"""
+    return (pl.int_range(pl.len()).hash(seed) % 2**32 + 0.5) / 2**32
+
+
+def expr_gauss(mu: float, sigma: float, seed: int) -> pl.Expr:
+    """Pseudo-random normally distributed numbers, using Box-Muller"""
+    return (
+        mu
+        + sigma
+        * (-2 * expr_uniform(seed).log()).sqrt()
+        * (2 * math.pi * expr_uniform(seed + 1)).cos()
+    )
+
+
+def generate_weather_frame(
+    n_stations: int = 300,
+    n_days: int = 31,
+    end: datetime | None = None,
+    seed: int = 0,
+) -> pl.DataFrame:
+    """Generate hourly weather data for a number of stations
+
+    The values follow a daily cycle with random noise, about one hour in ten
+    has precipitation.
+
+    Parameters
+    ----------
+    n_stations: int
+        Number of stations
+    n_days: int
+        Number of days of hourly data per station
+    end: datetime | None
+        Last reference_timestamp, the current full hour if None
+    seed: int
+        Seed of the random number generator
+
+    Returns
+    -------
+        Polars DataFrame with the columns of weather_data.parquet
+    """
+    if end is None:
+        end = datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING)).replace(
+            minute=0, second=0, microsecond=0
+        )
+    station_abbrs: list[str] = create_station_abbrs(n_stations)
+    daily_cycle: pl.Expr = (
+        pl.col('reference_timestamp').dt.hour() * (2 * math.pi / 24)
+    ).sin()
+    return (
+        pl.DataFrame(
+            {
+                'station_abbr': station_abbrs,
+                'station_name': [abbr.title() for abbr in station_abbrs],
+            }
+        )
+        .join(
+            pl.datetime_range(
+                end - timedelta(days=n_days),
+                end,
+                interval='1h',
+                eager=True,
+                time_zone=TIMEZONE_SWITZERLAND_STRING,
+            )
+            .alias('reference_timestamp')
+            .to_frame(),
+            how='cross',
+        )
+        .with_columns(
+            pl.when(expr_uniform(seed) < 0.1)
+            .then(-expr_uniform(seed + 1).log())
+            .otherwise(0.0)
+            .alias('rre150h0'),
+            (12 + 6 * daily_cycle + expr_gauss(0, 2, seed + 2)).alias('tre200h0'),
+            (75 - 15 * daily_cycle + expr_gauss(0, 5, seed + 4))
+            .clip(upper_bound=100)
+            .alias('ure200h0'),
+            expr_gauss(8, 4, seed + 6).abs().alias('fu3010h0'),
+            (8 + 2 * daily_cycle + expr_gauss(0, 1.5, seed + 8)).alias('tde200h0'),
+        )
+        .select(
+            'station_abbr',
+            'reference_timestamp',
+            pl.col(WEATHER_COLUMNS).round(1).cast(pl.Float32),
+            'station_name',
+        )
+    )
+
+
+def generate_meta_stations_frame(n_stations: int = 300, seed: int = 0) -> pl.DataFrame:
+    """Generate stations metadata matching generate_weather_frame()
+
+    Parameters
+    ----------
+    n_stations: int
+        Number of stations
+    seed: int
+        Seed of the random number generator
+
+    Returns
+    -------
+        Polars DataFrame with the columns of meta_stations.parquet, the
+        stations scattered over Switzerland
+    """
+    station_abbrs: list[str] = create_station_abbrs(n_stations)
+    return (
+        pl.DataFrame(
+            {
+                'station_abbr': station_abbrs,
+                'station_name': [abbr.title() for abbr in station_abbrs],
+            }
+        )
+        .with_columns(
+            pl.lit('ZH').alias('station_canton'),
+            pl.lit('Automatische Wetterstationen').alias('station_type_de'),
+            pl.lit('Automatic weather stations').alias('station_type_en'),
+            pl.lit('MeteoSchweiz').alias('station_dataowner'),
+            pl.lit('01.01.1981').alias('station_data_since'),
+            (200 + 3300 * expr_uniform(seed)).round(0).alias('station_height_masl'),
+            pl.lit(None, dtype=pl.Float64).alias('station_height_barometer_masl'),
+            (2_485_000 + 350_000 * expr_uniform(seed + 1)).alias(
+                'station_coordinates_lv95_east'
+            ),
+            (1_075_000 + 220_000 * expr_uniform(seed + 2)).alias(
+                'station_coordinates_lv95_north'
+            ),
+            (45.8 + 2 * expr_uniform(seed + 2)).alias('station_coordinates_wgs84_lat'),
+            (5.9 + 4.6 * expr_uniform(seed + 1)).alias('station_coordinates_wgs84_lon'),
+        )
+        .select(COLS_TO_KEEP_META_STATIONS)
+    )
+
+
+def write_station_csv_files(
+    frame_weather: pl.DataFrame,
+    down_path: Path,
+    timeframe: str = 'recent',
+    station_type_string: str = '',
+) -> pl.Series:
+    """Write weather data as one MeteoSwiss station CSV file per station
+
+    Parameters
+    ----------
+    frame_weather: pl.DataFrame
+        Weather data as returned by generate_weather_frame()
+    down_path: Path
+        Directory to write the files to
+    timeframe: str
+        Timeframe part of the file names, 'recent' or 'now'
+    station_type_string: str
+        Station type part of the file names, '-precip' for precipitation
+        stations
+
+    Returns
+    -------
+        Polars Series with a URL per file, whose last part is the file name
+    """
+    urls: list[str] = []
+    for (station_abbr,), frame_station in (
+        frame_weather.drop('station_name')
+        .partition_by('station_abbr', as_dict=True, maintain_order=True)
+        .items()
+    ):
+        file_name: str = f'ogd-smn{station_type_string}_{str(station_abbr).lower()}_h_{timeframe}.csv'
+        frame_station.with_columns(
+            pl.col('reference_timestamp').dt.strftime('%d.%m.%Y %H:%M')
+        ).write_csv(Path(down_path, file_name), separator=';')
+        urls.append(f'{SYNTHETIC_URL_BASE}/{str(station_abbr).lower()}/{file_name}')
+    return pl.Series(urls)
+
+
+def write_station_csv_dataset(
+    frame_weather: pl.DataFrame,
+    down_path: Path,
+    precipitation_stations: Collection[str] = (),
+) -> None:
+    """Write the recent and now CSV files of every station, as MeteoSwiss does
+
+    The now files hold the rows of the last day, the recent files all rows
+    before it. Precipitation stations only measure precipitation and have
+    files of their own.
+
+    Parameters
+    ----------
+    frame_weather: pl.DataFrame
+        Weather data as returned by generate_weather_frame()
+    down_path: Path
+        Directory to write the files to
+    precipitation_stations: Collection[str]
+        Abbreviations of the precipitation stations
+    """
+    now_start: datetime = cast(
+        datetime, frame_weather['reference_timestamp'].max()
+    ).replace(hour=0)
+    is_precipitation: pl.Expr = pl.col('station_abbr').is_in(
+        list(precipitation_stations)
+    )
+    for timeframe, expr_timeframe in (
+        ('recent', pl.col('reference_timestamp') < now_start),
+        ('now', pl.col('reference_timestamp') >= now_start),
+    ):
+        frame_timeframe: pl.DataFrame = frame_weather.filter(expr_timeframe)
+        write_station_csv_files(
+            frame_timeframe.filter(~is_precipitation), down_path, timeframe
+        )
+        write_station_csv_files(
+            frame_timeframe.filter(is_precipitation).select(
+                'station_abbr', 'reference_timestamp', 'rre150h0', 'station_name'
+            ),
+            down_path,
+            timeframe,
+            station_type_string='-precip',
+        )
@@ -0,0 +1,119 @@
+"""Compare the Parquet write profiles on synthetic weather data
+
+Run with ``python -m meteoshrooms.benchmark.write_profiles``.
+"""
+
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.data_preparation.constants import PARQUET_WRITE_PROFILES
+
+app = typer.Typer()
+
+
+@dataclass(frozen=True)
+class WriteProfileResult:
+    """Write time, file size and read time of a single write profile"""
+
+    profile: str
+    write_seconds: float
+    file_bytes: int
+    read_seconds: float
+
+
+def benchmark_write_profile(
+    frame_weather: pl.DataFrame, profile: str, out_path: Path, repeat: int = 3
+) -> WriteProfileResult:
+    """Write and read back a DataFrame with one write profile
+
+    Parameters
+    ----------
+    frame_weather: pl.DataFrame
+        Data to write
+    profile: str
+        Key of PARQUET_WRITE_PROFILES
+    out_path: Path
+        Directory to write the file to
+    repeat: int
+        Number of writes and reads, the fastest of each is reported
+
+    Returns
+    -------
+        WriteProfileResult of the profile
+    """
+    file_path: Path = Path(out_path, f'{profile}.parquet')
+    write_seconds: list[float] = []
+    read_seconds: list[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        frame_weather.write_parquet(file_path, **PARQUET_WRITE_PROFILES[profile])
+        write_seconds.append(time.perf_counter() - start)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pl.read_parquet(file_path)
+        read_seconds.append(time.perf_counter() - start)
+    return WriteProfileResult(
+        profile=profile,
+        write_seconds=min(write_seconds),
+        file_bytes=file_path.stat().st_size,
+        read_seconds=min(read_seconds),
+    )
+
+
+def benchmark_write_profiles(
+    frame_weather: pl.DataFrame,
+    profiles: Iterable[str] = tuple(PARQUET_WRITE_PROFILES),
+    repeat: int = 3,
+) -> list[WriteProfileResult]:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return [
+            benchmark_write_profile(frame_weather, profile, Path(tmpdir), repeat)
+            for profile in profiles
+        ]
+
+
+def create_results_table(results: Iterable[WriteProfileResult]) -> Table:
+    table: Table = Table(title='Parquet write profiles')
+    for column in ('Profile', 'Write (s)', 'Size (MiB)', 'Read (s)'):
+        table.add_column(column, justify='left' if column == 'Profile' else 'right')
+    for result in results:
+        table.add_row(
+            result.profile,
+            f'{result.write_seconds:.3f}',
+            f'{result.file_bytes / 2**20:.2f}',
+            f'{result.read_seconds:.3f}',
+        )
+    return table
+
+
+@app.command()
+def main(
+    n_stations: Annotated[
+        int, typer.Option('--stations', min=1, help='Number of stations')
+    ] = 300,
+    n_days: Annotated[
+        int, typer.Option('--days', min=1, help='Days of hourly data per station')
+    ] = 31,
+    repeat: Annotated[
+        int, typer.Option('--repeat', min=1, help='Runs per profile, fastest counts')
+    ] = 3,
+) -> None:
+    frame_weather: pl.DataFrame = generate_weather_frame(n_stations, n_days)
+    Console().print(
+        create_results_table(benchmark_write_profiles(frame_weather, repeat=repeat)),
+        f'{frame_weather.height} rows of {n_stations} stations over {n_days} days',
+    )
+
+
+if __name__ == '__main__':
+    app()
@@ -1,8 +1,17 @@
+import os
 import re
 from pathlib import Path
 from re import Pattern
 
-DATA_PATH: Path = Path(__file__).resolve().parents[2].joinpath('data')
+DATA_PATH_ENVIRONMENT_VARIABLE: str = 'METEOSHROOMS_DATA_PATH'
+# The environment variable points the dashboard at another copy of the data,
+# e.g. at synthetic data for benchmarks
+DATA_PATH: Path = Path(
+    os.environ.get(
+        DATA_PATH_ENVIRONMENT_VARIABLE,
+        Path(__file__).resolve().parents[2].joinpath('data'),
+    )
+)
 TIMEZONE_SWITZERLAND_STRING: str = 'Europe/Zurich'
 TIME_PERIOD_VALUES: tuple[int, ...] = (3, 7, 14, 30)
 parameter_description_extraction_pattern: Pattern[str] = re.compile(r'([\w\s()]+)')
@@ -18,6 +18,15 @@ PARAMETER_AGGREGATION_TYPES: dict[str, tuple[str, ...]] = dict(
 METRICS_STRINGS: tuple[str, ...] = tuple(
     chain.from_iterable(PARAMETER_AGGREGATION_TYPES.values())
 )
+WEATHER_DATA_COLUMNS: tuple[str, ...] = (
+    'reference_timestamp',
+    'station_name',
+    *METRICS_STRINGS,
+)
+WEATHER_DATA_DAYS: int = max(TIME_PERIOD_VALUES)
+CHART_ROLLUP_INTERVAL: str = '6h'
+CHART_BUCKET_HOURS: tuple[int, ...] = (6, 12, 24, 48, 96, 168)
+CHART_POINT_BUDGET: int = 400
 
 WEATHER_SHORT_LABEL_DICT: dict[str, str] = {
     'rre150h0': 'Precipitation',
@@ -27,14 +36,11 @@ WEATHER_SHORT_LABEL_DICT: dict[str, str] = {
     'tde200h0': 'Dew Point',
 }
 SIDEBAR_MAX_SELECTIONS: int = 5
-COLUMNS_FOR_MAP_FRAME: set = {
-    'Short Code',
-    'Station Type',
-    'station_name',
-    'station_coordinates_wgs84_lat',
-    'station_coordinates_wgs84_lon',
-    'Altitude',
-}
+SHARED_CACHE_MAX_ENTRIES: int = 4
+MAP_RENDER_MODES: tuple[str, ...] = ('prebuilt', 'express')
+MAP_RENDER_MODE_DEFAULT: str = 'prebuilt'
+MAP_FIGURE_COLOR_PLACEHOLDER: str = '__color__'
+SECTION_SECONDS_KEY: str = 'section_seconds'
 TIME_PERIOD_INITAL_VALUE = 14
 
 HSTACK_KWARGS = dict(wrap=True, gap=0.5, align='start', justify='start')
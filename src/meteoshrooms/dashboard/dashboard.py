@@ -16,31 +16,39 @@ from meteoshrooms.dashboard.dashboard_utils_streamlit import (
     create_area_chart,
     create_station_names_to_streamlit,
     create_stations_options_selected,
-    load_metric_data_to_streamlit,
-    load_weather_data_to_streamlit,
+    load_metrics_index_to_streamlit,
+    load_weather_rollup_shared,
+)
+from meteoshrooms.dashboard.dataframe_io import (
+    DataSignature,
+    weather_rollup_signature,
 )
 from meteoshrooms.dashboard.log import init_logging
+from meteoshrooms.dashboard.timing import reset_section_timings, timed_section
 from meteoshrooms.dashboard.ux_metrics import (
+    MetricsIndex,
     create_metrics_expander_info,
 )
 from meteoshrooms.dashboard.ux_metrics_streamlit import create_metric_section
 
 
 def main():
+    reset_section_timings()
     if 'stations_options_multiselect' not in st.session_state:
         st.session_state.stations_options_multiselect = {'Airolo'}
     if 'stations_selected_last_time' not in st.session_state:
         st.session_state.stations_selected_last_time = {'Airolo'}
     st.set_page_config(layout='wide', initial_sidebar_state='expanded')
     root_logger.debug('Page config set')
-    df_weather: pl.LazyFrame = load_weather_data_to_streamlit().lazy()
-    root_logger.debug('Weather data LazyFrame loaded')
-    metrics: pl.LazyFrame = load_metric_data_to_streamlit().lazy()
-    root_logger.debug('Metrics LazyFrame created')
-    station_name_list: tuple[str, ...] = create_station_names_to_streamlit(metrics)
+    with timed_section('data'):
+        rollup_signature: DataSignature = weather_rollup_signature()
+        df_rollup: pl.LazyFrame = load_weather_rollup_shared(rollup_signature).lazy()
+        root_logger.debug('Weather rollup LazyFrame loaded')
+        metrics_index: MetricsIndex = load_metrics_index_to_streamlit()
+        station_name_list: tuple[str, ...] = create_station_names_to_streamlit()
     st.title('MeteoShrooms')
 
-    with st.sidebar:
+    with st.sidebar, timed_section('sidebar'):
         st.title('Selection')
         stations_options_selected: list = create_stations_options_selected(
             station_name_list
@@ -50,15 +58,22 @@ def main():
         )
         toggle_hide_map: bool = st.toggle('Hide Map')
 
-    with st.container():
+    with st.container(), timed_section('area chart'):
         create_area_chart(
-            df_weather, stations_options_selected, time_period_selected, 'rre150h0'
+            df_rollup,
+            stations_options_selected,
+            time_period_selected,
+            'rre150h0',
+            rollup_signature,
         )
     if not toggle_hide_map:
-        create_map_section(metrics, 'rre150h0', time_period_selected)
-    with st.container():
+        with timed_section('map'):
+            create_map_section('rre150h0', time_period_selected)
+    with st.container(), timed_section('metric tiles'):
         for station in stations_options_selected:
-            create_metric_section(metrics, station, METRICS_STRINGS)
+            create_metric_section(
+                station, metrics_index.tiles(station, NUM_DAYS_VAL, METRICS_STRINGS)
+            )
         create_metrics_expander_info(
             num_days_value=NUM_DAYS_VAL, num_days_delta=NUM_DAYS_DELTA
         )
@@ -2,26 +2,33 @@ import logging
 
 import polars as pl
 import streamlit as st
-from plotly import express as px
 from plotly.graph_objs import Figure
 
-from meteoshrooms.dashboard.dashboard_utils import create_scatter_map_kwargs
+from meteoshrooms.dashboard import settings
+from meteoshrooms.dashboard.constants import (
+    SHARED_CACHE_MAX_ENTRIES,
+    TIME_PERIODS,
+    WEATHER_SHORT_LABEL_DICT,
+)
 from meteoshrooms.dashboard.dashboard_utils_streamlit import (
-    META_STATIONS,
-    create_station_frame_for_map_for_streamlit,
+    create_base_map_figure_json_shared,
+    load_map_frame_shared,
     update_selection,
 )
+from meteoshrooms.dashboard.dataframe_io import DataSignature, map_frame_signature
 from meteoshrooms.dashboard.log import init_logging
+from meteoshrooms.dashboard.map_figure import (
+    create_map_figure_express,
+    recolor_map_figure,
+)
 
 init_logging(__name__)
 root_logger: logging.Logger = logging.getLogger(__name__)
 
 
-def create_map_section(
-    _metrics: pl.LazyFrame, param_short_code: str, time_period: int | None
-):
+def create_map_section(param_short_code: str, time_period: int | None):
     with st.container():
-        fig: Figure = draw_map(_metrics, param_short_code, time_period)
+        fig: Figure = draw_map(param_short_code, time_period, map_frame_signature())
         st.plotly_chart(
             fig,
             width='stretch',
@@ -32,15 +39,26 @@ def create_map_section(
         root_logger.debug('map created')
 
 
-@st.cache_data
-def draw_map(_metrics: pl.LazyFrame, param_short_code: str, time_period: int | None):
+# Figures are not modified when rendered, so all sessions can share them
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES * len(TIME_PERIODS))
+def draw_map(
+    param_short_code: str, time_period: int | None, data_signature: DataSignature
+) -> Figure:
     if not time_period:
         time_period = 7
-    station_frame_for_map: pl.DataFrame = create_station_frame_for_map_for_streamlit(
-        META_STATIONS, _metrics, time_period
+    station_frame_for_map: pl.DataFrame = load_map_frame_shared(
+        time_period, data_signature
     )
-
-    return px.scatter_map(
-        station_frame_for_map,
-        **create_scatter_map_kwargs(time_period, param_short_code),
+    if (
+        settings.get_args().map_render == 'prebuilt'
+        and param_short_code in WEATHER_SHORT_LABEL_DICT
+    ):
+        return recolor_map_figure(
+            create_base_map_figure_json_shared(data_signature),
+            station_frame_for_map,
+            param_short_code,
+            time_period,
+        )
+    return create_map_figure_express(
+        station_frame_for_map, param_short_code, time_period
     )
@@ -1,3 +1,4 @@
+import math
 from datetime import datetime, timedelta
 from typing import Sequence
 from zoneinfo import ZoneInfo
@@ -5,29 +6,94 @@ from zoneinfo import ZoneInfo
 import polars as pl
 
 from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.dashboard.constants import CHART_BUCKET_HOURS, CHART_POINT_BUDGET
 from meteoshrooms.data_preparation.constants import EXPR_WEATHER_AGGREGATION_TYPES
 
 
+def select_bucket_hours(
+    time_period: int,
+    number_stations: int,
+    point_budget: int = CHART_POINT_BUDGET,
+    bucket_hours: Sequence[int] = CHART_BUCKET_HOURS,
+) -> int:
+    """Select the smallest bucket size that keeps a chart within a point budget
+
+    Parameters
+    ----------
+    time_period: int
+        Length of the chart window in days
+    number_stations: int
+        Number of stations shown, one series each
+    point_budget: int
+        Maximum number of points of all series together
+    bucket_hours: Sequence[int]
+        Bucket sizes in hours to choose from, ascending, each a multiple of
+        the rollup interval
+
+    Returns
+    -------
+        Bucket size in hours, the largest one if none fits the budget
+    """
+    for hours in bucket_hours:
+        # A window not aligned to the buckets touches one partial bucket more
+        points_per_station: int = math.ceil(time_period * 24 / hours) + 1
+        if points_per_station * max(number_stations, 1) <= point_budget:
+            return hours
+    return bucket_hours[-1]
+
+
+def downsample_chart_frame(frame_rollup: pl.LazyFrame, hours: int) -> pl.LazyFrame:
+    """Aggregate rollup buckets into larger buckets
+
+    Precipitation is summed, so that its total over the window is preserved,
+    all other parameters are averaged over the rollup buckets.
+
+    Parameters
+    ----------
+    frame_rollup: pl.LazyFrame
+        Rollup buckets with station_name and reference_timestamp
+    hours: int
+        Bucket size in hours, returned unchanged if it is the rollup interval
+
+    Returns
+    -------
+        Polars LazyFrame with one row per station and bucket
+    """
+    if hours == CHART_BUCKET_HOURS[0]:
+        return frame_rollup
+    return (
+        frame_rollup.sort('reference_timestamp')
+        .group_by_dynamic(
+            'reference_timestamp', every=f'{hours}h', group_by='station_name'
+        )
+        .agg(*EXPR_WEATHER_AGGREGATION_TYPES)
+    )
+
+
 def create_area_chart_frame(
-    frame_weather: pl.LazyFrame,
+    frame_rollup: pl.LazyFrame,
     stations_options_selected: Sequence[str],
     time_period: int,
     weather_column_names_dict,
+    point_budget: int = CHART_POINT_BUDGET,
 ) -> pl.LazyFrame:
     return (
-        frame_weather.filter(
-            (
-                pl.col('reference_timestamp')
-                >= (
-                    datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
-                    - timedelta(days=time_period)
+        downsample_chart_frame(
+            frame_rollup.filter(
+                (
+                    pl.col('reference_timestamp')
+                    >= (
+                        datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+                        - timedelta(days=time_period)
+                    )
                 )
-            )
-            & (pl.col('station_name').is_in(stations_options_selected))
+                & (pl.col('station_name').is_in(stations_options_selected))
+            ),
+            select_bucket_hours(
+                time_period, len(stations_options_selected), point_budget
+            ),
         )
         .sort('reference_timestamp')
-        .group_by_dynamic('reference_timestamp', every='6h', group_by='station_name')
-        .agg(EXPR_WEATHER_AGGREGATION_TYPES)
         .with_columns(pl.selectors.numeric().round(1))
         .rename(weather_column_names_dict)
     )
@@ -1,7 +1,6 @@
 import logging
-import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Sequence
 
 import polars as pl
 from plotly import express as px
@@ -11,7 +10,6 @@ from meteoshrooms.constants import (
     parameter_description_extraction_pattern,
 )
 from meteoshrooms.dashboard.constants import (
-    COLUMNS_FOR_MAP_FRAME,
     METRICS_STRINGS,
     WEATHER_SHORT_LABEL_DICT,
 )
@@ -34,7 +32,8 @@ def load_metadata_to_frame(meta_type: str, data_path=DATA_PATH) -> pl.DataFrame:
 
 
 def create_metrics_names_dict(meta_params_df: pl.DataFrame) -> dict[str, str]:
-    return {m: create_meta_map(meta_params_df).get(m, '') for m in METRICS_STRINGS}
+    meta_map: dict[str, str | None] = create_meta_map(meta_params_df, METRICS_STRINGS)
+    return {m: meta_map.get(m) or '' for m in METRICS_STRINGS}
 
 
 def create_station_names(frame_with_stations: pl.LazyFrame) -> tuple[str, ...]:
@@ -48,33 +47,45 @@ def create_station_names(frame_with_stations: pl.LazyFrame) -> tuple[str, ...]:
     )
 
 
-def create_meta_map(metadata: pl.DataFrame):
-    meta_map: dict = {
-        r['parameter_shortname']: (
-            result.group()
-            if (
-                result := re.search(
-                    parameter_description_extraction_pattern,
-                    r['parameter_description_en'],
-                )
-            )
-            is not None
-            else None
-        )
-        for r in collect_meta_params_to_dicts(metadata)
-    }
-    return meta_map
+def create_meta_map(
+    metadata: pl.DataFrame, parameter_shortnames: Sequence[str] | None = None
+) -> dict[str, str | None]:
+    """Map parameter shortnames to the label part of their description
 
+    Parameters
+    ----------
+    metadata: pl.DataFrame
+        Parameters metadata
+    parameter_shortnames: Sequence[str] | None
+        Parameters to map, all if None. The metadata is filtered before the
+        descriptions are parsed.
 
-def collect_meta_params_to_dicts(metadata: pl.DataFrame) -> tuple[dict[str, Any], ...]:
-    return tuple(
-        metadata.to_dicts(),
+    Returns
+    -------
+        Dictionary of shortname to the first match of
+        parameter_description_extraction_pattern, None if nothing matches
+    """
+    frame_meta: pl.LazyFrame = metadata.lazy()
+    if parameter_shortnames is not None:
+        frame_meta = frame_meta.filter(
+            pl.col('parameter_shortname').is_in(parameter_shortnames)
+        )
+    return dict(
+        frame_meta.select(
+            'parameter_shortname',
+            pl.col('parameter_description_en').str.extract(
+                parameter_description_extraction_pattern.pattern, group_index=1
+            ),
+        )
+        .unique(subset='parameter_shortname', keep='last', maintain_order=True)
+        .collect()
+        .iter_rows()
     )
 
 
 def create_scatter_map_kwargs(
-    time_period, param_short_code
-) -> dict[str, str | dict[str, bool] | list[str | Any] | int | None]:
+    time_period: int | None, param_short_code: str
+) -> dict[str, Any]:
     return {
         'lat': 'station_coordinates_wgs84_lat',
         'lon': 'station_coordinates_wgs84_lon',
@@ -98,26 +109,3 @@ def create_scatter_map_kwargs(
             else None
         ),
     }
-
-
-def create_station_frame_for_map(
-    _frame_with_stations: pl.LazyFrame, _metrics: pl.LazyFrame, time_period: int
-) -> pl.DataFrame:
-    return (
-        _frame_with_stations.with_columns(
-            pl.col('station_type_en').alias('Station Type'),
-            pl.col('station_abbr').alias('Short Code'),
-            Altitude=pl.col('station_height_masl')
-            .cast(pl.Int16)
-            .cast(pl.String)
-            .add(' m.a.s.l'),
-        )
-        .select(pl.col(COLUMNS_FOR_MAP_FRAME))
-        .join(
-            _metrics.filter(pl.col('time_period') == time_period),
-            left_on='Short Code',
-            right_on='station_abbr',
-        )
-        .rename(WEATHER_SHORT_LABEL_DICT)
-        .collect()
-    )
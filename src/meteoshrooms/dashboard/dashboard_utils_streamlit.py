@@ -4,63 +4,115 @@ import polars as pl
 import streamlit as st
 
 from meteoshrooms.dashboard.constants import (
+    SHARED_CACHE_MAX_ENTRIES,
     SIDEBAR_MAX_SELECTIONS,
+    TIME_PERIODS,
     WEATHER_SHORT_LABEL_DICT,
 )
 from meteoshrooms.dashboard.dashboard_timeseries_chart import create_area_chart_frame
 from meteoshrooms.dashboard.dashboard_utils import (
     create_metrics_names_dict,
-    create_station_frame_for_map,
     create_station_names,
     load_metadata_to_frame,
     root_logger,
 )
-from meteoshrooms.dashboard.dataframe_io import load_metric_data, load_weather_data
-
+from meteoshrooms.dashboard.dataframe_io import (
+    DataSignature,
+    load_map_frame,
+    load_map_stations,
+    load_metric_data,
+    load_weather_rollup,
+    metadata_signature,
+    metric_data_signature,
+)
+from meteoshrooms.dashboard.map_figure import create_base_map_figure_json
+from meteoshrooms.dashboard.ux_metrics import MetricsIndex, create_metric_tooltips
 
-@st.cache_data
-def create_station_names_to_streamlit(
-    _frame_with_stations: pl.LazyFrame,
-) -> tuple[str, ...]:
-    return create_station_names(_frame_with_stations)
+# The loaders below share one read-only copy of the data between all sessions
+# of the process. Each is keyed by the signature of the files it reads, so a
+# rewrite of the files by the preparation job is loaded on the next rerun.
 
 
-@st.cache_data
-def load_weather_data_to_streamlit() -> pl.DataFrame:
-    return load_weather_data()
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def load_weather_rollup_shared(data_signature: DataSignature) -> pl.DataFrame:
+    return load_weather_rollup()
 
 
-@st.cache_data
-def load_metric_data_to_streamlit() -> pl.DataFrame:
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def load_metric_data_shared(data_signature: DataSignature) -> pl.DataFrame:
     return load_metric_data()
 
 
-@st.cache_data
-def load_metadata_to_frame_to_streamlit(meta_type: str) -> pl.DataFrame:
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def load_metrics_index_shared(data_signature: DataSignature) -> MetricsIndex:
+    return MetricsIndex.from_metrics(load_metric_data_shared(data_signature))
+
+
+def load_metrics_index_to_streamlit() -> MetricsIndex:
+    return load_metrics_index_shared(metric_data_signature())
+
+
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def create_station_names_shared(data_signature: DataSignature) -> tuple[str, ...]:
+    return create_station_names(load_metric_data_shared(data_signature).lazy())
+
+
+def create_station_names_to_streamlit() -> tuple[str, ...]:
+    return create_station_names_shared(metric_data_signature())
+
+
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def load_metadata_shared(meta_type: str, data_signature: DataSignature) -> pl.DataFrame:
     return load_metadata_to_frame(meta_type)
 
 
-@st.cache_data
-def create_metrics_names_dict_to_streamlit(
-    meta_params_df: pl.DataFrame,
+# The metadata is read on first use rather than at import time, so that
+# importing the dashboard modules stays cheap for worker starts and tests.
+
+
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def create_metrics_names_dict_shared(
+    data_signature: DataSignature,
 ) -> dict[str, str]:
-    return create_metrics_names_dict(meta_params_df)
+    return create_metrics_names_dict(load_metadata_shared('parameters', data_signature))
 
 
-META_PARAMETERS: pl.DataFrame = load_metadata_to_frame_to_streamlit('parameters')
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def create_weather_column_names_dict_shared(
+    data_signature: DataSignature,
+) -> dict[str, str]:
+    return {
+        'reference_timestamp': 'Time',
+        'station_name': 'Station',
+    } | create_metrics_names_dict_shared(data_signature)
 
-META_STATIONS: pl.LazyFrame = load_metadata_to_frame_to_streamlit('stations').lazy()
 
-METRICS_NAMES_DICT: dict[str, str] = create_metrics_names_dict_to_streamlit(
-    META_PARAMETERS
-)
+def get_weather_column_names_dict() -> dict[str, str]:
+    return create_weather_column_names_dict_shared(metadata_signature('parameters'))
 
 
-@st.cache_data
-def create_station_frame_for_map_for_streamlit(
-    _frame_with_stations: pl.LazyFrame, _metrics: pl.LazyFrame, time_period: int
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def create_metric_tooltips_shared(data_signature: DataSignature) -> dict[str, str]:
+    return create_metric_tooltips(
+        load_metadata_shared('parameters', data_signature),
+        create_weather_column_names_dict_shared(data_signature),
+    )
+
+
+def get_metric_tooltips() -> dict[str, str]:
+    return create_metric_tooltips_shared(metadata_signature('parameters'))
+
+
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES * len(TIME_PERIODS))
+def load_map_frame_shared(
+    time_period: int, data_signature: DataSignature
 ) -> pl.DataFrame:
-    return create_station_frame_for_map(_frame_with_stations, _metrics, time_period)
+    return load_map_frame(time_period)
+
+
+@st.cache_resource(max_entries=SHARED_CACHE_MAX_ENTRIES)
+def create_base_map_figure_json_shared(data_signature: DataSignature) -> str:
+    return create_base_map_figure_json(load_map_stations())
 
 
 def update_selection():
@@ -108,21 +160,24 @@ def create_stations_options_selected(station_name_list) -> list:
     )
 
 
+# Keyed by the signature of the rollup files, like the loaders, as the rollup
+# frame itself is not hashed
 @st.cache_data
 def create_area_chart(
-    _df_weather: pl.LazyFrame,
+    _df_rollup: pl.LazyFrame,
     stations_options_selected: Sequence[str],
     time_period: int | None,
     param_short_code: str,
-):
+    data_signature: DataSignature,
+) -> None:
     if not time_period:
-        time_period: int = 7
+        time_period = 7
     st.area_chart(
         data=create_area_chart_frame(
-            _df_weather,
+            _df_rollup,
             stations_options_selected,
             time_period,
-            WEATHER_COLUMN_NAMES_DICT,
+            get_weather_column_names_dict(),
         ),
         x='Time',
         y='Precipitation',
@@ -130,8 +185,3 @@ def create_area_chart(
         x_label='Time',
         y_label=f'{WEATHER_SHORT_LABEL_DICT[param_short_code]} (mm)',
     )
-
-
-WEATHER_COLUMN_NAMES_DICT: dict[str, str] = dict(
-    {'reference_timestamp': 'Time', 'station_name': 'Station'} | METRICS_NAMES_DICT
-)
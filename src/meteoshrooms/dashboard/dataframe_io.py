@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -8,32 +9,247 @@ from meteoshrooms.constants import (
     DATA_PATH,
     TIMEZONE_SWITZERLAND_STRING,
 )
+from meteoshrooms.dashboard.constants import (
+    CHART_ROLLUP_INTERVAL,
+    WEATHER_DATA_COLUMNS,
+    WEATHER_DATA_DAYS,
+    WEATHER_SHORT_LABEL_DICT,
+)
+from meteoshrooms.data_preparation.compact_schema import scan_weather_data
+from meteoshrooms.data_preparation.constants import (
+    MAP_FRAME_FILE_NAME,
+    MAP_FRAME_STATION_COLUMNS,
+    WEATHER_DATASET_DIRECTORY_NAME,
+    WEATHER_ROLLUP_FILE_NAME,
+    WEATHER_STATIONS_FILE_NAME,
+)
+from meteoshrooms.data_preparation.map_frame import create_map_frame
+from meteoshrooms.data_preparation.rollups import (
+    create_weather_rollups,
+    scan_weather_rollups,
+)
+from meteoshrooms.data_preparation.weather_store import (
+    scan_weather_dataset,
+    weather_dataset_exists,
+)
 
+DataSignature = tuple[tuple[str, int, int], ...]
 
-def load_weather_data(data_path=DATA_PATH) -> pl.DataFrame:
-    return (
-        pl.read_parquet(Path(data_path, 'weather_data.parquet'))
-        .with_columns(
+
+def create_data_signature(*paths: Path) -> DataSignature:
+    """Identify the current version of data files by path, mtime and size
+
+    The preparation job replaces its files atomically, so a changed signature
+    means that a complete new version of the data can be loaded.
+
+    Parameters
+    ----------
+    paths: Path
+        Files or directories, of which all Parquet files are included.
+        Missing paths are left out.
+
+    Returns
+    -------
+        Tuple with path, modification time in ns and size of each file
+    """
+    file_paths: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            file_paths.extend(sorted(path.rglob('*.parquet')))
+        else:
+            file_paths.append(path)
+    signature: list[tuple[str, int, int]] = []
+    for file_path in file_paths:
+        try:
+            file_stat = file_path.stat()
+        except FileNotFoundError:
+            continue
+        signature.append((str(file_path), file_stat.st_mtime_ns, file_stat.st_size))
+    return tuple(signature)
+
+
+def weather_data_signature(data_path: Path = DATA_PATH) -> DataSignature:
+    return create_data_signature(
+        Path(data_path, 'weather_data.parquet'),
+        Path(data_path, WEATHER_STATIONS_FILE_NAME),
+        Path(data_path, WEATHER_DATASET_DIRECTORY_NAME),
+    )
+
+
+def weather_rollup_signature(data_path: Path = DATA_PATH) -> DataSignature:
+    return create_data_signature(
+        Path(data_path, WEATHER_ROLLUP_FILE_NAME)
+    ) or weather_data_signature(data_path)
+
+
+def metric_data_signature(data_path: Path = DATA_PATH) -> DataSignature:
+    return create_data_signature(Path(data_path, 'metrics.parquet'))
+
+
+def metadata_signature(meta_type: str, data_path: Path = DATA_PATH) -> DataSignature:
+    return create_data_signature(Path(data_path, f'meta_{meta_type.lower()}.parquet'))
+
+
+def map_frame_signature(data_path: Path = DATA_PATH) -> DataSignature:
+    return create_data_signature(Path(data_path, MAP_FRAME_FILE_NAME)) or (
+        metric_data_signature(data_path) + metadata_signature('stations', data_path)
+    )
+
+
+def scan_weather_file(
+    file_path: Path, since: datetime, columns: Sequence[str] = WEATHER_DATA_COLUMNS
+) -> pl.LazyFrame:
+    """Scan weather_data.parquet for the columns and rows the dashboard uses
+
+    Only the projected columns are read, and the filter on reference_timestamp
+    is compared against the row group statistics, so row groups entirely
+    before since are skipped. Local files are memory mapped by the Polars
+    Parquet reader, and a file in the compact layout is joined with its
+    station names.
+
+    Parameters
+    ----------
+    file_path: Path
+        Path of weather_data.parquet
+    since: datetime
+        Oldest reference_timestamp to return
+    columns: Sequence[str]
+        Columns to return, must include reference_timestamp
+
+    Returns
+    -------
+        Weather data LazyFrame
+    """
+    frame_weather: pl.LazyFrame = scan_weather_data(file_path).select(columns)
+    dtype_timestamp = frame_weather.collect_schema()['reference_timestamp']
+    if getattr(dtype_timestamp, 'time_zone', None) != TIMEZONE_SWITZERLAND_STRING:
+        # Files written without time zone need a conversion, which prevents
+        # the filter from being pushed down to the row group statistics
+        frame_weather = frame_weather.with_columns(
             pl.col('reference_timestamp').dt.replace_time_zone(
                 TIMEZONE_SWITZERLAND_STRING, non_existent='null'
             )
         )
-        .sort(pl.col('reference_timestamp'))
-        .filter(
-            (
-                pl.col('reference_timestamp')
-                >= (
-                    datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
-                    - timedelta(days=30)
-                )
+    return frame_weather.filter(pl.col('reference_timestamp') >= since)
+
+
+def calculate_weather_data_since() -> datetime:
+    return datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING)) - timedelta(
+        days=WEATHER_DATA_DAYS
+    )
+
+
+def load_weather_data(
+    data_path: Path = DATA_PATH, columns: Sequence[str] = WEATHER_DATA_COLUMNS
+) -> pl.DataFrame:
+    since: datetime = calculate_weather_data_since()
+    dataset_path: Path = Path(data_path, WEATHER_DATASET_DIRECTORY_NAME)
+    if weather_dataset_exists(dataset_path):
+        frame_weather: pl.LazyFrame = scan_weather_dataset(
+            dataset_path, since=since
+        ).select(columns)
+    else:
+        frame_weather = scan_weather_file(
+            Path(data_path, 'weather_data.parquet'), since, columns
+        )
+    return frame_weather.sort(pl.col('reference_timestamp')).collect()
+
+
+def load_weather_rollup(
+    data_path: Path = DATA_PATH, interval: str = CHART_ROLLUP_INTERVAL
+) -> pl.DataFrame:
+    """Load the weather buckets of one interval for the charts
+
+    Parameters
+    ----------
+    data_path: Path
+        Directory of the prepared data
+    interval: str
+        Bucket size, one of WEATHER_ROLLUP_INTERVALS
+
+    Returns
+    -------
+        Buckets of the dashboard time window, rolled up from weather data if
+        the rollup table has not been prepared
+    """
+    since: datetime = calculate_weather_data_since()
+    if Path(data_path, WEATHER_ROLLUP_FILE_NAME).exists():
+        frame_rollup: pl.LazyFrame = scan_weather_rollups(data_path, interval, since)
+    else:
+        frame_rollup = (
+            create_weather_rollups(
+                load_weather_data(
+                    data_path, columns=('station_abbr', *WEATHER_DATA_COLUMNS)
+                ).lazy(),
+                intervals=(interval,),
             )
+            .filter(pl.col('reference_timestamp') >= since)
+            .drop('interval')
         )
+    return (
+        frame_rollup.select(WEATHER_DATA_COLUMNS)
+        .sort(pl.col('reference_timestamp'))
+        .collect()
     )
 
 
-def load_metric_data(data_path=DATA_PATH) -> pl.DataFrame:
-    return pl.read_parquet(Path(DATA_PATH, 'metrics.parquet')).pivot(
+def load_metric_data(data_path: Path = DATA_PATH) -> pl.DataFrame:
+    return pl.read_parquet(Path(data_path, 'metrics.parquet')).pivot(
         'parameter',
         index=('station_abbr', 'station_name', 'time_period'),
         values='value',
     )
+
+
+def scan_map_frames(data_path: Path = DATA_PATH) -> pl.LazyFrame:
+    """Scan the map frame of all time periods
+
+    Parameters
+    ----------
+    data_path: Path
+        Directory of the prepared data
+
+    Returns
+    -------
+        Map frame LazyFrame, joined from the stations metadata and the
+        metrics if the map frame has not been prepared
+    """
+    if Path(data_path, MAP_FRAME_FILE_NAME).exists():
+        return pl.scan_parquet(Path(data_path, MAP_FRAME_FILE_NAME))
+    return create_map_frame(
+        pl.scan_parquet(Path(data_path, 'meta_stations.parquet')),
+        pl.scan_parquet(Path(data_path, 'metrics.parquet')),
+    )
+
+
+def load_map_frame(time_period: int, data_path: Path = DATA_PATH) -> pl.DataFrame:
+    """Load the stations and their metrics of one time period for the map
+
+    Parameters
+    ----------
+    time_period: int
+        Time period in days
+    data_path: Path
+        Directory of the prepared data
+
+    Returns
+    -------
+        One row per station, with the parameters labelled for the map
+    """
+    return (
+        scan_map_frames(data_path)
+        .filter(pl.col('time_period') == time_period)
+        .drop('time_period')
+        .rename(WEATHER_SHORT_LABEL_DICT)
+        .collect()
+    )
+
+
+def load_map_stations(data_path: Path = DATA_PATH) -> pl.DataFrame:
+    """Load the stations of all time periods for the base map figure"""
+    return (
+        scan_map_frames(data_path)
+        .select(MAP_FRAME_STATION_COLUMNS)
+        .unique(subset='station_name', keep='first', maintain_order=True)
+        .collect()
+    )
@@ -0,0 +1,120 @@
+"""Render the station map by recolouring a prebuilt Plotly figure"""
+
+import base64
+import json
+
+import numpy as np
+import polars as pl
+from plotly import express as px
+from plotly import graph_objects as go
+
+from meteoshrooms.dashboard.constants import (
+    MAP_FIGURE_COLOR_PLACEHOLDER,
+    WEATHER_SHORT_LABEL_DICT,
+)
+from meteoshrooms.dashboard.dashboard_utils import create_scatter_map_kwargs
+
+MAP_FIGURE_STATION_KEYS: tuple[str, ...] = ('lat', 'lon', 'hovertext', 'customdata')
+
+
+def create_map_figure_express(
+    frame_map: pl.DataFrame, param_short_code: str, time_period: int
+) -> go.Figure:
+    return px.scatter_map(
+        frame_map, **create_scatter_map_kwargs(time_period, param_short_code)
+    )
+
+
+def create_base_map_figure_json(frame_stations: pl.DataFrame) -> str:
+    """Build the parts of the map that do not depend on the parameter
+
+    Parameters
+    ----------
+    frame_stations: pl.DataFrame
+        One row per station with the columns of the map frame
+
+    Returns
+    -------
+        Figure serialized as JSON, with the station coordinates and hover
+        data and a placeholder colour column to be swapped per request
+    """
+    figure: go.Figure = px.scatter_map(
+        frame_stations.sort('station_name').with_columns(
+            pl.lit(0.0).alias(MAP_FIGURE_COLOR_PLACEHOLDER)
+        ),
+        **create_scatter_map_kwargs(None, '')
+        | {'color': MAP_FIGURE_COLOR_PLACEHOLDER, 'title': None, 'subtitle': None},
+    )
+    # The theme of the dashboard replaces the template, which is the largest
+    # and slowest to validate part of the figure
+    figure.layout.template = None
+    figure_dict: dict = json.loads(figure.to_json())
+    trace: dict = figure_dict['data'][0]
+    for key in MAP_FIGURE_STATION_KEYS:
+        trace[key] = decode_typed_array(trace[key])
+    return json.dumps(figure_dict)
+
+
+def decode_typed_array(value: list | dict) -> list:
+    """Turn a base64 encoded array of a Plotly figure into a list"""
+    if isinstance(value, dict):
+        return np.frombuffer(
+            base64.b64decode(value['bdata']), dtype=value['dtype']
+        ).tolist()
+    return value
+
+
+def recolor_map_figure(
+    base_figure_json: str,
+    frame_map: pl.DataFrame,
+    param_short_code: str,
+    time_period: int,
+) -> go.Figure:
+    """Swap the values of one parameter and time period into the base figure
+
+    Parameters
+    ----------
+    base_figure_json: str
+        Figure returned by create_base_map_figure_json()
+    frame_map: pl.DataFrame
+        Map frame of the time period, with the parameters labelled
+    param_short_code: str
+        Parameter to colour the stations by
+    time_period: int
+        Time period in days, shown in the subtitle
+
+    Returns
+    -------
+        Figure equal to the one of create_map_figure_express(), except that
+        the map is centred on all stations of the base figure
+    """
+    label: str = WEATHER_SHORT_LABEL_DICT[param_short_code]
+    figure_dict: dict = json.loads(base_figure_json)
+    trace: dict = figure_dict['data'][0]
+    frame_colors: pl.DataFrame = pl.DataFrame(
+        {'station_name': trace['hovertext']}
+    ).join(
+        frame_map.select('station_name', label, present=pl.lit(True)),
+        on='station_name',
+        how='left',
+        maintain_order='left',
+    )
+    colors: np.ndarray = frame_colors[label].cast(pl.Float64).to_numpy()
+    present: pl.Series = frame_colors['present'].is_not_null()
+    if not present.all():
+        # Stations without metrics in this time period are left out, as
+        # Plotly Express does
+        indices: list[int] = present.arg_true().to_list()
+        for key in MAP_FIGURE_STATION_KEYS:
+            trace[key] = [trace[key][i] for i in indices]
+        colors = colors[indices]
+    trace['marker']['color'] = colors
+    trace['hovertemplate'] = trace['hovertemplate'].replace(
+        f'{MAP_FIGURE_COLOR_PLACEHOLDER}=', f'{label}='
+    )
+    figure_dict['layout']['coloraxis']['colorbar']['title']['text'] = label
+    figure_dict['layout']['title'] = {
+        'text': label,
+        'subtitle': {'text': f'Over the last {time_period} days'},
+    }
+    return go.Figure(figure_dict)
@@ -1,8 +1,22 @@
 import argparse
+import functools
 
-parser = argparse.ArgumentParser()
+from meteoshrooms.dashboard.constants import MAP_RENDER_MODE_DEFAULT, MAP_RENDER_MODES
+
+# Without help, as the dashboard modules are also imported by the typer CLIs
+# of the benchmarks, whose own --help must not be answered by this parser
+parser = argparse.ArgumentParser(add_help=False)
 parser.add_argument('-d', '--debug', action='store_true')
+parser.add_argument(
+    '--map-render',
+    choices=MAP_RENDER_MODES,
+    default=MAP_RENDER_MODE_DEFAULT,
+    help='Recolour a prebuilt map figure or build it with Plotly Express',
+)
 
 
+@functools.cache
 def get_args() -> argparse.Namespace:
-    return parser.parse_args()
+    # Unknown arguments belong to the process importing the dashboard, e.g.
+    # pytest or python -X importtime, and must not make the import fail
+    return parser.parse_known_args()[0]
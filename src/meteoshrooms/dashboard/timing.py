@@ -0,0 +1,32 @@
+"""Time the sections of a dashboard rerun"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import streamlit as st
+
+from meteoshrooms.dashboard.constants import SECTION_SECONDS_KEY
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def reset_section_timings() -> None:
+    st.session_state[SECTION_SECONDS_KEY] = {}
+
+
+@contextmanager
+def timed_section(name: str) -> Iterator[None]:
+    """Record the duration of a section of the rerun in the session state
+
+    The durations of the last rerun are kept under SECTION_SECONDS_KEY, where
+    benchmarks running the dashboard with AppTest can read them.
+    """
+    start: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds: float = time.perf_counter() - start
+        st.session_state.setdefault(SECTION_SECONDS_KEY, {})[name] = seconds
+        logger.debug(f'section {name} rendered in {seconds * 1000:.1f} ms')
@@ -1,15 +1,201 @@
 """Provide static data for the MeteoShrooms dashboard ui"""
 
+import math
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass
+
 import polars as pl
 import streamlit as st
-from polars import LazyFrame
 
 from meteoshrooms.dashboard.constants import (
+    METRICS_STRINGS,
     NUM_DAYS_DELTA,
     PARAMETER_AGGREGATION_TYPES,
 )
 
 
+@dataclass(frozen=True)
+class MetricTile:
+    """Value and delta shown in the tile of a single metric"""
+
+    parameter: str
+    value: float | None
+    delta: float | None
+
+
+def evaluate_metric_tiles(
+    metrics: pl.LazyFrame,
+    station_names: Sequence[str] | None = None,
+    metric_names: Sequence[str] = METRICS_STRINGS,
+    number_days_delta: int = NUM_DAYS_DELTA,
+) -> pl.DataFrame:
+    """Evaluate the tiles of many stations and metrics with a single query
+
+    Parameters
+    ----------
+    metrics: pl.LazyFrame
+        Metrics with one row per station and time period and one column per
+        parameter
+    station_names: Sequence[str] | None
+        Stations to evaluate, all if None
+    metric_names: Sequence[str]
+        Parameters to evaluate, those missing in metrics are left out
+    number_days_delta: int
+        Time period the deltas are taken against
+
+    Returns
+    -------
+        Polars DataFrame with station_name, time_period, parameter, value and
+        delta. Values of parameters aggregated as sum are per day. Stations
+        with more than one row per time period have no values, deltas are null
+        where the value to compare against is null or zero.
+    """
+    keys: tuple[str, str] = ('station_name', 'time_period')
+    metric_names = [m for m in metric_names if m in metrics.collect_schema()]
+    if station_names is not None:
+        metrics = metrics.filter(pl.col('station_name').is_in(station_names))
+    tiles: pl.LazyFrame = (
+        metrics.select(*keys, *metric_names)
+        .filter(pl.len().over(keys) == 1)
+        .unpivot(index=keys, variable_name='parameter')
+        .with_columns(
+            pl.when(pl.col('parameter').is_in(PARAMETER_AGGREGATION_TYPES['sum']))
+            .then(pl.col('value').cast(pl.Float64) / pl.col('time_period'))
+            .otherwise(pl.col('value').cast(pl.Float64))
+            .alias('value')
+        )
+    )
+    return (
+        tiles.join(
+            tiles.filter(pl.col('time_period') == number_days_delta).select(
+                'station_name', 'parameter', pl.col('value').alias('value_delta')
+            ),
+            on=('station_name', 'parameter'),
+            how='left',
+        )
+        .with_columns(
+            pl.when(pl.col('value_delta') != 0)
+            .then(pl.col('value') - pl.col('value_delta'))
+            .alias('delta')
+        )
+        .drop('value_delta')
+        .collect()
+    )
+
+
+class MetricsIndex:
+    """Metric tile values and deltas keyed by station, time period and parameter
+
+    The values and deltas are held in two flat arrays of doubles, with missing
+    values stored as NaN. The position of a key is computed from the positions
+    of its parts, so that a lookup runs no Polars query.
+    """
+
+    def __init__(
+        self,
+        station_names: Sequence[str],
+        time_periods: Sequence[int],
+        parameters: Sequence[str],
+        values: array,
+        deltas: array,
+    ) -> None:
+        self.stations: dict[str, int] = {s: i for i, s in enumerate(station_names)}
+        self.time_periods: dict[int, int] = {t: i for i, t in enumerate(time_periods)}
+        self.parameters: dict[str, int] = {p: i for i, p in enumerate(parameters)}
+        size: int = len(station_names) * len(time_periods) * len(parameters)
+        if len(values) != size or len(deltas) != size:
+            metrics_index_size_error_string: str = (
+                'values and deltas must hold one value per station, time period '
+                'and parameter'
+            )
+            raise ValueError(metrics_index_size_error_string)
+        self.values: array = values
+        self.deltas: array = deltas
+
+    @classmethod
+    def from_tiles(cls, tiles: pl.DataFrame) -> 'MetricsIndex':
+        """Build the index from evaluated metric tiles
+
+        Parameters
+        ----------
+        tiles: pl.DataFrame
+            Metric tiles as returned by evaluate_metric_tiles()
+
+        Returns
+        -------
+            MetricsIndex of the tiles
+        """
+        keys: tuple[str, ...] = ('station_name', 'time_period', 'parameter')
+        station_names, time_periods, parameters = (
+            tiles[key].drop_nulls().unique().sort().to_list() for key in keys
+        )
+        grid: pl.DataFrame = (
+            pl.DataFrame({keys[0]: station_names})
+            .join(
+                pl.DataFrame({keys[1]: time_periods}).cast(
+                    {keys[1]: tiles.schema[keys[1]]}
+                ),
+                how='cross',
+            )
+            .join(pl.DataFrame({keys[2]: parameters}), how='cross')
+            .join(tiles, on=keys, how='left', maintain_order='left')
+            .with_columns(pl.col('value', 'delta').fill_null(math.nan))
+        )
+        return cls(
+            station_names,
+            time_periods,
+            parameters,
+            values=array('d', grid['value'].to_list()),
+            deltas=array('d', grid['delta'].to_list()),
+        )
+
+    @classmethod
+    def from_metrics(
+        cls, metrics: pl.DataFrame, parameters: Sequence[str] = METRICS_STRINGS
+    ) -> 'MetricsIndex':
+        return cls.from_tiles(
+            evaluate_metric_tiles(metrics.lazy(), metric_names=parameters)
+        )
+
+    def position(
+        self, station_name: str, time_period: int, parameter: str
+    ) -> int | None:
+        try:
+            return (
+                self.stations[station_name] * len(self.time_periods)
+                + self.time_periods[time_period]
+            ) * len(self.parameters) + self.parameters[parameter]
+        except KeyError:
+            return None
+
+    def get(self, station_name: str, time_period: int, parameter: str) -> float | None:
+        position: int | None = self.position(station_name, time_period, parameter)
+        if position is None or math.isnan(self.values[position]):
+            return None
+        return self.values[position]
+
+    def get_delta(
+        self, station_name: str, time_period: int, parameter: str
+    ) -> float | None:
+        position: int | None = self.position(station_name, time_period, parameter)
+        if position is None or math.isnan(self.deltas[position]):
+            return None
+        return self.deltas[position]
+
+    def tiles(
+        self, station_name: str, time_period: int, parameters: Sequence[str]
+    ) -> list[MetricTile]:
+        return [
+            MetricTile(
+                parameter=parameter,
+                value=self.get(station_name, time_period, parameter),
+                delta=self.get_delta(station_name, time_period, parameter),
+            )
+            for parameter in parameters
+        ]
+
+
 def get_metric_emoji(val: float) -> str:
     """Retun emoji for rainfall intensity
 
@@ -53,71 +239,46 @@ def create_metrics_expander_info(num_days_value: float, num_days_delta: float):
         st.info('Data Sources: MeteoSwiss')
 
 
-def create_metric_tooltip_string(
-    metric_name: str, meta_parameters, weather_column_names_dict
-) -> str:
-    return f'{weather_column_names_dict[metric_name]} in {
-        meta_parameters.filter(pl.col("parameter_shortname") == metric_name)
-        .select("parameter_unit")
-        .item()
-    }'
+def create_metric_tooltips(
+    meta_parameters: pl.DataFrame,
+    weather_column_names_dict: dict[str, str],
+    metric_names: Sequence[str] = METRICS_STRINGS,
+) -> dict[str, str]:
+    """Create the tooltip of each metric tile with a single query
+
+    Parameters
+    ----------
+    meta_parameters: pl.DataFrame
+        Parameters metadata with parameter_shortname and parameter_unit
+    weather_column_names_dict: dict[str, str]
+        Name of each parameter
+    metric_names: Sequence[str]
+        Parameters of the tiles, those missing in meta_parameters are left out
+
+    Returns
+    -------
+        Tooltip per parameter, its name and unit
+    """
+    return {
+        metric_name: f'{weather_column_names_dict[metric_name]} in {unit}'
+        for metric_name, unit in meta_parameters.filter(
+            pl.col('parameter_shortname').is_in(metric_names)
+        )
+        .select('parameter_shortname', 'parameter_unit')
+        .unique('parameter_shortname', keep='first', maintain_order=True)
+        .iter_rows()
+    }
 
 
 def create_metric_kwargs(
-    metric_name, meta_parameters, weather_column_names_dict
+    metric_name: str, metric_tooltips: dict[str, str]
 ) -> dict[str, bool | str]:
     return {
         'border': True,
-        'help': create_metric_tooltip_string(
-            metric_name, meta_parameters, weather_column_names_dict
-        ),
+        'help': metric_tooltips[metric_name],
         'height': 'stretch',
     }
 
 
-def filter_metrics_time_period(
-    metrics: pl.LazyFrame, station_name: str, number_days: int, metric_short_code: str
-) -> pl.LazyFrame | None:
-    return (
-        metrics.filter(
-            (pl.col('station_name') == station_name)
-            & (pl.col('time_period') == number_days)
-        ).select(pl.col(metric_short_code))
-        if metrics.select(pl.len()).collect().item() > 0
-        else None
-    )
-
-
-def calculate_metric_value(
-    df_metrics: pl.LazyFrame,
-    metric_short_code: str,
-    station_name: str,
-    number_days: int,
-) -> float | None:
-    try:
-        df_filtered: LazyFrame | None = filter_metrics_time_period(
-            df_metrics, station_name, number_days, metric_short_code
-        )
-        if df_filtered is not None:
-            if metric_short_code in PARAMETER_AGGREGATION_TYPES['sum']:
-                df_filtered = df_filtered.select(
-                    pl.col(metric_short_code) / number_days
-                )
-            return df_filtered.collect().item()
-        return None
-    except ValueError:
-        # If a station has data missing, return None
-        return None
-
-
-def calculate_metric_delta(
-    metric_name: str, metrics: pl.LazyFrame, station_name: str, val: float
-) -> str:
-    val_delta: float | None = calculate_metric_value(
-        metrics, metric_name, station_name, number_days=NUM_DAYS_DELTA
-    )
-    if val_delta:
-        return str(
-            round(val - val_delta, 1),
-        )
-    return '-'
+def format_metric_delta(delta: float | None) -> str:
+    return '-' if delta is None else str(round(delta, 1))
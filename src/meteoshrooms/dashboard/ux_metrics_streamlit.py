@@ -1,59 +1,43 @@
 from typing import Sequence
 
-import polars as pl
 import streamlit as st
 from streamlit.delta_generator import DeltaGenerator
 
-from meteoshrooms.dashboard.constants import NUM_DAYS_VAL, WEATHER_SHORT_LABEL_DICT
-from meteoshrooms.dashboard.dashboard_utils_streamlit import (
-    META_PARAMETERS,
-    WEATHER_COLUMN_NAMES_DICT,
-)
+from meteoshrooms.dashboard.constants import WEATHER_SHORT_LABEL_DICT
+from meteoshrooms.dashboard.dashboard_utils_streamlit import get_metric_tooltips
 from meteoshrooms.dashboard.ux_metrics import (
-    calculate_metric_delta,
-    calculate_metric_value,
+    MetricTile,
     create_metric_kwargs,
+    format_metric_delta,
     get_metric_emoji,
 )
 
 
-def create_metric_section(
-    metrics: pl.LazyFrame, station_name: str, metrics_list: Sequence[str]
-):
+def create_metric_section(station_name: str, metric_tiles: Sequence[MetricTile]):
     st.subheader(station_name)
 
-    cols_metric: list[DeltaGenerator] = st.columns(len(metrics_list))
-    for col, metric_name in zip(
+    metric_tooltips: dict[str, str] = get_metric_tooltips()
+    cols_metric: list[DeltaGenerator] = st.columns(len(metric_tiles))
+    for col, metric_tile in zip(
         cols_metric,
-        metrics_list,
+        metric_tiles,
         strict=False,
     ):
-        val: float | None = calculate_metric_value(
-            metrics, metric_name, station_name, number_days=NUM_DAYS_VAL
-        )
-
-        metric_label: str = WEATHER_SHORT_LABEL_DICT[metric_name]
-        if val is not None:
-            delta: str | None = calculate_metric_delta(
-                metric_name, metrics, station_name, val
-            )
+        metric_label: str = WEATHER_SHORT_LABEL_DICT[metric_tile.parameter]
+        if metric_tile.value is not None:
             col.metric(
                 label=metric_label,
                 value=convert_metric_value_to_string_for_metric_section(
-                    metric_name, val
-                ),
-                delta=delta,
-                **create_metric_kwargs(
-                    metric_name, META_PARAMETERS, WEATHER_COLUMN_NAMES_DICT
+                    metric_tile.parameter, metric_tile.value
                 ),
+                delta=format_metric_delta(metric_tile.delta),
+                **create_metric_kwargs(metric_tile.parameter, metric_tooltips),
             )
         else:
             col.metric(
                 label=metric_label,
                 value='-',
-                **create_metric_kwargs(
-                    metric_name, META_PARAMETERS, WEATHER_COLUMN_NAMES_DICT
-                ),
+                **create_metric_kwargs(metric_tile.parameter, metric_tooltips),
             )
 
 
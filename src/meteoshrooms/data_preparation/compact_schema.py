@@ -0,0 +1,141 @@
+"""Store weather data with dictionary-encoded stations
+
+In the compact layout, weather_data.parquet holds station_abbr as an Enum of
+the stations in meta_stations and in the weather data, and no station_name,
+which is kept in the weather_stations.parquet join table next to it. The
+parameters keep the types of the plain layout.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Mapping
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    SINK_PARQUET_KWARGS,
+    WEATHER_STATIONS_FILE_NAME,
+)
+from meteoshrooms.data_preparation.weather_store import write_parquet_atomic
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def create_station_enum(frame_stations: pl.LazyFrame) -> pl.Enum:
+    return pl.Enum(
+        frame_stations.select(pl.col('station_abbr').unique().sort())
+        .collect()
+        .to_series()
+    )
+
+
+def create_weather_stations(
+    meta_stations: pl.LazyFrame, frame_weather: pl.LazyFrame | None = None
+) -> pl.DataFrame:
+    """Create the join table of the stations dimension
+
+    Parameters
+    ----------
+    meta_stations: pl.LazyFrame
+        Stations metadata with station_abbr and station_name
+    frame_weather: pl.LazyFrame | None
+        Weather data in the plain layout, whose stations missing from
+        meta_stations keep the name stored with their rows, e.g. existing rows
+        of a station that has left the metadata
+
+    Returns
+    -------
+        Polars DataFrame with station_abbr as Enum of all stations, sorted by it
+    """
+    frames_stations: list[pl.LazyFrame] = [
+        meta_stations.select('station_abbr', 'station_name')
+    ]
+    if frame_weather is not None:
+        frames_stations.append(frame_weather.select('station_abbr', 'station_name'))
+    frame_stations: pl.LazyFrame = (
+        pl.concat(frames_stations, how='vertical_relaxed')
+        .unique('station_abbr', keep='first', maintain_order=True)
+        .sort('station_abbr')
+    )
+    return frame_stations.with_columns(
+        pl.col('station_abbr').cast(create_station_enum(frame_stations))
+    ).collect()
+
+
+def compact_weather_frame(
+    frame_weather: pl.LazyFrame,
+    station_enum: pl.DataType,
+) -> pl.LazyFrame:
+    """Convert weather data to the compact layout
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Weather data with station_abbr of stations in station_enum
+    station_enum: pl.DataType
+        Stations dimension, the station_abbr type of create_weather_stations()
+
+    Returns
+    -------
+        Weather data without station_name
+    """
+    return frame_weather.drop('station_name', strict=False).with_columns(
+        pl.col('station_abbr').cast(station_enum)
+    )
+
+
+def expand_weather_frame(
+    frame_weather: pl.LazyFrame, frame_stations: pl.LazyFrame
+) -> pl.LazyFrame:
+    """Convert weather data in the compact layout back to the plain one
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Weather data in the compact layout
+    frame_stations: pl.LazyFrame
+        Join table with station_abbr and station_name
+
+    Returns
+    -------
+        Weather data with station_abbr as String and station_name as last
+        column
+    """
+    return frame_weather.with_columns(pl.col('station_abbr').cast(pl.String)).join(
+        frame_stations.with_columns(pl.col('station_abbr').cast(pl.String)),
+        on='station_abbr',
+        how='left',
+    )
+
+
+def save_weather_stations(
+    frame_stations: pl.DataFrame,
+    data_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> Path:
+    stations_file_path: Path = Path(data_path, WEATHER_STATIONS_FILE_NAME)
+    write_parquet_atomic(frame_stations, stations_file_path, parquet_kwargs)
+    logger.debug(f'weather_stations written to {stations_file_path}')
+    return stations_file_path
+
+
+def scan_weather_data(file_path: Path) -> pl.LazyFrame:
+    """Scan a weather data file in the plain or the compact layout
+
+    Parameters
+    ----------
+    file_path: Path
+        Path of weather_data.parquet, a file without station_name is joined
+        with weather_stations.parquet in the same directory
+
+    Returns
+    -------
+        Weather data LazyFrame in the plain layout
+    """
+    frame_weather: pl.LazyFrame = pl.scan_parquet(file_path)
+    if 'station_name' in frame_weather.collect_schema().names():
+        return frame_weather
+    return expand_weather_frame(
+        frame_weather,
+        pl.scan_parquet(Path(file_path.parent, WEATHER_STATIONS_FILE_NAME)),
+    )
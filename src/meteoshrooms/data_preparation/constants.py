@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
+from enum import Enum
 from pathlib import Path
+from typing import Any, Literal
 from zoneinfo import ZoneInfo
 
 import polars as pl
@@ -13,9 +15,12 @@ DTYPE_DICT: dict[str, type[pl.DataType]] = {
 }
 
 METEO_CSV_ENCODING: str = 'ISO-8859-1'
+URL_GEO_ADMIN_BASE: str = 'https://data.geo.admin.ch'
+URL_GEO_ADMIN_STATION_TYPE_BASE: str = 'ch.meteoschweiz.ogd-smn'
+URL_BASE_ENVIRONMENT_VARIABLE: str = 'METEOSHROOMS_BASE_URL'
 META_FILE_PATH_DICT: dict[str, list[str]] = {
     meta_type: [
-        f'https://data.geo.admin.ch/ch.meteoschweiz.ogd-smn{ogd_smn_prefix}/ogd-smn{meta_suffix}_meta_{meta_type}.csv'
+        f'{URL_GEO_ADMIN_BASE}/{URL_GEO_ADMIN_STATION_TYPE_BASE}{ogd_smn_prefix}/ogd-smn{meta_suffix}_meta_{meta_type}.csv'
         for ogd_smn_prefix, meta_suffix in zip(
             ['', '-precip', '-tower'], ['', '-precip', '-tower'], strict=False
         )
@@ -110,8 +115,18 @@ COLS_TO_KEEP_META_DATAINVENTORY: tuple[str, ...] = (
     'parameter_shortname',
     'station_abbr',
 )
-URL_GEO_ADMIN_BASE: str = 'https://data.geo.admin.ch'
-URL_GEO_ADMIN_STATION_TYPE_BASE: str = 'ch.meteoschweiz.ogd-smn'
+DOWNLOAD_MAX_WORKERS: int = 8
+DOWNLOAD_RETRY_KWARGS: dict[str, Any] = {
+    'total': 5,
+    'backoff_factor': 0.1,
+    'status_forcelist': (500, 502, 503, 504),
+}
+DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+DOWNLOAD_CONTENT_LENGTH_ERROR_STRING: str = (
+    'Content-Length mismatch: expected {expected} bytes, received {received}'
+)
+DOWNLOAD_CACHE_DIRECTORY_NAME: str = 'download_cache'
+DOWNLOAD_CACHE_INDEX_FILE_NAME: str = 'index.json'
 
 PARAMETER_AGGREGATION_TYPES: dict[str, tuple[str, ...]] = {
     'sum': ('rre150h0',),
@@ -132,21 +147,15 @@ EXPR_WEATHER_AGGREGATION_TYPES: tuple[Expr, Expr] = (
 STATION_TYPE_ERROR_STRING: str = 'station_type must be String and cannot be None'
 TIMEFRAME_VALUE_ERROR_STRING: str = "timeframe needs to be 'recent' or 'now'"
 TIMEFRAME_STRINGS: set[str] = {'recent', 'now'}
-ARGS_LOAD_META_PARAMETERS: tuple[
-    dict[str, list[str]], dict[str, type[DataType]], tuple[str, ...]
-] = (
+ARGS_LOAD_META_PARAMETERS: tuple[dict[str, type[DataType]], tuple[str, ...]] = (
     SCHEMA_META_PARAMETERS,
     COLS_TO_KEEP_META_PARAMETERS,
 )
-ARGS_LOAD_META_STATIONS: tuple[
-    dict[str, list[str]], dict[str, type[DataType]], tuple[str, ...]
-] = (
+ARGS_LOAD_META_STATIONS: tuple[dict[str, type[DataType]], tuple[str, ...]] = (
     SCHEMA_META_STATIONS,
     COLS_TO_KEEP_META_STATIONS,
 )
-ARGS_LOAD_META_DATAINVENTORY: tuple[
-    dict[str, list[str]], dict[str, type[DataType]], tuple[str, ...]
-] = (
+ARGS_LOAD_META_DATAINVENTORY: tuple[dict[str, type[DataType]], tuple[str, ...]] = (
     SCHEMA_META_DATAINVENTORY,
     COLS_TO_KEEP_META_DATAINVENTORY,
 )
@@ -155,7 +164,77 @@ TIMEZONE_EXPRESSION: pl.Expr = pl.col('reference_timestamp').dt.replace_time_zon
     non_existent='null',
     ambiguous='earliest',
 )
-SINK_PARQUET_KWARGS: dict[str, int | str] = {
-    'compression': 'brotli',
-    'compression_level': 11,
+WEATHER_RETENTION_DAYS: int = 31
+# The metrics and the dashboard charts read the hourly data, which must hence
+# cover the longest time period
+WEATHER_HOURLY_DAYS_MIN: int = max(TIME_PERIOD_VALUES)
+WEATHER_HISTORY_DAYS: int = 0
+WEATHER_HISTORY_FILE_NAME: str = 'weather_history.parquet'
+WEATHER_HISTORY_INTERVAL: str = '1d'
+WEATHER_DATASET_DIRECTORY_NAME: str = 'weather_data'
+WEATHER_DATASET_FILE_NAME: str = 'data.parquet'
+WEATHER_DATASET_MONTH_FORMAT: str = '%Y-%m'
+WEATHER_DATASET_HIVE_SCHEMA: dict[str, type[pl.DataType]] = {
+    'station_abbr': pl.String,
+    'month': pl.String,
+}
+WATERMARKS_FILE_NAME: str = 'weather_watermarks.parquet'
+WATERMARKS_UPDATE_INTERVAL: timedelta = timedelta(hours=1)
+SCHEMA_WATERMARKS: dict[Any, pl.DataType] = {
+    'station_abbr': pl.String(),
+    'last_timestamp': pl.Datetime(time_zone=TIMEZONE_SWITZERLAND_STRING),
+    'source_url': pl.String(),
+    'source_fingerprint': pl.String(),
 }
+WEATHER_STATIONS_FILE_NAME: str = 'weather_stations.parquet'
+WEATHER_ROLLUP_FILE_NAME: str = 'weather_rollup.parquet'
+WEATHER_ROLLUP_INTERVALS: tuple[str, ...] = ('6h', '1d')
+MAP_FRAME_FILE_NAME: str = 'map_frame.parquet'
+MAP_FRAME_STATION_COLUMNS: tuple[str, ...] = (
+    'station_name',
+    'Short Code',
+    'Station Type',
+    'Altitude',
+    'station_coordinates_wgs84_lat',
+    'station_coordinates_wgs84_lon',
+)
+PARQUET_WRITE_PROFILES: dict[str, dict[str, Any]] = {
+    'archive': {
+        'compression': 'brotli',
+        'compression_level': 11,
+        'row_group_size': 100_000,
+        'statistics': True,
+    },
+    'balanced': {
+        'compression': 'zstd',
+        'compression_level': 3,
+        'row_group_size': 100_000,
+        'statistics': True,
+    },
+    'fast-read': {
+        'compression': 'lz4',
+        'row_group_size': 50_000,
+        'statistics': True,
+    },
+}
+# Engines accepted by LazyFrame.collect and sink_parquet
+EngineType = Literal['auto', 'in-memory', 'streaming', 'gpu']
+
+
+class ParquetWriteProfile(str, Enum):
+    """Choices of the --write-profile option, the keys of PARQUET_WRITE_PROFILES"""
+
+    ARCHIVE = 'archive'
+    BALANCED = 'balanced'
+    FAST_READ = 'fast-read'
+
+
+PARQUET_WRITE_PROFILE_DEFAULT: str = ParquetWriteProfile.ARCHIVE.value
+PARQUET_WRITE_PROFILE_ERROR_STRING: str = (
+    f'write_profile must be one of {", ".join(PARQUET_WRITE_PROFILES)}'
+)
+SINK_PARQUET_KWARGS: dict[str, Any] = PARQUET_WRITE_PROFILES[
+    PARQUET_WRITE_PROFILE_DEFAULT
+]
+PROC_STATUS_PATH: Path = Path('/proc/self/status')
+PROC_CLEAR_REFS_PATH: Path = Path('/proc/self/clear_refs')
@@ -2,41 +2,86 @@
 
 import logging
 import tempfile
-from collections.abc import Sequence
+import time
+from collections.abc import Collection, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Mapping
 from zoneinfo import ZoneInfo
 
 import polars as pl
-import polars.exceptions
-import requests
 import typer
-from requests.adapters import HTTPAdapter, Retry
-from rich.progress import track
+from rich.console import Console
 from typing_extensions import Annotated
 
 from meteoshrooms.constants import DATA_PATH, TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.compact_schema import (
+    compact_weather_frame,
+    create_weather_stations,
+    save_weather_stations,
+    scan_weather_data,
+)
 from meteoshrooms.data_preparation.constants import (
     ARGS_LOAD_META_DATAINVENTORY,
     ARGS_LOAD_META_PARAMETERS,
     ARGS_LOAD_META_STATIONS,
+    DOWNLOAD_CACHE_DIRECTORY_NAME,
+    DOWNLOAD_MAX_WORKERS,
     DTYPE_DICT,
     EXPR_WEATHER_AGGREGATION_TYPES,
     META_FILE_PATH_DICT,
     METEO_CSV_ENCODING,
     PARAMETER_AGGREGATION_TYPES,
+    PARQUET_WRITE_PROFILE_DEFAULT,
+    PARQUET_WRITE_PROFILE_ERROR_STRING,
+    PARQUET_WRITE_PROFILES,
     SINK_PARQUET_KWARGS,
     STATION_TYPE_ERROR_STRING,
     TIME_PERIODS,
     TIMEFRAME_STRINGS,
     TIMEFRAME_VALUE_ERROR_STRING,
     TIMEZONE_EXPRESSION,
+    URL_BASE_ENVIRONMENT_VARIABLE,
     URL_GEO_ADMIN_BASE,
     URL_GEO_ADMIN_STATION_TYPE_BASE,
+    WEATHER_DATASET_DIRECTORY_NAME,
+    WEATHER_HISTORY_DAYS,
+    WEATHER_HISTORY_FILE_NAME,
+    WEATHER_HOURLY_DAYS_MIN,
+    WEATHER_RETENTION_DAYS,
+    EngineType,
+    ParquetWriteProfile,
+)
+from meteoshrooms.data_preparation.download import DownloadResult, download_files
+from meteoshrooms.data_preparation.instrumentation import (
+    StageProfiler,
+    count_parquet_rows,
+    measure_bytes,
+)
+from meteoshrooms.data_preparation.map_frame import save_map_frame
+from meteoshrooms.data_preparation.retention import (
+    RetentionPolicy,
+    save_weather_history,
+)
+from meteoshrooms.data_preparation.rollups import save_weather_rollups
+from meteoshrooms.data_preparation.watermarks import (
+    create_watermarks_from_weather,
+    filter_changed_urls,
+    filter_rows_after_watermarks,
+    filter_stations_due,
+    load_watermarks,
+    save_watermarks,
+    update_watermarks,
+)
+from meteoshrooms.data_preparation.weather_store import (
+    prune_weather_partitions,
+    scan_weather_dataset,
+    sink_parquet_atomic,
+    write_weather_partitions,
 )
 
-logger: logging.Logger = logging.getLogger(__name__)
+logger: logging.Logger = logging.getLogger(__package__)
 console_handler = logging.StreamHandler()
 logger.addHandler(console_handler)
 log_formatter = logging.Formatter(
@@ -76,6 +121,15 @@ class DataPreparation:
         weather_flag=False,
         metrics_flag=False,
         update_flag=False,
+        max_workers: int = DOWNLOAD_MAX_WORKERS,
+        cache_flag=False,
+        partitioned_flag=False,
+        write_profile: str = PARQUET_WRITE_PROFILE_DEFAULT,
+        streaming_flag=False,
+        profiler: StageProfiler | None = None,
+        base_url: str = URL_GEO_ADMIN_BASE,
+        compact_flag=False,
+        retention: RetentionPolicy | None = None,
     ):
         # self.download_path = download_path
         if data_path:
@@ -87,8 +141,31 @@ class DataPreparation:
         self.weather_flag = weather_flag
         self.metrics_flag = metrics_flag
         self.update_flag = update_flag
+        self.max_workers = max_workers
+        self.cache_path: Path | None = (
+            Path(self.data_path, DOWNLOAD_CACHE_DIRECTORY_NAME) if cache_flag else None
+        )
+        self.partitioned_flag = partitioned_flag
+        self.weather_dataset_path: Path = Path(
+            self.data_path, WEATHER_DATASET_DIRECTORY_NAME
+        )
+        if write_profile not in PARQUET_WRITE_PROFILES:
+            raise ValueError(PARQUET_WRITE_PROFILE_ERROR_STRING)
+        self.write_profile = write_profile
+        self.parquet_kwargs: Mapping[str, Any] = PARQUET_WRITE_PROFILES[write_profile]
+        self.streaming_flag = streaming_flag
+        self.profiler: StageProfiler = (
+            profiler if profiler is not None else StageProfiler(enabled=False)
+        )
+        self.base_url: str = base_url
+        if compact_flag and partitioned_flag:
+            raise ValueError('The compact layout is not available partitioned')
+        self.compact_flag = compact_flag
+        self.retention: RetentionPolicy = (
+            retention if retention is not None else RetentionPolicy()
+        )
         if self.metrics_flag:
-            self.metrics = pl.LazyFrame()
+            self.metrics: pl.LazyFrame = pl.LazyFrame()
         if True not in {self.parquet_flag, self.postgres_flag}:
             raise ValueError('You must set an output type')
 
@@ -108,7 +185,7 @@ class DataPreparation:
 
     def load_meta_parameters(self):
         self.meta_parameters = load_metadata_per_type(
-            'parameters', *ARGS_LOAD_META_PARAMETERS
+            'parameters', *ARGS_LOAD_META_PARAMETERS, base_url=self.base_url
         )
         return self.meta_parameters
 
@@ -116,13 +193,13 @@ class DataPreparation:
 
     def load_meta_datainventory(self):
         self.meta_datainventory = load_metadata_per_type(
-            'datainventory', *ARGS_LOAD_META_DATAINVENTORY
+            'datainventory', *ARGS_LOAD_META_DATAINVENTORY, base_url=self.base_url
         )
         return self.meta_datainventory
 
     def load_meta_stations(self):
         self.meta_stations = load_metadata_per_type(
-            'stations', *ARGS_LOAD_META_STATIONS
+            'stations', *ARGS_LOAD_META_STATIONS, base_url=self.base_url
         )
         return self.meta_stations
 
@@ -165,41 +242,216 @@ class DataPreparation:
     def load_weather_data(self, down_path):
         if not hasattr(self, 'weather_schema_dict'):
             self.weather_schema_dict = self.create_weather_schema_dict()
+        self.watermarks: pl.DataFrame | None = load_watermarks(self.data_path)
+        self.download_results: list[DownloadResult] = []
         self.weather_data: pl.LazyFrame = load_weather(
             self.meta_stations,
             schema_dict_lazyframe=self.weather_schema_dict,
             down_path=down_path,
             update_data=self.update_flag,
+            max_workers=self.max_workers,
+            cache_path=self.cache_path,
+            existing_weather=(
+                self.scan_existing_weather_data() if self.update_flag else None
+            ),
+            append_only=self.partitioned_flag,
+            watermarks=self.watermarks,
+            download_results=self.download_results,
+            streaming=self.streaming_flag,
+            profiler=self.profiler,
+            base_url=self.base_url,
+            retention_days=(
+                self.retention.history_days
+                if self.retention.keeps_history and not self.update_flag
+                else self.retention.hourly_days
+            ),
         )
         logger.debug(f'weather_data generated as {type(self.weather_data)}')
         return self.weather_data
 
+    def scan_existing_weather_data(self) -> pl.LazyFrame:
+        if self.partitioned_flag:
+            return scan_weather_dataset(
+                self.weather_dataset_path,
+                since=calculate_cutoff_datetime(self.retention.hourly_days),
+            )
+        return scan_weather_data(Path(self.data_path, 'weather_data.parquet'))
+
+    def compact_weather_data(self) -> pl.LazyFrame:
+        # Collected once, as the stations and the sink both read it, and an
+        # update still reads the stations table replaced below
+        frame_weather: pl.LazyFrame = self.weather_data.collect(
+            engine='streaming' if self.streaming_flag else 'auto'
+        ).lazy()
+        frame_stations: pl.DataFrame = create_weather_stations(
+            self.meta_stations, frame_weather
+        )
+        save_weather_stations(
+            frame_stations, self.data_path, parquet_kwargs=self.parquet_kwargs
+        )
+        return compact_weather_frame(
+            frame_weather,
+            frame_stations.schema['station_abbr'],
+        )
+
+    def save_weather_history(self, since: datetime) -> Path:
+        return save_weather_history(
+            self.weather_data,
+            self.data_path,
+            since=since,
+            history_since=calculate_cutoff_datetime(self.retention.history_days),
+            parquet_kwargs=self.parquet_kwargs,
+        )
+
+    @property
+    def weather_data_path(self) -> Path:
+        if self.partitioned_flag:
+            return self.weather_dataset_path
+        return Path(self.data_path, 'weather_data.parquet')
+
+    def name_hourly_stage(self) -> str:
+        # The hourly aggregation runs when the weather data query is first
+        # executed, which also parses the CSV files if they are lazy scans
+        return (
+            'parse and aggregate hourly' if self.streaming_flag else 'aggregate hourly'
+        )
+
     def save_weather_data(self):
-        if self.parquet_flag:
-            save_weather_data_to_parquet(
-                frame_weather=self.weather_data, data_path=self.data_path
+        sink_stage_name: str = f'{self.name_hourly_stage()} and sink'
+        if self.parquet_flag and self.retention.keeps_history and not self.update_flag:
+            # A full load covers the whole history window, of which only the
+            # hot window is kept hourly. It is collected once, as both the
+            # history and the hourly data are written from it
+            with self.profiler.stage(self.name_hourly_stage()) as stage:
+                frame_weather: pl.DataFrame = self.weather_data.collect(
+                    engine='streaming' if self.streaming_flag else 'auto'
+                )
+                stage.rows_out = frame_weather.height
+                self.weather_data = frame_weather.lazy()
+            with self.profiler.stage('history') as stage:
+                history_file_path: Path = self.save_weather_history(
+                    since=calculate_cutoff_datetime(self.retention.history_days)
+                )
+                if self.profiler.enabled:
+                    stage.rows_out = count_parquet_rows(history_file_path)
+                    stage.bytes_written = measure_bytes(history_file_path)
+            self.weather_data = self.weather_data.filter(
+                expr_filter_column_timedelta(
+                    'reference_timestamp', self.retention.hourly_days
+                )
             )
+            sink_stage_name = 'sink'
+        with self.profiler.stage(sink_stage_name) as stage:
+            if self.parquet_flag and self.partitioned_flag:
+                save_weather_data_to_partitions(
+                    frame_weather=self.weather_data,
+                    dataset_path=self.weather_dataset_path,
+                    merge=self.update_flag,
+                    parquet_kwargs=self.parquet_kwargs,
+                    retention_days=self.retention.hourly_days,
+                )
+                self.weather_data = scan_weather_dataset(
+                    self.weather_dataset_path,
+                    since=calculate_cutoff_datetime(self.retention.hourly_days),
+                )
+            elif self.parquet_flag:
+                save_weather_data_to_parquet(
+                    frame_weather=(
+                        self.compact_weather_data()
+                        if self.compact_flag
+                        else self.weather_data
+                    ),
+                    data_path=self.data_path,
+                    parquet_kwargs=self.parquet_kwargs,
+                    engine='streaming' if self.streaming_flag else 'auto',
+                )
+                self.weather_data = scan_weather_data(self.weather_data_path)
+            if self.parquet_flag and self.profiler.enabled:
+                stage.rows_out = count_parquet_rows(self.weather_data_path)
+                stage.bytes_written = measure_bytes(self.weather_data_path)
+        if self.parquet_flag:
+            with self.profiler.stage('rollup') as stage:
+                rollup_file_path: Path = save_weather_rollups(
+                    self.weather_data,
+                    self.data_path,
+                    parquet_kwargs=self.parquet_kwargs,
+                )
+                if self.profiler.enabled:
+                    stage.rows_in = count_parquet_rows(self.weather_data_path)
+                    stage.rows_out = count_parquet_rows(rollup_file_path)
+                    stage.bytes_written = measure_bytes(rollup_file_path)
+            if self.retention.keeps_history and self.update_flag:
+                # Roll the days of the hot window up into the history before
+                # the next update drops their hourly rows
+                with self.profiler.stage('history') as stage:
+                    history_file_path = self.save_weather_history(
+                        since=calculate_cutoff_datetime(self.retention.hourly_days)
+                    )
+                    if self.profiler.enabled:
+                        stage.rows_out = count_parquet_rows(history_file_path)
+                        stage.bytes_written = measure_bytes(history_file_path)
+            self.save_watermarks()
+
+    def save_watermarks(self) -> None:
+        self.watermarks = update_watermarks(
+            self.watermarks, self.weather_data, self.download_results
+        )
+        save_watermarks(self.watermarks, self.data_path)
 
     def load_metrics(self):
-        self.metrics: pl.LazyFrame = create_metrics(self.weather_data, TIME_PERIODS)
+        self.metrics = create_metrics(self.weather_data, TIME_PERIODS)
         logger.debug(f'metrics generated as {type(self.metrics)}')
         return self.metrics
 
     def save_metrics(self):
         if self.parquet_flag:
-            save_metrics_to_parquet(
-                frame_metrics=self.metrics, data_path=self.data_path
-            )
+            metrics_file_path: Path = Path(self.data_path, 'metrics.parquet')
+            with self.profiler.stage('metrics') as stage:
+                save_metrics_to_parquet(
+                    frame_metrics=self.metrics,
+                    data_path=self.data_path,
+                    parquet_kwargs=self.parquet_kwargs,
+                )
+                map_frame_file_path: Path = save_map_frame(
+                    self.meta_stations,
+                    pl.scan_parquet(metrics_file_path),
+                    self.data_path,
+                    parquet_kwargs=self.parquet_kwargs,
+                )
+                if self.profiler.enabled:
+                    stage.rows_in = count_parquet_rows(self.weather_data_path)
+                    stage.rows_out = count_parquet_rows(metrics_file_path)
+                    stage.bytes_written = measure_bytes(
+                        metrics_file_path, map_frame_file_path
+                    )
 
     def prepare_data(self):
-        self.load_metadata()
-        self.save_metadata()
+        with self.profiler.stage('metadata load') as stage:
+            self.load_metadata()
+            if self.profiler.enabled:
+                stage.rows_out = sum(
+                    frame_meta.select(pl.len()).collect().item()
+                    for frame_meta in (
+                        self.meta_parameters,
+                        self.meta_datainventory,
+                        self.meta_stations,
+                    )
+                )
+        with self.profiler.stage('metadata save') as stage:
+            self.save_metadata()
+            if self.parquet_flag and self.profiler.enabled:
+                stage.bytes_written = measure_bytes(
+                    *(
+                        Path(self.data_path, f'meta_{meta_type}.parquet')
+                        for meta_type in ('parameters', 'stations', 'datainventory')
+                    )
+                )
         if self.weather_flag:
             with tempfile.TemporaryDirectory() as tmpdir:
                 down_path: Path = Path(tmpdir)
                 logger.info(f'Download path: {down_path}')
                 self.load_weather_data(down_path)
-            self.save_weather_data()
+                self.save_weather_data()
         if self.metrics_flag:
             self.load_metrics()
             self.save_metrics()
@@ -209,6 +461,7 @@ def load_metadata_to_lazyframe(
     meta_type: str,
     meta_schema: Mapping[str, type[pl.DataType]],
     meta_cols_to_keep: Sequence[str],
+    base_url: str = URL_GEO_ADMIN_BASE,
 ) -> pl.LazyFrame:
     """Load metadata from a Parquet file.
 
@@ -223,6 +476,8 @@ def load_metadata_to_lazyframe(
         Dict with polars schema, structured as 'column_name': polars.Datatype
     meta_cols_to_keep: Sequence[str]
         Column names to keep in metadata DataFrame
+    base_url: str
+        Base URL of the MeteoSwiss OGD endpoint
 
     Returns
     -------
@@ -237,7 +492,7 @@ def load_metadata_to_lazyframe(
                 schema=meta_schema,
                 columns=meta_cols_to_keep,
             )
-            for file_path in META_FILE_PATH_DICT[meta_type]
+            for file_path in rebase_urls(META_FILE_PATH_DICT[meta_type], base_url)
         ]
     ).lazy()
     return frame_meta
@@ -245,37 +500,103 @@ def load_metadata_to_lazyframe(
 
 def save_metadata_to_parquet(frame_meta: pl.LazyFrame, data_path: Path, meta_type: str):
     out_path = Path(data_path, f'meta_{meta_type}.parquet')
-    frame_meta.sink_parquet(out_path)
+    sink_parquet_atomic(frame_meta, out_path, parquet_kwargs={})
     logger.debug(f'{out_path} written to parquet')
 
 
-def load_metadata_per_type(meta_type: str, meta_schema, meta_cols_to_keep):
+def load_metadata_per_type(
+    meta_type: str, meta_schema, meta_cols_to_keep, base_url: str = URL_GEO_ADMIN_BASE
+):
     metadata = load_metadata_to_lazyframe(
         meta_type,
         meta_schema,
         meta_cols_to_keep,
+        base_url=base_url,
     )
     logger.debug(f'meta_{meta_type} generated as {type(metadata)}')
     return metadata
 
 
-def save_weather_data_to_parquet(frame_weather: pl.LazyFrame, data_path: Path):
+def save_weather_data_to_parquet(
+    frame_weather: pl.LazyFrame,
+    data_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+    engine: EngineType = 'auto',
+):
+    """Sink weather data to weather_data.parquet
+
+    The rows are sorted by reference_timestamp, so that the row group
+    statistics let readers skip row groups outside the time window they read.
+    The file is replaced atomically, so that the query may read the existing
+    file while it is being replaced.
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Weather data query to execute
+    data_path: Path
+        Directory to write weather_data.parquet to
+    parquet_kwargs: Mapping[str, Any]
+        Arguments passed to sink_parquet, one of PARQUET_WRITE_PROFILES
+    engine: EngineType
+        Polars engine executing the query, 'streaming' processes the files in
+        batches instead of loading them into memory
+    """
     weather_data_file_path: Path = Path(data_path, 'weather_data.parquet')
-    frame_weather.sink_parquet(weather_data_file_path, **SINK_PARQUET_KWARGS)
+    sink_parquet_atomic(
+        frame_weather.sort('reference_timestamp'),
+        weather_data_file_path,
+        parquet_kwargs,
+        engine,
+    )
     logger.debug(f'weather_data written to {weather_data_file_path}')
 
 
-def save_metrics_to_parquet(frame_metrics: pl.LazyFrame, data_path: Path):
+def save_weather_data_to_partitions(
+    frame_weather: pl.LazyFrame,
+    dataset_path: Path,
+    merge: bool,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+    retention_days: int = WEATHER_RETENTION_DAYS,
+) -> None:
+    write_weather_partitions(
+        frame_weather, dataset_path, merge=merge, parquet_kwargs=parquet_kwargs
+    )
+    prune_weather_partitions(dataset_path, calculate_cutoff_datetime(retention_days))
+    logger.debug(f'weather_data written to {dataset_path}')
+
+
+def save_metrics_to_parquet(
+    frame_metrics: pl.LazyFrame,
+    data_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+):
     metrics_file_path: Path = Path(data_path, 'metrics.parquet')
-    frame_metrics.sink_parquet(metrics_file_path, **SINK_PARQUET_KWARGS)
+    sink_parquet_atomic(frame_metrics, metrics_file_path, parquet_kwargs)
     logger.debug(f'metrics written to {metrics_file_path}')
 
 
+def rebase_urls(urls: Iterable[str], base_url: str) -> list[str]:
+    """Point URLs of the MeteoSwiss OGD endpoint to another base URL
+
+    Other URLs and local paths are returned unchanged.
+    """
+    return [
+        base_url + url.removeprefix(URL_GEO_ADMIN_BASE)
+        if url.startswith(f'{URL_GEO_ADMIN_BASE}/')
+        else url
+        for url in urls
+    ]
+
+
 def combine_urls_parts_to_string(
-    station: pl.Series, station_type_string: str, timeframe: str
+    station: pl.Series,
+    station_type_string: str,
+    timeframe: str,
+    base_url: str = URL_GEO_ADMIN_BASE,
 ) -> pl.Series:
     return (
-        f'{URL_GEO_ADMIN_BASE}/{URL_GEO_ADMIN_STATION_TYPE_BASE}{station_type_string}/'
+        f'{base_url}/{URL_GEO_ADMIN_STATION_TYPE_BASE}{station_type_string}/'
         + station
         + f'/ogd-smn{station_type_string}_'
         + station
@@ -284,7 +605,10 @@ def combine_urls_parts_to_string(
 
 
 def generate_download_urls(
-    station_series: pl.Series, station_type: str, timeframe: str
+    station_series: pl.Series,
+    station_type: str,
+    timeframe: str,
+    base_url: str = URL_GEO_ADMIN_BASE,
 ) -> pl.Series:
     check_generate_download_urls_arguments_or_raise_error(station_type, timeframe)
     station_type_string = str()
@@ -293,7 +617,9 @@ def generate_download_urls(
             station_type_string = '-precip'
         case 'weather':
             station_type_string = ''
-    return combine_urls_parts_to_string(station_series, station_type_string, timeframe)
+    return combine_urls_parts_to_string(
+        station_series, station_type_string, timeframe, base_url
+    )
 
 
 def check_generate_download_urls_arguments_or_raise_error(
@@ -305,19 +631,61 @@ def check_generate_download_urls_arguments_or_raise_error(
         raise TypeError(STATION_TYPE_ERROR_STRING)
 
 
-def expr_filter_column_timedelta(col_name: str, delta_time: int) -> pl.Expr:
-    return pl.col(col_name) >= pl.lit(
-        datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
-        - timedelta(days=delta_time)
+def calculate_cutoff_datetime(delta_time: int) -> datetime:
+    return datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING)) - timedelta(
+        days=delta_time
     )
 
 
+def expr_filter_column_timedelta(col_name: str, delta_time: int) -> pl.Expr:
+    return pl.col(col_name) >= pl.lit(calculate_cutoff_datetime(delta_time))
+
+
 def load_weather(
     metadata: pl.LazyFrame,
     schema_dict_lazyframe: Mapping[str, type[pl.DataType]],
     down_path: Path,
     update_data=False,
+    max_workers: int = DOWNLOAD_MAX_WORKERS,
+    cache_path: Path | None = None,
+    existing_weather: pl.LazyFrame | None = None,
+    append_only: bool = False,
+    watermarks: pl.DataFrame | None = None,
+    download_results: list[DownloadResult] | None = None,
+    streaming: bool = False,
+    profiler: StageProfiler | None = None,
+    base_url: str = URL_GEO_ADMIN_BASE,
+    retention_days: int = WEATHER_RETENTION_DAYS,
 ) -> pl.LazyFrame:
+    """Download the station CSV files and combine them into hourly weather data
+
+    Parameters
+    ----------
+    update_data: bool
+        Only add the most recent data to existing_weather
+    watermarks: pl.DataFrame | None
+        Watermarks per station, in an update only stations due for new data
+        are downloaded and only rows newer than the watermark are kept
+    download_results: list[DownloadResult] | None
+        List to which the DownloadResult of every download is appended
+    streaming: bool
+        Keep the CSV files as lazy scans in the returned query instead of
+        parsing them, the files must then exist until it has been executed
+    profiler: StageProfiler | None
+        Profiler recording the download and parse stages
+    base_url: str
+        Base URL of the MeteoSwiss OGD endpoint to download from
+    retention_days: int
+        Days of hourly data to keep, older rows are dropped
+
+    Returns
+    -------
+        Polars LazyFrame with weather data
+    """
+    if download_results is None:
+        download_results = []
+    if profiler is None:
+        profiler = StageProfiler(enabled=False)
     # Create stations dataframe
     stations: pl.DataFrame = filter_unique_station_names(metadata).collect()
     # Create dict for lazyframe kwargs
@@ -329,13 +697,79 @@ def load_weather(
     station_series_weather: pl.Series = filter_stations_to_series(
         stations, station_type='Automatic weather stations'
     )
-    # Download most recent CSV files for both station types
-    download_files(
-        generate_file_path_series(
-            station_series_precipitation, station_series_weather, timeframe='now'
-        ),
-        down_path,
-    )
+    if update_data and watermarks is not None:
+        now: datetime = datetime.now(tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+        station_series_precipitation = filter_stations_due(
+            station_series_precipitation, watermarks, now
+        )
+        station_series_weather = filter_stations_due(
+            station_series_weather, watermarks, now
+        )
+    with profiler.stage('download') as stage:
+        # Download most recent CSV files for both station types
+        download_results += download_files(
+            generate_file_path_series(
+                station_series_precipitation,
+                station_series_weather,
+                timeframe='now',
+                base_url=base_url,
+            ),
+            down_path,
+            max_workers=max_workers,
+            cache_path=cache_path,
+        )
+        if not update_data:
+            download_results += download_files(
+                generate_file_path_series(
+                    station_series_precipitation,
+                    station_series_weather,
+                    timeframe='recent',
+                    base_url=base_url,
+                ),
+                down_path,
+                max_workers=max_workers,
+                cache_path=cache_path,
+            )
+        stage.bytes_written = sum(result.bytes_written for result in download_results)
+    # Streaming keeps the CSV files as lazy scans, which are parsed in the stage
+    # executing the weather data query
+    with profiler.stage('scan' if streaming else 'parse'):
+        return parse_weather_files(
+            down_path,
+            kwargs_lazyframe,
+            metadata,
+            station_series_precipitation,
+            station_series_weather,
+            download_results,
+            update_data=update_data,
+            existing_weather=existing_weather,
+            append_only=append_only,
+            watermarks=watermarks,
+            streaming=streaming,
+            base_url=base_url,
+            retention_days=retention_days,
+        )
+
+
+def parse_weather_files(
+    down_path: Path,
+    kwargs_lazyframe: dict,
+    metadata: pl.LazyFrame,
+    station_series_precipitation: pl.Series,
+    station_series_weather: pl.Series,
+    download_results: list[DownloadResult],
+    update_data: bool = False,
+    existing_weather: pl.LazyFrame | None = None,
+    append_only: bool = False,
+    watermarks: pl.DataFrame | None = None,
+    streaming: bool = False,
+    base_url: str = URL_GEO_ADMIN_BASE,
+    retention_days: int = WEATHER_RETENTION_DAYS,
+) -> pl.LazyFrame:
+    """Combine the downloaded station CSV files into hourly weather data
+
+    The parameters are those of load_weather(), which downloads the files.
+    """
     # If data only needs to be updated, do that
     if update_data:
         return update_weather_data(
@@ -344,21 +778,25 @@ def load_weather(
             metadata,
             station_series_precipitation,
             station_series_weather,
+            downloaded_urls=collect_downloaded_urls(download_results),
+            weather=existing_weather,
+            append_only=append_only,
+            watermarks=watermarks,
+            download_results=download_results,
+            streaming=streaming,
+            base_url=base_url,
+            retention_days=retention_days,
         )
     urls_weather: pl.Series = pl.concat(
-        generate_download_urls(station_series_weather, 'weather', period)
+        generate_download_urls(station_series_weather, 'weather', period, base_url)
         for period in TIMEFRAME_STRINGS
     )
     urls_rainfall: pl.Series = pl.concat(
-        generate_download_urls(station_series_precipitation, 'rainfall', period)
+        generate_download_urls(
+            station_series_precipitation, 'rainfall', period, base_url
+        )
         for period in TIMEFRAME_STRINGS
     )
-    download_files(
-        generate_file_path_series(
-            station_series_precipitation, station_series_weather, timeframe='recent'
-        ),
-        down_path,
-    )
     # download_files(
     #     pl.concat(
     #         generate_download_urls(station_series, station_type, 'recent')
@@ -370,30 +808,28 @@ def load_weather(
     #     ),
     #     down_path,
     # )
-    try:
-        weather: pl.LazyFrame = create_rainfall_weather_lazyframes(
-            down_path, urls_weather, kwargs_lazyframe
-        )
-        rainfall: pl.LazyFrame = create_rainfall_weather_lazyframes(
-            down_path, urls_rainfall, kwargs_lazyframe
-        )
-    except polars.exceptions.ComputeError:
-        weather = create_rainfall_weather_dataframes(
-            down_path, urls_weather, kwargs_lazyframe
-        )
-        rainfall = create_rainfall_weather_dataframes(
-            down_path, urls_rainfall, kwargs_lazyframe
-        )
-    return concat_rainfall_weather_lazyframes(metadata, rainfall, weather)
+    downloaded_urls: set[str] = collect_downloaded_urls(download_results)
+    urls_weather = filter_downloaded_urls(urls_weather, downloaded_urls)
+    urls_rainfall = filter_downloaded_urls(urls_rainfall, downloaded_urls)
+    weather: pl.LazyFrame = create_rainfall_weather_lazyframes(
+        down_path, urls_weather, kwargs_lazyframe, streaming=streaming
+    )
+    rainfall: pl.LazyFrame = create_rainfall_weather_lazyframes(
+        down_path, urls_rainfall, kwargs_lazyframe, streaming=streaming
+    )
+    return concat_rainfall_weather_lazyframes(
+        metadata, rainfall, weather, retention_days=retention_days
+    )
 
 
 def generate_file_path_series(
     station_series_precipitation: pl.Series,
     station_series_weather: pl.Series,
     timeframe: str,
+    base_url: str = URL_GEO_ADMIN_BASE,
 ) -> pl.Series:
     return pl.concat(
-        generate_download_urls(station_series, station_type, timeframe)
+        generate_download_urls(station_series, station_type, timeframe, base_url)
         for station_series, station_type in zip(
             (station_series_weather, station_series_precipitation),
             ('weather', 'rainfall'),
@@ -402,6 +838,29 @@ def generate_file_path_series(
     )
 
 
+def collect_downloaded_urls(download_results: Iterable[DownloadResult]) -> set[str]:
+    return {result.url for result in download_results if result.ok}
+
+
+def filter_downloaded_urls(
+    urls: pl.Series, downloaded_urls: Collection[str]
+) -> pl.Series:
+    """Drop URLs whose file has not been downloaded completely
+
+    Parameters
+    ----------
+    urls: pl.Series
+        URLs to read the files of
+    downloaded_urls: Collection[str]
+        URLs that have been downloaded successfully
+
+    Returns
+    -------
+        Polars Series with the URLs that are safe to read
+    """
+    return urls.filter(urls.is_in(list(downloaded_urls)))
+
+
 def create_kwargs_lazyframe(
     schema_dict_lazyframe: Mapping[str, type[pl.DataType]],
 ) -> dict[str, str | bool | Mapping[str, type[pl.DataType]]]:
@@ -418,52 +877,99 @@ def update_weather_data(
     metadata: pl.LazyFrame,
     station_series_precipitation: pl.Series,
     station_series_weather: pl.Series,
+    downloaded_urls: Collection[str] | None = None,
+    weather: pl.LazyFrame | None = None,
+    append_only: bool = False,
+    watermarks: pl.DataFrame | None = None,
+    download_results: Sequence[DownloadResult] = (),
+    streaming: bool = False,
+    base_url: str = URL_GEO_ADMIN_BASE,
+    retention_days: int = WEATHER_RETENTION_DAYS,
 ) -> pl.LazyFrame:
-    weather: pl.LazyFrame = pl.scan_parquet(Path(DATA_PATH, 'weather_data.parquet'))
-    urls_weather: pl.Series = generate_download_urls(
-        station_series_weather, 'weather', 'now'
-    )
-    urls_rainfall: pl.Series = generate_download_urls(
-        station_series_precipitation, 'rainfall', 'now'
-    )
-    weather_now: pl.LazyFrame = create_rainfall_weather_lazyframes(
-        down_path, urls_weather, kwargs_lazyframe
-    )
-    rainfall_now: pl.LazyFrame = create_rainfall_weather_lazyframes(
-        down_path, urls_rainfall, kwargs_lazyframe
-    )
-    weather_new: pl.LazyFrame = concat_rainfall_weather_lazyframes(
-        metadata, rainfall_now, weather_now
-    )
-    weather_max_timestamp: datetime = (
-        weather.select('reference_timestamp').max().collect().item()
-    )
-    return (
-        pl.concat(
-            (
-                weather_new.filter(
-                    pl.col('reference_timestamp') > weather_max_timestamp
+    """Combine the most recent data with the existing weather data
+
+    Parameters
+    ----------
+    weather: pl.LazyFrame | None
+        Existing weather data, read from weather_data.parquet in DATA_PATH if
+        None
+    append_only: bool
+        Return only the rows newer than the existing weather data, instead of
+        the existing and new rows combined
+    watermarks: pl.DataFrame | None
+        Last ingested timestamp and source file fingerprint per station, derived
+        from the existing weather data if None
+    download_results: Sequence[DownloadResult]
+        Results of the downloads, files with an unchanged fingerprint are
+        not parsed
+    streaming: bool
+        Keep the CSV files as lazy scans instead of parsing them
+    base_url: str
+        Base URL of the MeteoSwiss OGD endpoint the files were downloaded from
+    retention_days: int
+        Days of hourly data to keep, older rows are dropped
+
+    Returns
+    -------
+        Polars LazyFrame with weather data
+    """
+    if weather is None:
+        weather = scan_weather_data(Path(DATA_PATH, 'weather_data.parquet'))
+    if watermarks is None:
+        watermarks = create_watermarks_from_weather(weather)
+    frames_now: list[pl.LazyFrame] = []
+    for urls in (
+        generate_download_urls(
+            station_series_precipitation, 'rainfall', 'now', base_url
+        ),
+        generate_download_urls(station_series_weather, 'weather', 'now', base_url),
+    ):
+        if downloaded_urls is not None:
+            urls = filter_downloaded_urls(urls, downloaded_urls)
+        urls = filter_changed_urls(urls, download_results, watermarks)
+        if urls.len() > 0:
+            frames_now.append(
+                create_rainfall_weather_lazyframes(
+                    down_path,
+                    urls,
+                    kwargs_lazyframe,
+                    watermarks=watermarks,
+                    streaming=streaming,
                 )
-                .select(weather.drop('station_name').collect_schema().names())
-                .join(
-                    metadata.select(('station_abbr', 'station_name')),
-                    on=['station_abbr'],
-                ),
-                weather,
             )
+    logger.info(f'{len(frames_now)} station types with new data to parse')
+    weather_appended: pl.LazyFrame = (
+        concat_rainfall_weather_lazyframes(
+            metadata, *frames_now, retention_days=retention_days
+        )
+        .select(weather.drop('station_name').collect_schema().names())
+        .join(
+            metadata.select(('station_abbr', 'station_name')),
+            on=['station_abbr'],
+        )
+        if frames_now
+        else weather.clear()
+    )
+    if append_only:
+        return weather_appended.filter(
+            expr_filter_column_timedelta('reference_timestamp', retention_days)
         )
-        .filter(expr_filter_column_timedelta('reference_timestamp', 31))
+    return (
+        pl.concat((weather_appended, weather), how='vertical_relaxed')
+        .filter(expr_filter_column_timedelta('reference_timestamp', retention_days))
         .unique()
     )
 
 
 def concat_rainfall_weather_lazyframes(
-    metadata: pl.LazyFrame, frame_rainfall: pl.LazyFrame, frame_weather: pl.LazyFrame
+    metadata: pl.LazyFrame,
+    *frames_weather: pl.LazyFrame,
+    retention_days: int = WEATHER_RETENTION_DAYS,
 ) -> pl.LazyFrame:
     return (
-        pl.concat([frame_rainfall, frame_weather], how='diagonal')
+        pl.concat(frames_weather, how='diagonal')
         .sort('reference_timestamp')
-        .filter(expr_filter_column_timedelta('reference_timestamp', 31))
+        .filter(expr_filter_column_timedelta('reference_timestamp', retention_days))
         .group_by_dynamic('reference_timestamp', every='1h', group_by='station_abbr')
         .agg(*EXPR_WEATHER_AGGREGATION_TYPES)
         .join(
@@ -483,103 +989,162 @@ def filter_unique_station_names(metadata: pl.LazyFrame) -> pl.LazyFrame:
 
 
 def create_rainfall_weather_lazyframes(
-    down_path: Path, station_urls: pl.Series, kwargs_lazyframe: dict
+    down_path: Path,
+    station_urls: pl.Series,
+    kwargs_lazyframe: dict,
+    watermarks: pl.DataFrame | None = None,
+    streaming: bool = False,
 ) -> pl.LazyFrame:
     """Create LazyFrame from CSV urls
 
+    The files are grouped by their header line. Each group is parsed with a
+    single multi-file scan, the groups are parsed in parallel and their
+    schemas are only aligned when they are concatenated.
+    In streaming mode, the scans are concatenated without being parsed, so
+    that filters and aggregations of the caller are pushed into them.
+
     Parameters
     ----------
-    station_series: pl.Series
-        Station names
-    station_type: str
-        Station type, one of 'rainfall' or 'weather'
-    timeframe: str
-        Time range, one of 'recent' or 'now'
+    down_path: Path
+        Directory the files have been downloaded to
+    station_urls: pl.Series
+        URLs of the downloaded files
     kwargs_lazyframe: dict
         Arguments to pass to LazyFrame constructor
+    watermarks: pl.DataFrame | None
+        Watermarks per station, only rows newer than these are kept
+    streaming: bool
+        Return the lazy scans instead of parsing the files
 
     Returns
     -------
-        Polars LazyFrame with rainfall/weather data
+        Polars LazyFrame with rainfall/weather data, without rows if no file
+        has been downloaded
     """
-
-    try:
-        return (
-            scan_csv_from_urls(down_path, kwargs_lazyframe, station_urls)
-            .with_columns(TIMEZONE_EXPRESSION)
-            .collect()
-            .lazy()
+    url_groups: dict[str, list[str]] = group_urls_by_csv_header(down_path, station_urls)
+    if not url_groups:
+        logger.warning('No downloaded files to parse')
+        return create_empty_weather_frame(kwargs_lazyframe)
+    if streaming:
+        return pl.concat(
+            (
+                scan_csv_group(down_path, urls, kwargs_lazyframe, watermarks)
+                for urls in url_groups.values()
+            ),
+            how='diagonal_relaxed',
         )
-    except polars.exceptions.ComputeError:
-        raise
+    return pl.concat(
+        parse_csv_groups(down_path, url_groups, kwargs_lazyframe, watermarks),
+        how='diagonal_relaxed',
+    ).lazy()
 
 
-def scan_csv_from_urls(
-    down_path: Path, kwargs_lazyframe: dict, station_urls
-) -> pl.LazyFrame:
-    return pl.scan_csv(
-        tuple(Path(down_path, Path(url).name) for url in station_urls),
-        **kwargs_lazyframe,
-    ).collect()
+def create_empty_weather_frame(kwargs_lazyframe: dict) -> pl.LazyFrame:
+    """Create weather data without rows, with the columns that are aggregated"""
+    schema_overrides: Mapping[str, type[pl.DataType]] = kwargs_lazyframe.get(
+        'schema_overrides', {}
+    )
+    return pl.LazyFrame(
+        schema={
+            'station_abbr': pl.String,
+            'reference_timestamp': pl.Datetime(time_zone=TIMEZONE_SWITZERLAND_STRING),
+            **{
+                column: schema_overrides.get(column, pl.Float32)
+                for columns in PARAMETER_AGGREGATION_TYPES.values()
+                for column in columns
+            },
+        }
+    )
 
 
-def download_files(urls: Iterable[str], down_path: Path):
-    with requests.Session() as s:
-        retries = Retry(
-            total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
-        )
-        s.mount('https://', HTTPAdapter(max_retries=retries))
-        for url in track(urls, description='Downloading....'):
-            try:
-                r = s.get(url)
-                with Path(Path(down_path, Path(url).name)).open('wb') as f:
-                    f.write(r.content)
-                logger.debug(f'file {Path(down_path, Path(url).name)} written.')
-            except Exception as e:
-                print('Exception in download_url():', e)
+def read_csv_header(file_path: Path) -> str:
+    with file_path.open(encoding=METEO_CSV_ENCODING) as f:
+        return f.readline().strip()
+
 
+def group_urls_by_csv_header(
+    down_path: Path, station_urls: Iterable[str]
+) -> dict[str, list[str]]:
+    """Group URLs by the header line of their downloaded file
 
-def create_rainfall_weather_dataframes(
+    Parameters
+    ----------
+    down_path: Path
+        Directory the files have been downloaded to
+    station_urls: Iterable[str]
+        URLs of the downloaded files
+
+    Returns
+    -------
+        Dict with header line as key and URLs with this header as value
+    """
+    url_groups: dict[str, list[str]] = {}
+    for url in station_urls:
+        url_groups.setdefault(
+            read_csv_header(Path(down_path, Path(url).name)), []
+        ).append(url)
+    return url_groups
+
+
+def parse_csv_groups(
     down_path: Path,
-    station_urls,
+    url_groups: Mapping[str, Sequence[str]],
     kwargs_lazyframe: dict,
-) -> pl.LazyFrame:
-    """Create LazyFrame from CSV urls
+    watermarks: pl.DataFrame | None = None,
+) -> list[pl.DataFrame]:
+    """Parse groups of CSV files with the same header in parallel
 
     Parameters
     ----------
-    station_series: pl.Series
-        Station names
-    station_type: str
-        Station type, one of 'rainfall' or 'weather'
-    timeframe: str
-        Time range, one of 'recent' or 'now'
+    down_path: Path
+        Directory the files have been downloaded to
+    url_groups: Mapping[str, Sequence[str]]
+        URLs grouped by the header line of their file
     kwargs_lazyframe: dict
         Arguments to pass to LazyFrame constructor
+    watermarks: pl.DataFrame | None
+        Watermarks per station, only rows newer than these are kept
 
     Returns
     -------
-        Polars LazyFrame with rainfall/weather data
+        One DataFrame per group
     """
-    return (
-        read_csv_from_urls(down_path, kwargs_lazyframe, station_urls)
-        .with_columns(TIMEZONE_EXPRESSION)
-        .lazy()
-    )
 
+    def parse_csv_group(station_urls: Sequence[str]) -> pl.DataFrame:
+        start: float = time.perf_counter()
+        frame_parsed: pl.DataFrame = scan_csv_group(
+            down_path, station_urls, kwargs_lazyframe, watermarks
+        ).collect()
+        logger.info(
+            f'Parsed {len(station_urls)} files with {frame_parsed.width} columns '
+            f'into {frame_parsed.height} rows in {time.perf_counter() - start:.3f}s'
+        )
+        return frame_parsed
 
-def read_csv_from_urls(
-    down_path: Path, kwargs_lazyframe: dict, station_urls
-) -> pl.DataFrame:
-    return pl.concat(
-        tuple(
-            pl.read_csv(
-                Path(down_path, Path(url).name),
-                **kwargs_lazyframe,
-            )
-            for url in station_urls
-        ),
-        how='diagonal',
+    with ThreadPoolExecutor(max_workers=max(len(url_groups), 1)) as executor:
+        return list(executor.map(parse_csv_group, url_groups.values()))
+
+
+def scan_csv_group(
+    down_path: Path,
+    station_urls: Iterable[str],
+    kwargs_lazyframe: dict,
+    watermarks: pl.DataFrame | None = None,
+) -> pl.LazyFrame:
+    frame_weather: pl.LazyFrame = scan_csv_from_urls(
+        down_path, kwargs_lazyframe, station_urls
+    ).with_columns(TIMEZONE_EXPRESSION)
+    if watermarks is not None:
+        frame_weather = filter_rows_after_watermarks(frame_weather, watermarks)
+    return frame_weather
+
+
+def scan_csv_from_urls(
+    down_path: Path, kwargs_lazyframe: dict, station_urls: Iterable[str]
+) -> pl.LazyFrame:
+    return pl.scan_csv(
+        tuple(Path(down_path, Path(url).name) for url in station_urls),
+        **kwargs_lazyframe,
     )
 
 
@@ -587,7 +1152,7 @@ def create_metrics(
     weather_data: pl.LazyFrame, time_periods: Mapping[int, datetime]
 ) -> pl.LazyFrame:
     return (
-        concat_metrics_frame(time_periods, weather_data)
+        aggregate_metrics_frame(time_periods, weather_data)
         .unpivot(
             index=('station_abbr', 'station_name', 'time_period'),
             variable_name='parameter',
@@ -597,19 +1162,81 @@ def create_metrics(
     )
 
 
-def concat_metrics_frame(
+def aggregate_metrics_frame(
     time_periods: Mapping[int, datetime], weather_data: pl.LazyFrame
 ) -> pl.LazyFrame:
-    return pl.concat(
-        tuple(
-            weather_data.filter(pl.col('reference_timestamp') >= datetime_period)
-            .drop(
-                'reference_timestamp',
-            )
-            .group_by(('station_abbr', 'station_name'))
-            .agg(*EXPR_WEATHER_AGGREGATION_TYPES)
-            .with_columns(pl.lit(period).alias('time_period').cast(pl.Int8))
-            for period, datetime_period in time_periods.items()
+    """Aggregate weather data per station over nested time periods in one pass
+
+    Every row is tagged with the smallest time period it belongs to and
+    aggregated once per station and tag. The sums and counts of the larger
+    time periods are then cumulative sums over the smaller ones.
+
+    Parameters
+    ----------
+    time_periods: Mapping[int, datetime]
+        Time period in days with the oldest reference_timestamp it includes
+    weather_data: pl.LazyFrame
+        Hourly weather data
+
+    Returns
+    -------
+        Polars LazyFrame with one row per station and time period
+    """
+    schema: pl.Schema = weather_data.collect_schema()
+    periods: list[tuple[int, datetime]] = sorted(
+        time_periods.items(), key=lambda item: item[1], reverse=True
+    )
+    columns_sum: tuple[str, ...] = PARAMETER_AGGREGATION_TYPES['sum']
+    columns_mean: tuple[str, ...] = PARAMETER_AGGREGATION_TYPES['mean']
+    keys: tuple[str, ...] = ('station_abbr', 'station_name')
+    frame_windows: pl.LazyFrame = pl.LazyFrame(
+        {
+            'window': range(len(periods)),
+            'time_period': [period for period, _ in periods],
+        },
+        schema={'window': pl.UInt32, 'time_period': pl.Int8},
+    )
+    frame_buckets: pl.LazyFrame = (
+        weather_data.with_columns(
+            pl.coalesce(
+                pl.when(pl.col('reference_timestamp') >= datetime_period).then(
+                    pl.lit(window, dtype=pl.UInt32)
+                )
+                for window, (_, datetime_period) in enumerate(periods)
+            ).alias('window')
+        )
+        .drop_nulls('window')
+        .group_by(*keys, 'window')
+        .agg(
+            pl.len().alias('rows'),
+            pl.col(columns_sum).cast(pl.Float64).sum(),
+            pl.col(columns_mean).cast(pl.Float64).sum().name.suffix('_sum'),
+            pl.col(columns_mean).count().name.suffix('_count'),
+        )
+    )
+    return (
+        frame_buckets.select(keys)
+        .unique()
+        .join(frame_windows, how='cross')
+        .join(frame_buckets, on=(*keys, 'window'), how='left', nulls_equal=True)
+        .with_columns(
+            pl.exclude(*keys, 'window', 'time_period')
+            .fill_null(0)
+            .cum_sum()
+            .over(keys, order_by='window')
+        )
+        .filter(pl.col('rows') > 0)
+        .select(
+            *keys,
+            *(pl.col(column).cast(schema[column]) for column in columns_sum),
+            *(
+                pl.when(pl.col(f'{column}_count') > 0)
+                .then(pl.col(f'{column}_sum') / pl.col(f'{column}_count'))
+                .cast(schema[column])
+                .alias(column)
+                for column in columns_mean
+            ),
+            'time_period',
         )
     )
 
@@ -665,6 +1292,83 @@ def main(
     update: Annotated[
         bool, typer.Option('--update', '-u', help='update values')
     ] = False,
+    max_workers: Annotated[
+        int,
+        typer.Option(
+            '--max-workers',
+            min=1,
+            help='Maximum number of concurrent downloads',
+        ),
+    ] = DOWNLOAD_MAX_WORKERS,
+    cache: Annotated[
+        bool,
+        typer.Option(
+            '--cache',
+            '-c',
+            help='Revalidate downloads against a persistent cache in the data path',
+        ),
+    ] = False,
+    partitioned: Annotated[
+        bool,
+        typer.Option(
+            '--partitioned',
+            help='Save weather data as dataset partitioned by station and month',
+        ),
+    ] = False,
+    write_profile: Annotated[
+        ParquetWriteProfile,
+        typer.Option('--write-profile', help='Parquet write profile'),
+    ] = ParquetWriteProfile.ARCHIVE,
+    streaming: Annotated[
+        bool,
+        typer.Option(
+            '--streaming',
+            help='Parse and aggregate the CSV files with the streaming engine',
+        ),
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            '--profile',
+            help='Print wall time, CPU time, peak memory, rows and bytes per stage',
+        ),
+    ] = False,
+    profile_json: Annotated[
+        Path | None,
+        typer.Option('--profile-json', help='Write the stage profile to a JSON file'),
+    ] = None,
+    base_url: Annotated[
+        str,
+        typer.Option(
+            '--base-url',
+            envvar=URL_BASE_ENVIRONMENT_VARIABLE,
+            help='Base URL of the MeteoSwiss OGD endpoint, e.g. of a local mock',
+        ),
+    ] = URL_GEO_ADMIN_BASE,
+    compact: Annotated[
+        bool,
+        typer.Option(
+            '--compact',
+            help='Save weather data with dictionary-encoded stations',
+        ),
+    ] = False,
+    hourly_days: Annotated[
+        int,
+        typer.Option(
+            '--hourly-days',
+            min=WEATHER_HOURLY_DAYS_MIN,
+            help='Days of weather data kept hourly',
+        ),
+    ] = WEATHER_RETENTION_DAYS,
+    history_days: Annotated[
+        int,
+        typer.Option(
+            '--history-days',
+            min=0,
+            help=f'Days of daily weather data kept in {WEATHER_HISTORY_FILE_NAME}, '
+            'no history if not longer than --hourly-days',
+        ),
+    ] = WEATHER_HISTORY_DAYS,
     verbose_warn: Annotated[
         bool,
         typer.Option(
@@ -681,6 +1385,10 @@ def main(
     ] = False,
     data_path: Annotated[Path | None, typer.Argument()] = None,
 ):
+    if compact and partitioned:
+        raise typer.BadParameter(
+            'not available with --partitioned', param_hint='--compact'
+        )
     _set_loglevel(verbose_debug, verbose_info, verbose_warn)
     logger.debug('Logger created')
     if metrics:
@@ -688,6 +1396,7 @@ def main(
     if update:
         logger.info('Update of existing data activated')
 
+    profiler: StageProfiler = StageProfiler(enabled=profile or profile_json is not None)
     new_data = DataPreparation(
         data_path=data_path,
         parquet_flag=parquet,
@@ -695,9 +1404,22 @@ def main(
         weather_flag=weather,
         metrics_flag=metrics,
         update_flag=update,
+        max_workers=max_workers,
+        cache_flag=cache,
+        partitioned_flag=partitioned,
+        write_profile=write_profile.value,
+        streaming_flag=streaming,
+        profiler=profiler,
+        base_url=base_url.rstrip('/'),
+        compact_flag=compact,
+        retention=RetentionPolicy(hourly_days=hourly_days, history_days=history_days),
     )
     new_data.prepare_data()
     logger.info('Files successfully downloaded')
+    if profile:
+        Console().print(profiler.create_table())
+    if profile_json is not None:
+        profiler.write_json(profile_json)
 
 
 if __name__ == '__main__':
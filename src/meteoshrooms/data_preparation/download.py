@@ -0,0 +1,309 @@
+"""Download MeteoSwiss OGD files for the MeteoShrooms data preparation"""
+
+import hashlib
+import json
+import logging
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from rich.progress import track
+
+from meteoshrooms.data_preparation.constants import (
+    DOWNLOAD_CACHE_INDEX_FILE_NAME,
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_CONTENT_LENGTH_ERROR_STRING,
+    DOWNLOAD_MAX_WORKERS,
+    DOWNLOAD_RETRY_KWARGS,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DownloadResult:
+    """Outcome of downloading a single URL"""
+
+    url: str
+    file_path: Path | None
+    status: int | None
+    bytes_written: int
+    duration: float
+    error: str | None = None
+    fingerprint: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class DownloadCache:
+    """Persistent on-disk cache of downloaded files and their HTTP validators
+
+    Every cached URL keeps a copy of the last downloaded file together with
+    the ETag and Last-Modified headers the server sent with it. These are
+    sent back as If-None-Match and If-Modified-Since, so that an unchanged
+    file is answered with 304 Not Modified and copied from the cache.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.cache_path: Path = cache_path
+        self.index_path: Path = Path(cache_path, DOWNLOAD_CACHE_INDEX_FILE_NAME)
+        self._lock: threading.Lock = threading.Lock()
+        self.index: dict[str, dict[str, str]] = self.load_index()
+
+    def load_index(self) -> dict[str, dict[str, str]]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with self.index_path.open(encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.warning(f'Download cache index {self.index_path} unreadable, reset')
+            return {}
+
+    def save_index(self) -> None:
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        tmp_index_path: Path = self.index_path.with_suffix('.tmp')
+        with self._lock, tmp_index_path.open('w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        tmp_index_path.replace(self.index_path)
+
+    def file_path(self, url: str) -> Path:
+        return Path(self.cache_path, Path(url).name)
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Return the request headers to revalidate a cached URL
+
+        Parameters
+        ----------
+        url: str
+            URL to revalidate
+
+        Returns
+        -------
+            If-None-Match and/or If-Modified-Since headers, empty if the URL
+            has not been cached yet
+        """
+        entry: dict[str, str] | None = self.index.get(url)
+        if entry is None or not self.file_path(url).exists():
+            return {}
+        headers: dict[str, str] = {}
+        if 'etag' in entry:
+            headers['If-None-Match'] = entry['etag']
+        if 'last_modified' in entry:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(
+        self, url: str, r: requests.Response, file_path: Path, fingerprint: str
+    ) -> None:
+        validators: dict[str, str] = {
+            key: r.headers[header]
+            for key, header in (('etag', 'ETag'), ('last_modified', 'Last-Modified'))
+            if header in r.headers
+        }
+        if not validators:
+            return
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        copy_file_atomic(file_path, self.file_path(url))
+        with self._lock:
+            self.index[url] = validators | {'fingerprint': fingerprint}
+
+    def restore(self, url: str, file_path: Path) -> str | None:
+        copy_file_atomic(self.file_path(url), file_path)
+        return self.index[url].get('fingerprint')
+
+
+def copy_file_atomic(source: Path, destination: Path) -> None:
+    part_path: Path = destination.with_name(f'{destination.name}.part')
+    try:
+        shutil.copyfile(source, part_path)
+        part_path.replace(destination)
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
+def create_download_session(
+    max_workers: int = DOWNLOAD_MAX_WORKERS,
+) -> requests.Session:
+    """Create a Session with a retry policy and a connection pool per host
+
+    Parameters
+    ----------
+    max_workers: int
+        Number of connections kept open per host, should match the number of
+        downloads in flight
+
+    Returns
+    -------
+        Session mounted for both http and https
+    """
+    session: requests.Session = requests.Session()
+    adapter: HTTPAdapter = HTTPAdapter(
+        pool_maxsize=max_workers,
+        max_retries=Retry(**DOWNLOAD_RETRY_KWARGS),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def write_response_to_file(r: requests.Response, file_path: Path) -> tuple[int, str]:
+    """Stream a response body to a file, which only appears once complete
+
+    The body is written in chunks to a temporary file next to file_path,
+    which is renamed to file_path after its length has been checked against
+    the Content-Length header.
+
+    Parameters
+    ----------
+    r: requests.Response
+        Response opened with stream=True
+    file_path: Path
+        Destination file
+
+    Returns
+    -------
+        Number of bytes written and a fingerprint of the content
+    """
+    part_path: Path = file_path.with_name(f'{file_path.name}.part')
+    bytes_written: int = 0
+    content_hash = hashlib.blake2b(digest_size=16)
+    try:
+        with part_path.open('wb') as f:
+            for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                content_hash.update(chunk)
+                bytes_written += f.write(chunk)
+        content_length: str | None = r.headers.get('Content-Length')
+        if content_length is not None and int(content_length) != r.raw.tell():
+            raise ValueError(
+                DOWNLOAD_CONTENT_LENGTH_ERROR_STRING.format(
+                    expected=content_length, received=r.raw.tell()
+                )
+            )
+        part_path.replace(file_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+    return bytes_written, content_hash.hexdigest()
+
+
+def download_file(
+    session: requests.Session,
+    url: str,
+    down_path: Path,
+    cache: DownloadCache | None = None,
+) -> DownloadResult:
+    """Download a single file into a directory
+
+    Parameters
+    ----------
+    session: requests.Session
+        Session to send the request with
+    url: str
+        URL to download, the file name is taken from the last URL part
+    down_path: Path
+        Directory to write the file to
+    cache: DownloadCache | None
+        Cache to revalidate the file against
+
+    Returns
+    -------
+        DownloadResult, with error set instead of raising if the download failed
+    """
+    file_path: Path = Path(down_path, Path(url).name)
+    start: float = time.perf_counter()
+    status: int | None = None
+    try:
+        with session.get(
+            url,
+            headers=cache.conditional_headers(url) if cache is not None else None,
+            stream=True,
+        ) as r:
+            status = r.status_code
+            if cache is not None and status == requests.codes.not_modified:
+                cached_fingerprint: str | None = cache.restore(url, file_path)
+                logger.debug(f'file {file_path} unchanged, restored from cache.')
+                return DownloadResult(
+                    url=url,
+                    file_path=file_path,
+                    status=status,
+                    bytes_written=file_path.stat().st_size,
+                    duration=time.perf_counter() - start,
+                    fingerprint=cached_fingerprint,
+                )
+            r.raise_for_status()
+            bytes_written, fingerprint = write_response_to_file(r, file_path)
+            if cache is not None:
+                cache.store(url, r, file_path, fingerprint)
+    except (requests.RequestException, OSError, ValueError) as e:
+        return DownloadResult(
+            url=url,
+            file_path=None,
+            status=status,
+            bytes_written=0,
+            duration=time.perf_counter() - start,
+            error=f'{type(e).__name__}: {e}',
+        )
+    logger.debug(f'file {file_path} written.')
+    return DownloadResult(
+        url=url,
+        file_path=file_path,
+        status=status,
+        bytes_written=bytes_written,
+        duration=time.perf_counter() - start,
+        fingerprint=fingerprint,
+    )
+
+
+def download_files(
+    urls: Iterable[str],
+    down_path: Path,
+    max_workers: int = DOWNLOAD_MAX_WORKERS,
+    cache_path: Path | None = None,
+) -> list[DownloadResult]:
+    """Download files concurrently into a directory
+
+    Parameters
+    ----------
+    urls: Iterable[str]
+        URLs to download, the file name is taken from the last URL part
+    down_path: Path
+        Directory to write the files to
+    max_workers: int
+        Maximum number of downloads in flight
+    cache_path: Path | None
+        Directory of a persistent DownloadCache, unchanged files are then
+        revalidated with conditional requests instead of downloaded again
+
+    Returns
+    -------
+        One DownloadResult per URL, in the order of urls
+    """
+    cache: DownloadCache | None = (
+        DownloadCache(cache_path) if cache_path is not None else None
+    )
+    with (
+        create_download_session(max_workers) as s,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        futures: list[Future[DownloadResult]] = [
+            executor.submit(download_file, s, url, down_path, cache) for url in urls
+        ]
+        for _ in track(
+            as_completed(futures), total=len(futures), description='Downloading....'
+        ):
+            pass
+    if cache is not None:
+        cache.save_index()
+    results: list[DownloadResult] = [future.result() for future in futures]
+    for result in results:
+        if not result.ok:
+            logger.warning(f'Download of {result.url} failed: {result.error}')
+    return results
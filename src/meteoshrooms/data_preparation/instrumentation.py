@@ -0,0 +1,149 @@
+"""Record wall time, CPU time, memory, rows and bytes per preparation stage"""
+
+import json
+import logging
+import resource
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import polars as pl
+from rich.table import Table
+
+from meteoshrooms.data_preparation.constants import (
+    PROC_CLEAR_REFS_PATH,
+    PROC_STATUS_PATH,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageRecord:
+    """Measurements of a single pipeline stage
+
+    The rows and bytes are filled in by the stage itself where they can be
+    known without executing extra queries, and stay None otherwise.
+    """
+
+    stage: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    bytes_written: int | None = None
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak resident set size of the process, Linux only
+
+    Returns
+    -------
+        True if the peak was reset, False if it covers the process lifetime
+    """
+    try:
+        PROC_CLEAR_REFS_PATH.write_text('5')
+    except OSError:
+        return False
+    return True
+
+
+def read_peak_rss_bytes() -> int:
+    """Read the peak resident set size since the last reset or process start"""
+    try:
+        for line in PROC_STATUS_PATH.read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kibibytes elsewhere
+    return peak_rss if sys.platform == 'darwin' else peak_rss * 1024
+
+
+def measure_bytes(*paths: Path) -> int:
+    """Sum the size of files and of the Parquet files in directories"""
+    return sum(
+        file_path.stat().st_size
+        for path in paths
+        if path.exists()
+        for file_path in (sorted(path.rglob('*.parquet')) if path.is_dir() else (path,))
+    )
+
+
+def count_parquet_rows(path: Path) -> int:
+    """Count the rows of a Parquet file or dataset from its file metadata"""
+    return pl.scan_parquet(path).select(pl.len()).collect().item()
+
+
+class StageProfiler:
+    """Collect a StageRecord for every stage run inside stage()
+
+    A disabled profiler measures nothing, so that stages can be wrapped
+    unconditionally.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled: bool = enabled
+        self.records: list[StageRecord] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record: StageRecord = StageRecord(name)
+        if not self.enabled:
+            yield record
+            return
+        peak_reset: bool = reset_peak_rss()
+        wall_start: float = time.perf_counter()
+        cpu_start: float = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall_start
+            record.cpu_seconds = time.process_time() - cpu_start
+            record.peak_rss_bytes = read_peak_rss_bytes()
+            self.records.append(record)
+            logger.debug(
+                f'stage {name}: {record.wall_seconds:.2f} s, peak RSS '
+                f'{record.peak_rss_bytes / 2**20:.0f} MiB'
+                + ('' if peak_reset else ' since process start')
+            )
+
+    def to_dicts(self) -> list[dict[str, str | int | float | None]]:
+        return [asdict(record) for record in self.records]
+
+    def write_json(self, file_path: Path) -> None:
+        with file_path.open('w', encoding='utf-8') as f:
+            json.dump({'stages': self.to_dicts()}, f, indent=1)
+        logger.debug(f'stage profile written to {file_path}')
+
+    def create_table(self) -> Table:
+        table: Table = Table(title='Data preparation stages')
+        table.add_column('Stage')
+        table.add_column('Wall (s)', justify='right')
+        table.add_column('CPU (s)', justify='right')
+        table.add_column('Peak RSS (MiB)', justify='right')
+        table.add_column('Rows in', justify='right')
+        table.add_column('Rows out', justify='right')
+        table.add_column('Written (MiB)', justify='right')
+        for record in self.records:
+            table.add_row(
+                record.stage,
+                f'{record.wall_seconds:.2f}',
+                f'{record.cpu_seconds:.2f}',
+                f'{record.peak_rss_bytes / 2**20:.0f}',
+                format_optional(record.rows_in, '{:,}'),
+                format_optional(record.rows_out, '{:,}'),
+                format_optional(record.bytes_written, '{:.1f}', scale=2**20),
+            )
+        return table
+
+
+def format_optional(value: int | None, template: str, scale: int = 1) -> str:
+    return (
+        '-' if value is None else template.format(value / scale if scale > 1 else value)
+    )
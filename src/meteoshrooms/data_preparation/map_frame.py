@@ -0,0 +1,79 @@
+"""Join station metadata and metrics into the frame plotted on the map"""
+
+import logging
+from itertools import chain
+from pathlib import Path
+from typing import Any, Mapping
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    MAP_FRAME_FILE_NAME,
+    MAP_FRAME_STATION_COLUMNS,
+    PARAMETER_AGGREGATION_TYPES,
+    SINK_PARQUET_KWARGS,
+)
+from meteoshrooms.data_preparation.weather_store import sink_parquet_atomic
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def create_map_frame(
+    frame_meta_stations: pl.LazyFrame, frame_metrics: pl.LazyFrame
+) -> pl.LazyFrame:
+    """Create one ready-to-plot row per station and time period
+
+    Parameters
+    ----------
+    frame_meta_stations: pl.LazyFrame
+        Stations metadata
+    frame_metrics: pl.LazyFrame
+        Metrics in long format, with a parameter and a value column
+
+    Returns
+    -------
+        Polars LazyFrame with time_period, the labelled station columns and
+        one column per parameter, sorted by time_period
+    """
+    parameters: tuple[str, ...] = tuple(
+        chain.from_iterable(PARAMETER_AGGREGATION_TYPES.values())
+    )
+    frame_metrics_wide: pl.LazyFrame = frame_metrics.group_by(
+        'station_abbr', 'time_period'
+    ).agg(
+        pl.col('value')
+        .filter(pl.col('parameter') == parameter)
+        .first()
+        .alias(parameter)
+        for parameter in parameters
+    )
+    return (
+        frame_meta_stations.unique(subset='station_abbr', keep='last')
+        .with_columns(
+            pl.col('station_type_en').alias('Station Type'),
+            pl.col('station_abbr').alias('Short Code'),
+            Altitude=pl.col('station_height_masl')
+            .cast(pl.Int16)
+            .cast(pl.String)
+            .add(' m.a.s.l'),
+        )
+        .join(frame_metrics_wide, on='station_abbr')
+        .select('time_period', *MAP_FRAME_STATION_COLUMNS, *parameters)
+        .sort('time_period', 'station_name')
+    )
+
+
+def save_map_frame(
+    frame_meta_stations: pl.LazyFrame,
+    frame_metrics: pl.LazyFrame,
+    data_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> Path:
+    map_frame_file_path: Path = Path(data_path, MAP_FRAME_FILE_NAME)
+    sink_parquet_atomic(
+        create_map_frame(frame_meta_stations, frame_metrics),
+        map_frame_file_path,
+        parquet_kwargs,
+    )
+    logger.debug(f'map frame written to {map_frame_file_path}')
+    return map_frame_file_path
@@ -0,0 +1,150 @@
+"""Keep recent weather data hourly and compact older data into a daily history"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    SINK_PARQUET_KWARGS,
+    WEATHER_HISTORY_DAYS,
+    WEATHER_HISTORY_FILE_NAME,
+    WEATHER_HISTORY_INTERVAL,
+    WEATHER_HOURLY_DAYS_MIN,
+    WEATHER_RETENTION_DAYS,
+)
+from meteoshrooms.data_preparation.rollups import create_weather_rollups
+from meteoshrooms.data_preparation.weather_store import sink_parquet_atomic
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How long weather data is kept hourly and as daily history
+
+    Hourly data is kept for hourly_days, the hot window. Every day inside it is
+    also rolled up into the daily history, which is kept for history_days, so
+    that the hourly rows can be dropped once they leave the hot window. A
+    history_days not longer than hourly_days keeps no history. The metrics are
+    computed from the hourly data, so hourly_days covers at least the longest
+    time period.
+    """
+
+    hourly_days: int = WEATHER_RETENTION_DAYS
+    history_days: int = WEATHER_HISTORY_DAYS
+
+    def __post_init__(self) -> None:
+        if self.hourly_days < WEATHER_HOURLY_DAYS_MIN:
+            raise ValueError(
+                f'hourly_days must be at least {WEATHER_HOURLY_DAYS_MIN}, the '
+                'longest time period of the metrics'
+            )
+
+    @property
+    def keeps_history(self) -> bool:
+        return self.history_days > self.hourly_days
+
+
+def create_weather_history(
+    frame_weather: pl.LazyFrame, since: datetime
+) -> pl.LazyFrame:
+    """Compact hourly weather data into daily buckets
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Hourly weather data with station_abbr, station_name and
+        reference_timestamp
+    since: datetime
+        Oldest reference_timestamp in frame_weather, buckets starting before
+        it are left out, as they lack the hours before since
+
+    Returns
+    -------
+        Polars LazyFrame with one row per station and day
+    """
+    return (
+        create_weather_rollups(frame_weather, intervals=(WEATHER_HISTORY_INTERVAL,))
+        .filter(pl.col('reference_timestamp') >= since)
+        .drop('interval')
+    )
+
+
+def save_weather_history(
+    frame_weather: pl.LazyFrame,
+    data_path: Path,
+    since: datetime,
+    history_since: datetime,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> Path:
+    """Merge the daily buckets of hourly weather data into the history table
+
+    A bucket replaces the one of the same station and day in the table, so
+    the bucket of the current day grows with every run. Buckets older than
+    history_since are removed, which keeps the table bounded.
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Hourly weather data, as passed to create_weather_history()
+    data_path: Path
+        Directory of weather_history.parquet
+    since: datetime
+        Oldest reference_timestamp in frame_weather
+    history_since: datetime
+        Oldest bucket start to keep in the table
+    parquet_kwargs: Mapping[str, Any]
+        Arguments passed to sink_parquet, one of PARQUET_WRITE_PROFILES
+
+    Returns
+    -------
+        Path of the history table
+    """
+    history_file_path: Path = Path(data_path, WEATHER_HISTORY_FILE_NAME)
+    frame_history: pl.LazyFrame = create_weather_history(frame_weather, since)
+    if history_file_path.exists():
+        frame_history = pl.concat(
+            (pl.scan_parquet(history_file_path), frame_history),
+            how='diagonal_relaxed',
+        ).unique(
+            subset=('station_abbr', 'reference_timestamp'),
+            keep='last',
+            maintain_order=True,
+        )
+    sink_parquet_atomic(
+        frame_history.filter(pl.col('reference_timestamp') >= history_since).sort(
+            'reference_timestamp'
+        ),
+        history_file_path,
+        parquet_kwargs,
+    )
+    logger.debug(f'weather history written to {history_file_path}')
+    return history_file_path
+
+
+def scan_weather_history(
+    data_path: Path, since: datetime | None = None
+) -> pl.LazyFrame:
+    """Scan the daily buckets of the history table
+
+    Parameters
+    ----------
+    data_path: Path
+        Directory of the history table
+    since: datetime | None
+        Oldest bucket start to return, row groups before it are skipped
+
+    Returns
+    -------
+        History LazyFrame with one row per station and day
+    """
+    frame_history: pl.LazyFrame = pl.scan_parquet(
+        Path(data_path, WEATHER_HISTORY_FILE_NAME)
+    )
+    if since is not None:
+        frame_history = frame_history.filter(pl.col('reference_timestamp') >= since)
+    return frame_history
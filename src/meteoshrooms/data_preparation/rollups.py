@@ -0,0 +1,89 @@
+"""Roll hourly weather data up into coarser time buckets for the charts"""
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    EXPR_WEATHER_AGGREGATION_TYPES,
+    SINK_PARQUET_KWARGS,
+    WEATHER_ROLLUP_FILE_NAME,
+    WEATHER_ROLLUP_INTERVALS,
+)
+from meteoshrooms.data_preparation.weather_store import sink_parquet_atomic
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def create_weather_rollups(
+    frame_weather: pl.LazyFrame, intervals: tuple[str, ...] = WEATHER_ROLLUP_INTERVALS
+) -> pl.LazyFrame:
+    """Aggregate hourly weather data into buckets per station
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Hourly weather data with station_abbr, station_name and
+        reference_timestamp
+    intervals: tuple[str, ...]
+        Bucket sizes, as accepted by group_by_dynamic
+
+    Returns
+    -------
+        Polars LazyFrame with one row per interval, station and bucket. The
+        reference_timestamp of a bucket is its start, precipitation is summed
+        and all other parameters are averaged.
+    """
+    frame_sorted: pl.LazyFrame = frame_weather.sort('reference_timestamp')
+    return pl.concat(
+        frame_sorted.group_by_dynamic(
+            'reference_timestamp',
+            every=interval,
+            group_by=('station_abbr', 'station_name'),
+        )
+        .agg(*EXPR_WEATHER_AGGREGATION_TYPES)
+        .with_columns(pl.lit(interval).alias('interval'))
+        for interval in intervals
+    ).sort('interval', 'reference_timestamp')
+
+
+def save_weather_rollups(
+    frame_weather: pl.LazyFrame,
+    data_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> Path:
+    rollup_file_path: Path = Path(data_path, WEATHER_ROLLUP_FILE_NAME)
+    sink_parquet_atomic(
+        create_weather_rollups(frame_weather), rollup_file_path, parquet_kwargs
+    )
+    logger.debug(f'weather rollups written to {rollup_file_path}')
+    return rollup_file_path
+
+
+def scan_weather_rollups(
+    data_path: Path, interval: str, since: datetime | None = None
+) -> pl.LazyFrame:
+    """Scan the buckets of one interval from the rollup table
+
+    Parameters
+    ----------
+    data_path: Path
+        Directory of the rollup table
+    interval: str
+        Bucket size, one of WEATHER_ROLLUP_INTERVALS
+    since: datetime | None
+        Oldest bucket start to return
+
+    Returns
+    -------
+        Rollup LazyFrame without the interval column
+    """
+    frame_rollup: pl.LazyFrame = pl.scan_parquet(
+        Path(data_path, WEATHER_ROLLUP_FILE_NAME)
+    ).filter(pl.col('interval') == interval)
+    if since is not None:
+        frame_rollup = frame_rollup.filter(pl.col('reference_timestamp') >= since)
+    return frame_rollup.drop('interval')
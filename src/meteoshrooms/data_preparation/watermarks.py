@@ -0,0 +1,197 @@
+"""Track per station how far the weather data has been ingested"""
+
+import logging
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    SCHEMA_WATERMARKS,
+    WATERMARKS_FILE_NAME,
+    WATERMARKS_UPDATE_INTERVAL,
+)
+from meteoshrooms.data_preparation.download import DownloadResult
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def load_watermarks(data_path: Path) -> pl.DataFrame | None:
+    watermarks_file_path: Path = Path(data_path, WATERMARKS_FILE_NAME)
+    if not watermarks_file_path.exists():
+        return None
+    return pl.read_parquet(watermarks_file_path).cast(SCHEMA_WATERMARKS)
+
+
+def save_watermarks(watermarks: pl.DataFrame, data_path: Path) -> None:
+    watermarks_file_path: Path = Path(data_path, WATERMARKS_FILE_NAME)
+    part_path: Path = watermarks_file_path.with_name(
+        f'{watermarks_file_path.name}.part'
+    )
+    watermarks.write_parquet(part_path)
+    part_path.replace(watermarks_file_path)
+    logger.debug(f'watermarks written to {watermarks_file_path}')
+
+
+def create_watermarks_from_weather(frame_weather: pl.LazyFrame) -> pl.DataFrame:
+    """Derive watermarks from existing weather data
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Weather data with station_abbr and reference_timestamp
+
+    Returns
+    -------
+        Watermarks with the latest reference_timestamp per station and no
+        source file
+    """
+    return (
+        frame_weather.group_by('station_abbr')
+        .agg(pl.col('reference_timestamp').max().alias('last_timestamp'))
+        .with_columns(
+            pl.lit(None).alias('source_url'),
+            pl.lit(None).alias('source_fingerprint'),
+        )
+        .cast(SCHEMA_WATERMARKS)
+        .collect()
+    )
+
+
+def filter_stations_due(
+    station_series: pl.Series, watermarks: pl.DataFrame, now: datetime
+) -> pl.Series:
+    """Keep the stations for which new hourly data can be expected
+
+    Parameters
+    ----------
+    station_series: pl.Series
+        Lowercase station abbreviations, as used in the download URLs
+    watermarks: pl.DataFrame
+        Watermarks per station
+    now: datetime
+        Time of the update run
+
+    Returns
+    -------
+        Polars Series with the stations whose watermark is older than one
+        update interval before the current full hour
+    """
+    due_before: datetime = (
+        now.replace(minute=0, second=0, microsecond=0) - WATERMARKS_UPDATE_INTERVAL
+    )
+    stations_up_to_date: pl.Series = watermarks.filter(
+        pl.col('last_timestamp') >= due_before
+    )['station_abbr'].str.to_lowercase()
+    return station_series.filter(~station_series.is_in(stations_up_to_date.to_list()))
+
+
+def filter_changed_urls(
+    urls: pl.Series,
+    download_results: Iterable[DownloadResult],
+    watermarks: pl.DataFrame,
+) -> pl.Series:
+    """Drop URLs whose file has the same fingerprint as at the last ingestion
+
+    Parameters
+    ----------
+    urls: pl.Series
+        URLs of the downloaded files
+    download_results: Iterable[DownloadResult]
+        Results of the downloads, holding the fingerprint of each file
+    watermarks: pl.DataFrame
+        Watermarks per station, holding the fingerprint of the last file ingested
+
+    Returns
+    -------
+        Polars Series with the URLs that need to be parsed
+    """
+    ingested_fingerprints: dict[str, str] = dict(
+        watermarks.select('source_url', 'source_fingerprint').drop_nulls().iter_rows()
+    )
+    unchanged_urls: list[str] = [
+        result.url
+        for result in download_results
+        if result.fingerprint is not None
+        and ingested_fingerprints.get(result.url) == result.fingerprint
+    ]
+    return urls.filter(~urls.is_in(unchanged_urls))
+
+
+def filter_rows_after_watermarks(
+    frame_weather: pl.LazyFrame, watermarks: pl.DataFrame
+) -> pl.LazyFrame:
+    """Keep the rows newer than the watermark of their station
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Weather data with station_abbr and reference_timestamp
+    watermarks: pl.DataFrame
+        Watermarks per station, stations without one keep all rows
+
+    Returns
+    -------
+        Polars LazyFrame with rows not yet ingested
+    """
+    return (
+        frame_weather.join(
+            watermarks.lazy().select('station_abbr', 'last_timestamp'),
+            on='station_abbr',
+            how='left',
+        )
+        .filter(
+            pl.col('last_timestamp').is_null()
+            | (pl.col('reference_timestamp') > pl.col('last_timestamp'))
+        )
+        .drop('last_timestamp')
+    )
+
+
+def update_watermarks(
+    watermarks: pl.DataFrame | None,
+    frame_weather: pl.LazyFrame,
+    download_results: Iterable[DownloadResult],
+) -> pl.DataFrame:
+    """Advance the watermarks with newly ingested weather data
+
+    Parameters
+    ----------
+    watermarks: pl.DataFrame | None
+        Current watermarks, None if there are none yet
+    frame_weather: pl.LazyFrame
+        Weather data that has been ingested
+    download_results: Iterable[DownloadResult]
+        Results of the downloads of the ingested files
+
+    Returns
+    -------
+        Polars DataFrame with one watermark per station
+    """
+    source_files: pl.DataFrame = pl.DataFrame(
+        [
+            (
+                Path(result.url).name.split('_')[1].upper(),
+                result.url,
+                result.fingerprint,
+            )
+            for result in download_results
+            if result.ok and result.url.endswith('_h_now.csv')
+        ],
+        schema=('station_abbr', 'source_url', 'source_fingerprint'),
+        orient='row',
+    ).cast(pl.String)
+    new_watermarks: pl.DataFrame = (
+        create_watermarks_from_weather(frame_weather)
+        .drop('source_url', 'source_fingerprint')
+        .join(source_files, on='station_abbr', how='full', coalesce=True)
+        .select(tuple(SCHEMA_WATERMARKS))
+    )
+    if watermarks is None:
+        return new_watermarks.filter(pl.col('last_timestamp').is_not_null())
+    return (
+        watermarks.update(new_watermarks, on='station_abbr', how='full')
+        .filter(pl.col('last_timestamp').is_not_null())
+        .sort('station_abbr')
+    )
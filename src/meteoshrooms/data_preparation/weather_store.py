@@ -0,0 +1,189 @@
+"""Store weather data as a Parquet dataset partitioned by station and month"""
+
+import logging
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Mapping
+
+import polars as pl
+
+from meteoshrooms.data_preparation.constants import (
+    SINK_PARQUET_KWARGS,
+    WEATHER_DATASET_FILE_NAME,
+    WEATHER_DATASET_HIVE_SCHEMA,
+    WEATHER_DATASET_MONTH_FORMAT,
+    EngineType,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+EXPR_PARTITION_MONTH: pl.Expr = (
+    pl.col('reference_timestamp')
+    .dt.strftime(WEATHER_DATASET_MONTH_FORMAT)
+    .alias('month')
+)
+
+
+def create_partition_path(dataset_path: Path, station_abbr: str, month: str) -> Path:
+    return Path(
+        dataset_path,
+        f'station_abbr={station_abbr}',
+        f'month={month}',
+        WEATHER_DATASET_FILE_NAME,
+    )
+
+
+def weather_dataset_exists(dataset_path: Path) -> bool:
+    return next(dataset_path.glob(f'*/*/{WEATHER_DATASET_FILE_NAME}'), None) is not None
+
+
+def write_parquet_atomic(
+    frame: pl.DataFrame,
+    file_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path: Path = file_path.with_name(f'{file_path.name}.part')
+    try:
+        frame.write_parquet(part_path, **parquet_kwargs)
+        part_path.replace(file_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
+def sink_parquet_atomic(
+    frame: pl.LazyFrame,
+    file_path: Path,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+    engine: EngineType = 'auto',
+) -> None:
+    """Sink a query to a Parquet file, which only appears once complete
+
+    Readers of file_path see either the previous or the new file, never a
+    partly written one, and the query may read the file it replaces.
+
+    Parameters
+    ----------
+    frame: pl.LazyFrame
+        Query to execute
+    file_path: Path
+        Destination file
+    parquet_kwargs: Mapping[str, Any]
+        Arguments passed to sink_parquet, one of PARQUET_WRITE_PROFILES
+    engine: EngineType
+        Polars engine executing the query
+    """
+    part_path: Path = file_path.with_name(f'{file_path.name}.part')
+    try:
+        frame.sink_parquet(part_path, engine=engine, **parquet_kwargs)
+        part_path.replace(file_path)
+    finally:
+        part_path.unlink(missing_ok=True)
+
+
+def write_weather_partitions(
+    frame_weather: pl.LazyFrame,
+    dataset_path: Path,
+    merge: bool = True,
+    parquet_kwargs: Mapping[str, Any] = SINK_PARQUET_KWARGS,
+) -> list[Path]:
+    """Write weather data into the partitions it belongs to
+
+    Only the partitions that receive rows are written, all others are left
+    untouched.
+
+    Parameters
+    ----------
+    frame_weather: pl.LazyFrame
+        Hourly weather data with station_abbr and reference_timestamp
+    dataset_path: Path
+        Root directory of the partitioned dataset
+    merge: bool
+        Merge the rows into the existing partition files, rows of the same
+        reference_timestamp are replaced. Otherwise, affected partitions are
+        overwritten.
+    parquet_kwargs: Mapping[str, Any]
+        Arguments passed to write_parquet, one of PARQUET_WRITE_PROFILES
+
+    Returns
+    -------
+        Paths of the partition files written
+    """
+    partitions: dict[tuple[str, ...], pl.DataFrame] = (
+        frame_weather.with_columns(EXPR_PARTITION_MONTH)
+        .collect()
+        .partition_by(
+            tuple(WEATHER_DATASET_HIVE_SCHEMA), as_dict=True, include_key=False
+        )
+    )
+    written_paths: list[Path] = []
+    for (station_abbr, month), partition in partitions.items():
+        partition_path: Path = create_partition_path(dataset_path, station_abbr, month)
+        if merge and partition_path.exists():
+            partition = pl.concat(
+                (pl.read_parquet(partition_path), partition), how='diagonal_relaxed'
+            ).unique(subset='reference_timestamp', keep='last')
+        write_parquet_atomic(
+            partition.sort('reference_timestamp'), partition_path, parquet_kwargs
+        )
+        written_paths.append(partition_path)
+    logger.debug(f'{len(written_paths)} weather partitions written to {dataset_path}')
+    return written_paths
+
+
+def prune_weather_partitions(dataset_path: Path, cutoff: datetime) -> list[Path]:
+    """Remove month partitions that lie entirely before a cutoff
+
+    Parameters
+    ----------
+    dataset_path: Path
+        Root directory of the partitioned dataset
+    cutoff: datetime
+        Oldest point in time to keep
+
+    Returns
+    -------
+        Paths of the month directories removed
+    """
+    cutoff_month: str = cutoff.strftime(WEATHER_DATASET_MONTH_FORMAT)
+    removed_paths: list[Path] = [
+        month_path
+        for month_path in dataset_path.glob('station_abbr=*/month=*')
+        if month_path.name.removeprefix('month=') < cutoff_month
+    ]
+    for month_path in removed_paths:
+        shutil.rmtree(month_path)
+    return removed_paths
+
+
+def scan_weather_dataset(
+    dataset_path: Path, since: datetime | None = None
+) -> pl.LazyFrame:
+    """Scan the partitioned weather dataset
+
+    Parameters
+    ----------
+    dataset_path: Path
+        Root directory of the partitioned dataset
+    since: datetime | None
+        Oldest reference_timestamp to return, month partitions before it are
+        not read at all
+
+    Returns
+    -------
+        Weather data LazyFrame with station_abbr as its first column
+    """
+    frame_weather: pl.LazyFrame = pl.scan_parquet(
+        Path(dataset_path, '**', WEATHER_DATASET_FILE_NAME),
+        hive_partitioning=True,
+        hive_schema=WEATHER_DATASET_HIVE_SCHEMA,
+    )
+    if since is not None:
+        frame_weather = frame_weather.filter(
+            pl.col('month') >= since.strftime(WEATHER_DATASET_MONTH_FORMAT),
+            pl.col('reference_timestamp') >= since,
+        )
+    return frame_weather.select(
+        pl.col('station_abbr'), pl.exclude('station_abbr', 'month')
+    )
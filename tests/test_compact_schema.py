@@ -0,0 +1,75 @@
+"""Tests module meteoshrooms.data_preparation.compact_schema.py"""
+
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.compact_schema import LayoutResult, benchmark_layouts
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.compact_schema import (
+    compact_weather_frame,
+    create_weather_stations,
+    save_weather_stations,
+    scan_weather_data,
+)
+
+END: datetime = datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+
+
+@pytest.fixture
+def frame_weather() -> pl.LazyFrame:
+    return generate_weather_frame(n_stations=3, n_days=2, end=END).lazy()
+
+
+def test_weather_stations_keep_stations_missing_from_metadata(frame_weather):
+    meta_stations: pl.LazyFrame = generate_meta_stations_frame(n_stations=3).lazy()
+    frame_stations: pl.DataFrame = create_weather_stations(
+        meta_stations.slice(1),
+        frame_weather.with_columns(pl.lit('Stored name').alias('station_name')),
+    )
+    assert frame_stations['station_name'].to_list() == [
+        'Stored name',
+        *meta_stations.slice(1).collect()['station_name'],
+    ]
+    assert frame_stations.schema['station_abbr'] == pl.Enum(
+        frame_stations['station_abbr'].cast(pl.String)
+    )
+
+
+def test_compact_layout_read_back_as_plain(frame_weather, tmp_path):
+    meta_stations: pl.LazyFrame = generate_meta_stations_frame(n_stations=3).lazy()
+    frame_stations: pl.DataFrame = create_weather_stations(meta_stations)
+    station_enum: pl.DataType = frame_stations.schema['station_abbr']
+    save_weather_stations(frame_stations, tmp_path)
+    file_path: Path = Path(tmp_path, 'weather_data.parquet')
+    compact_weather_frame(frame_weather, station_enum).sink_parquet(file_path)
+    frame_compact: pl.LazyFrame = pl.scan_parquet(file_path)
+    assert 'station_name' not in frame_compact.collect_schema().names()
+    assert frame_compact.collect_schema()['station_abbr'] == station_enum
+    assert_frame_equal(
+        scan_weather_data(file_path).collect(),
+        frame_weather.collect(),
+        check_column_order=False,
+    )
+
+
+def test_scan_weather_data_reads_plain_layout(frame_weather, tmp_path):
+    file_path: Path = Path(tmp_path, 'weather_data.parquet')
+    frame_weather.sink_parquet(file_path)
+    assert_frame_equal(scan_weather_data(file_path).collect(), frame_weather.collect())
+
+
+def test_benchmark_layouts_compact_smaller():
+    plain, compact = benchmark_layouts(n_stations=20, n_days=30)
+    assert isinstance(compact, LayoutResult)
+    assert compact.memory_bytes < plain.memory_bytes
+    # Parquet dictionary-encodes the station strings of the plain layout too
+    assert compact.file_bytes == pytest.approx(plain.file_bytes, rel=0.05)
@@ -0,0 +1,44 @@
+"""Tests module meteoshrooms.benchmark.dashboard_rerun.py"""
+
+import pytest
+
+from meteoshrooms.benchmark.dashboard_rerun import (
+    INTERACTIONS,
+    RerunResult,
+    benchmark_dashboard_reruns,
+    summarize_samples,
+)
+
+
+def test_summarize_samples_per_section():
+    results: list[RerunResult] = summarize_samples(
+        'rerun',
+        [{'total': 0.1 * i, 'map': 0.01 * i} for i in range(1, 11)] + [{'total': 2.0}],
+    )
+    assert [result.section for result in results] == ['total', 'map']
+    total, section_map = results
+    assert total.samples == 11
+    assert section_map.samples == 10
+    assert total.p50_seconds == pytest.approx(0.6)
+    assert total.p95_seconds == pytest.approx(1.5)
+    assert section_map.p50_seconds == pytest.approx(0.055)
+
+
+@pytest.mark.performance
+def test_benchmark_dashboard_reruns_covers_interactions_and_sections():
+    results: list[RerunResult] = benchmark_dashboard_reruns(
+        n_stations=5, n_days=3, repeat=2
+    )
+    assert [result.interaction for result in results if result.section == 'total'] == [
+        'first run',
+        *INTERACTIONS,
+    ]
+    assert {result.section for result in results} == {
+        'total',
+        'data',
+        'sidebar',
+        'area chart',
+        'map',
+        'metric tiles',
+    }
+    assert all(0 < result.p50_seconds <= result.p95_seconds for result in results)
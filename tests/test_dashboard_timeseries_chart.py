@@ -0,0 +1,87 @@
+"""Tests module meteoshrooms.dashboard.dashboard_timeseries_chart.py"""
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIME_PERIOD_VALUES
+from meteoshrooms.dashboard.dashboard_timeseries_chart import (
+    create_area_chart_frame,
+    downsample_chart_frame,
+    select_bucket_hours,
+)
+from meteoshrooms.data_preparation.rollups import create_weather_rollups
+
+COLUMN_NAMES: dict[str, str] = {
+    'reference_timestamp': 'Time',
+    'station_name': 'Station',
+    'rre150h0': 'Precipitation',
+}
+
+
+@pytest.fixture(scope='module')
+def frame_rollup() -> pl.LazyFrame:
+    return (
+        create_weather_rollups(
+            generate_weather_frame(n_stations=8, n_days=31).lazy(), intervals=('6h',)
+        )
+        .drop('interval', 'station_abbr')
+        .collect()
+        .lazy()
+    )
+
+
+@pytest.fixture(scope='module')
+def station_names(frame_rollup) -> list[str]:
+    return (
+        frame_rollup.select('station_name')
+        .unique()
+        .sort('station_name')
+        .collect()['station_name']
+        .to_list()
+    )
+
+
+class TestSelectBucketHours:
+    """Tests function select_bucket_hours()"""
+
+    def test_short_window_keeps_rollup_buckets(self):
+        assert select_bucket_hours(3, 1) == 6
+
+    def test_long_window_of_many_stations_gets_larger_buckets(self):
+        assert select_bucket_hours(30, 5) > select_bucket_hours(30, 1)
+
+
+class TestCreateAreaChartFrame:
+    """Tests function create_area_chart_frame() with downsampling"""
+
+    @pytest.mark.parametrize('time_period', TIME_PERIOD_VALUES)
+    @pytest.mark.parametrize('number_stations', [1, 5, 8])
+    def test_points_within_budget(
+        self, frame_rollup, station_names, time_period, number_stations
+    ):
+        assert (
+            create_area_chart_frame(
+                frame_rollup,
+                station_names[:number_stations],
+                time_period,
+                COLUMN_NAMES,
+                point_budget=200,
+            )
+            .collect()
+            .height
+            <= 200
+        )
+
+    @pytest.mark.parametrize('hours', [12, 24, 48, 168])
+    def test_precipitation_totals_preserved(self, frame_rollup, hours):
+        assert_frame_equal(
+            downsample_chart_frame(frame_rollup, hours)
+            .group_by('station_name')
+            .agg(pl.sum('rre150h0'))
+            .collect(),
+            frame_rollup.group_by('station_name').agg(pl.sum('rre150h0')).collect(),
+            check_row_order=False,
+            rel_tol=1e-4,
+        )
@@ -0,0 +1,70 @@
+"""Tests module meteoshrooms.dashboard.dashboard_utils.py"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from meteoshrooms.benchmark.meta_map import (
+    benchmark_meta_map,
+    create_meta_map_rowwise,
+    create_metrics_names_dict_rowwise,
+    generate_parameter_catalogue,
+    load_parameter_catalogue,
+)
+from meteoshrooms.dashboard.constants import METRICS_STRINGS
+from meteoshrooms.dashboard.dashboard_utils import (
+    create_meta_map,
+    create_metrics_names_dict,
+)
+
+TEST_DATA_PATH: Path = Path(__file__).resolve().parent.joinpath('data')
+
+
+@pytest.fixture(scope='module')
+def meta_parameters() -> pl.DataFrame:
+    return pl.concat(
+        (
+            load_parameter_catalogue(
+                Path(TEST_DATA_PATH, 'ogd-smn_meta_parameters_test_data.csv')
+            ),
+            generate_parameter_catalogue(n_rows=500),
+        ),
+        how='diagonal_relaxed',
+    )
+
+
+class TestCreateMetaMap:
+    """Tests function create_meta_map()"""
+
+    def test_equals_rowwise_search(self, meta_parameters):
+        assert create_meta_map(meta_parameters) == create_meta_map_rowwise(
+            meta_parameters
+        )
+
+    def test_filtered_to_parameter_shortnames(self, meta_parameters):
+        assert create_meta_map(meta_parameters, ('rre150h0', 'missing')) == {
+            'rre150h0': 'Precipitation'
+        }
+
+
+class TestCreateMetricsNamesDict:
+    """Tests function create_metrics_names_dict()"""
+
+    def test_equals_rowwise_search(self, meta_parameters):
+        metrics_names_dict: dict[str, str] = create_metrics_names_dict(meta_parameters)
+        assert metrics_names_dict == create_metrics_names_dict_rowwise(meta_parameters)
+        assert tuple(metrics_names_dict) == METRICS_STRINGS
+
+    @pytest.mark.performance
+    def test_benchmark_times_both_implementations(self):
+        results: dict[str, float] = benchmark_meta_map(
+            generate_parameter_catalogue(n_rows=500), repeat=1
+        )
+        assert set(results) == {
+            'create_meta_map (row-wise)',
+            'create_meta_map (vectorized)',
+            'create_metrics_names_dict (row-wise)',
+            'create_metrics_names_dict (vectorized)',
+        }
+        assert all(seconds > 0 for seconds in results.values())
@@ -0,0 +1,47 @@
+"""Tests module meteoshrooms.dashboard.dashboard_utils_streamlit.py"""
+
+import polars as pl
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.dashboard import dashboard_utils_streamlit
+from meteoshrooms.dashboard.dataframe_io import (
+    load_weather_rollup,
+    weather_rollup_signature,
+)
+from meteoshrooms.data_preparation.rollups import save_weather_rollups
+
+
+class TestCreateAreaChart:
+    """Tests function create_area_chart()"""
+
+    def test_chart_rebuilt_when_rollup_file_replaced(self, tmp_path, monkeypatch):
+        charts: list[pl.DataFrame] = []
+        monkeypatch.setattr(
+            dashboard_utils_streamlit.st,
+            'area_chart',
+            lambda data, **kwargs: charts.append(data.collect()),
+        )
+        monkeypatch.setattr(
+            dashboard_utils_streamlit,
+            'get_weather_column_names_dict',
+            lambda: {'reference_timestamp': 'Time', 'station_name': 'Station'},
+        )
+        dashboard_utils_streamlit.create_area_chart.clear()
+        frame_weather: pl.DataFrame = generate_weather_frame(n_stations=2, n_days=10)
+        stations: list[str] = frame_weather['station_name'].unique().to_list()
+        for scale, rewrite in ((1, True), (1, False), (2, True)):
+            if rewrite:
+                save_weather_rollups(
+                    frame_weather.lazy().with_columns(pl.col('rre150h0') * scale),
+                    tmp_path,
+                )
+            dashboard_utils_streamlit.create_area_chart(
+                load_weather_rollup(tmp_path).lazy(),
+                stations,
+                7,
+                'rre150h0',
+                weather_rollup_signature(tmp_path),
+            )
+        dashboard_utils_streamlit.create_area_chart.clear()
+        assert len(charts) == 2
+        assert charts[1]['rre150h0'].sum() > charts[0]['rre150h0'].sum()
@@ -1,14 +1,27 @@
 """Tests module meteoshrooms.data_preparation.data_preparation.py"""
 
+from datetime import datetime, timedelta
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import polars as pl
 import polars.selectors as cs
 import pytest
 from polars.testing import assert_frame_equal
-
+from typer.testing import CliRunner
+
+from meteoshrooms.benchmark.metrics import concat_metrics_frame
+from meteoshrooms.benchmark.synthetic import (
+    WEATHER_COLUMNS,
+    create_station_abbrs,
+    generate_meta_stations_frame,
+    generate_weather_frame,
+    write_station_csv_files,
+)
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
 from meteoshrooms.data_preparation import data_preparation
 from meteoshrooms.data_preparation.data_preparation import DataPreparation
+from meteoshrooms.data_preparation.retention import RetentionPolicy
 
 
 @pytest.fixture(autouse=True)
@@ -209,3 +222,265 @@ class TestLoadMetadata:
         assert_frame_equal(
             self.testdata_instance.meta_datainventory, lf_meta_datainventory_test_result
         )
+
+
+class TestFilterDownloadedUrls:
+    """Tests function filter_downloaded_urls()"""
+
+    def test_filter_downloaded_urls_drops_failed_downloads(self):
+        urls: pl.Series = pl.Series(['https://a/x.csv', 'https://a/y.csv'])
+        assert data_preparation.filter_downloaded_urls(
+            urls, {'https://a/y.csv'}
+        ).to_list() == ['https://a/y.csv']
+
+
+class TestCreateRainfallWeatherLazyframes:
+    """Tests function create_rainfall_weather_lazyframes()"""
+
+    @pytest.fixture
+    def station_urls(self, tmp_path) -> pl.Series:
+        for station_abbr, header, row in (
+            ('abo', 'station_abbr;reference_timestamp;rre150h0', '0.1'),
+            ('ber', 'station_abbr;reference_timestamp;rre150h0', '0.2'),
+            ('cha', 'station_abbr;reference_timestamp;rre150h0;tre200h0', '0.3;12.5'),
+        ):
+            Path(tmp_path, f'ogd-smn_{station_abbr}_h_now.csv').write_text(
+                f'{header}\n{station_abbr.upper()};01.10.2025 12:00;{row}\n',
+                encoding='utf-8',
+            )
+        return pl.Series(
+            f'https://a/{station_abbr}/ogd-smn_{station_abbr}_h_now.csv'
+            for station_abbr in ('abo', 'ber', 'cha')
+        )
+
+    def test_files_grouped_by_header(self, station_urls, tmp_path):
+        assert [
+            len(urls)
+            for urls in data_preparation.group_urls_by_csv_header(
+                tmp_path, station_urls
+            ).values()
+        ] == [2, 1]
+
+    def test_groups_aligned_to_common_schema(self, station_urls, tmp_path):
+        frame_weather: pl.DataFrame = (
+            data_preparation.create_rainfall_weather_lazyframes(
+                tmp_path, station_urls, data_preparation.create_kwargs_lazyframe({})
+            )
+            .sort('station_abbr')
+            .collect()
+        )
+        assert frame_weather['station_abbr'].to_list() == ['ABO', 'BER', 'CHA']
+        assert frame_weather['tre200h0'].to_list() == [None, None, 12.5]
+
+    @pytest.mark.parametrize('streaming', [False, True])
+    def test_station_type_without_files_concatenated(
+        self, station_urls, tmp_path, streaming
+    ):
+        kwargs_lazyframe: dict = data_preparation.create_kwargs_lazyframe(
+            dict.fromkeys(WEATHER_COLUMNS, pl.Float32)
+        )
+        frame_weather: pl.DataFrame = (
+            data_preparation.concat_rainfall_weather_lazyframes(
+                pl.LazyFrame(
+                    {'station_abbr': ['ABO', 'BER', 'CHA'], 'station_name': 'x'}
+                ),
+                data_preparation.create_rainfall_weather_lazyframes(
+                    tmp_path, pl.Series([], dtype=pl.String), kwargs_lazyframe
+                ),
+                data_preparation.create_rainfall_weather_lazyframes(
+                    tmp_path, station_urls, kwargs_lazyframe, streaming=streaming
+                ),
+                retention_days=10_000,
+            )
+            .sort('station_abbr')
+            .collect()
+        )
+        assert frame_weather['station_abbr'].to_list() == ['ABO', 'BER', 'CHA']
+
+
+def test_rebase_urls_replaces_endpoint_only():
+    assert data_preparation.rebase_urls(
+        [
+            'https://data.geo.admin.ch/ch.meteoschweiz.ogd-smn/abo/x.csv',
+            'tests/data/x.csv',
+        ],
+        'http://127.0.0.1:8000',
+    ) == ['http://127.0.0.1:8000/ch.meteoschweiz.ogd-smn/abo/x.csv', 'tests/data/x.csv']
+
+
+class TestDataPreparationWriteProfile:
+    """Tests the write_profile argument of DataPreparation"""
+
+    def test_write_profile_selects_parquet_kwargs(self, tmp_path):
+        assert (
+            DataPreparation(
+                data_path=tmp_path, parquet_flag=True, write_profile='fast-read'
+            ).parquet_kwargs['compression']
+            == 'lz4'
+        )
+
+    def test_unknown_write_profile_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            DataPreparation(data_path=tmp_path, parquet_flag=True, write_profile='x')
+
+    def test_cli_rejects_unknown_write_profile(self, tmp_path):
+        result = CliRunner().invoke(
+            data_preparation.app, ['--write-profile', 'x', str(tmp_path)]
+        )
+        assert result.exit_code == 2
+        assert "'x' is not one of" in result.output
+
+
+def test_compact_layout_not_partitioned(tmp_path):
+    with pytest.raises(ValueError):
+        DataPreparation(
+            data_path=tmp_path,
+            parquet_flag=True,
+            partitioned_flag=True,
+            compact_flag=True,
+        )
+
+
+def test_cli_rejects_compact_partitioned(tmp_path):
+    result = CliRunner().invoke(
+        data_preparation.app, ['--compact', '--partitioned', str(tmp_path)]
+    )
+    assert result.exit_code == 2
+    assert '--partitioned' in result.output
+
+
+def test_full_load_with_history_evaluates_weather_data_once(tmp_path):
+    evaluations: list[int] = []
+
+    def count_evaluation(frame: pl.DataFrame) -> pl.DataFrame:
+        evaluations.append(frame.height)
+        return frame
+
+    preparation: DataPreparation = DataPreparation(
+        data_path=tmp_path,
+        parquet_flag=True,
+        retention=RetentionPolicy(hourly_days=30, history_days=60),
+    )
+    # Set as load_weather_data() does, without downloading
+    preparation.weather_data = (
+        generate_weather_frame(n_stations=4, n_days=35)
+        .lazy()
+        .map_batches(count_evaluation)
+    )
+    preparation.watermarks = None
+    preparation.download_results = []
+    preparation.meta_stations = generate_meta_stations_frame(n_stations=4).lazy()
+    preparation.save_weather_data()
+    assert len(evaluations) == 1
+    assert Path(tmp_path, 'weather_history.parquet').exists()
+
+
+@pytest.mark.parametrize('compact_flag', [False, True])
+def test_weather_schema_same_for_compact_layout(tmp_path, compact_flag):
+    weather_data_preparation = DataPreparation(
+        data_path=tmp_path, parquet_flag=True, compact_flag=compact_flag
+    )
+    weather_data_preparation.meta_parameters = pl.LazyFrame(
+        {
+            'parameter_shortname': ['gre000h0', 'tre200h0'],
+            'parameter_datatype': ['Integer', 'Float'],
+        }
+    )
+    assert weather_data_preparation.create_weather_schema_dict() == {
+        'gre000h0': pl.Int16,
+        'tre200h0': pl.Float32,
+    }
+
+
+class TestCreateMetrics:
+    """Tests function create_metrics() against aggregating per time period"""
+
+    END: datetime = datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+
+    @pytest.fixture
+    def time_periods(self) -> dict[int, datetime]:
+        return {period: self.END - timedelta(days=period) for period in (3, 7, 14, 30)}
+
+    @pytest.fixture
+    def weather_data(self) -> pl.LazyFrame:
+        frame_weather: pl.DataFrame = generate_weather_frame(
+            n_stations=12, n_days=35, end=self.END, seed=1
+        )
+        return (
+            frame_weather.with_row_index()
+            .with_columns(
+                pl.when(pl.col('index') % 7 == 0)
+                .then(None)
+                .otherwise(pl.col('tre200h0'))
+                .alias('tre200h0'),
+                pl.when(pl.col('station_abbr') == 'AAB')
+                .then(None)
+                .otherwise(pl.col('fu3010h0'))
+                .alias('fu3010h0'),
+            )
+            .drop('index')
+            .filter(
+                (pl.col('station_abbr') != 'AAC')
+                | (pl.col('reference_timestamp') < self.END - timedelta(days=10))
+            )
+            .lazy()
+        )
+
+    def test_aggregate_metrics_frame_equals_per_period_aggregation(
+        self, time_periods, weather_data
+    ):
+        assert_frame_equal(
+            data_preparation.aggregate_metrics_frame(time_periods, weather_data),
+            concat_metrics_frame(time_periods, weather_data),
+            check_row_order=False,
+        )
+
+    def test_create_metrics_skips_missing_station_periods(
+        self, time_periods, weather_data
+    ):
+        metrics: pl.DataFrame = data_preparation.create_metrics(
+            weather_data, time_periods
+        ).collect()
+        assert metrics.filter(pl.col('station_abbr') == 'AAC')[
+            'time_period'
+        ].unique().sort().to_list() == [14, 30]
+        assert metrics.filter(
+            (pl.col('station_abbr') == 'AAB') & (pl.col('parameter') == 'fu3010h0')
+        ).is_empty()
+
+
+class TestStreamingPreparation:
+    """Tests the streaming path of create_rainfall_weather_lazyframes()"""
+
+    def test_streaming_writes_same_weather_data(self, tmp_path):
+        down_path: Path = Path(tmp_path, 'csv')
+        down_path.mkdir()
+        station_urls: pl.Series = write_station_csv_files(
+            generate_weather_frame(n_stations=5, n_days=60), down_path
+        )
+        metadata: pl.LazyFrame = pl.LazyFrame(
+            {'station_abbr': create_station_abbrs(5), 'station_name': 'x'}
+        )
+        for streaming in (False, True):
+            out_path: Path = Path(tmp_path, str(streaming))
+            out_path.mkdir()
+            data_preparation.save_weather_data_to_parquet(
+                data_preparation.concat_rainfall_weather_lazyframes(
+                    metadata,
+                    data_preparation.create_rainfall_weather_lazyframes(
+                        down_path,
+                        station_urls,
+                        data_preparation.create_kwargs_lazyframe(
+                            dict.fromkeys(WEATHER_COLUMNS, pl.Float32)
+                        ),
+                        streaming=streaming,
+                    ),
+                ),
+                out_path,
+                engine='streaming' if streaming else 'auto',
+            )
+        assert_frame_equal(
+            pl.read_parquet(Path(tmp_path, 'True', 'weather_data.parquet')),
+            pl.read_parquet(Path(tmp_path, 'False', 'weather_data.parquet')),
+            check_row_order=False,
+        )
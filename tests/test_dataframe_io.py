@@ -0,0 +1,99 @@
+"""Tests module meteoshrooms.dashboard.dataframe_io.py"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.dashboard.constants import WEATHER_DATA_COLUMNS
+from meteoshrooms.dashboard.dataframe_io import (
+    create_data_signature,
+    load_weather_data,
+    load_weather_rollup,
+    scan_weather_file,
+    weather_rollup_signature,
+)
+from meteoshrooms.data_preparation.rollups import save_weather_rollups
+from meteoshrooms.data_preparation.weather_store import sink_parquet_atomic
+
+TZ: ZoneInfo = ZoneInfo(TIMEZONE_SWITZERLAND_STRING)
+
+
+@pytest.fixture
+def frame_weather() -> pl.DataFrame:
+    return generate_weather_frame(n_stations=4, n_days=45).sort('reference_timestamp')
+
+
+class TestScanWeatherFile:
+    """Tests function scan_weather_file()"""
+
+    def test_filter_pushed_down_to_parquet_scan(self, frame_weather, tmp_path):
+        file_path: Path = Path(tmp_path, 'weather_data.parquet')
+        frame_weather.write_parquet(file_path, row_group_size=500)
+        plan: str = scan_weather_file(
+            file_path, datetime.now(tz=TZ) - timedelta(days=30)
+        ).explain()
+        assert 'SELECTION' in plan
+        assert f'PROJECT {len(WEATHER_DATA_COLUMNS)}/8 COLUMNS' in plan
+
+    def test_time_zone_replaced_in_files_without(self, frame_weather, tmp_path):
+        file_path: Path = Path(tmp_path, 'weather_data.parquet')
+        frame_weather.with_columns(
+            pl.col('reference_timestamp').dt.replace_time_zone(None)
+        ).write_parquet(file_path)
+        assert scan_weather_file(
+            file_path, datetime.now(tz=TZ) - timedelta(days=30)
+        ).collect_schema()['reference_timestamp'] == pl.Datetime(
+            'us', TIMEZONE_SWITZERLAND_STRING
+        )
+
+
+class TestLoadWeatherData:
+    """Tests function load_weather_data()"""
+
+    def test_only_last_30_days_of_used_columns(self, frame_weather, tmp_path):
+        frame_weather.write_parquet(Path(tmp_path, 'weather_data.parquet'))
+        weather_data: pl.DataFrame = load_weather_data(tmp_path)
+        assert weather_data.columns == list(WEATHER_DATA_COLUMNS)
+        assert weather_data['reference_timestamp'].is_sorted()
+        assert weather_data['reference_timestamp'].min() >= datetime.now(
+            tz=TZ
+        ) - timedelta(days=30, minutes=1)
+
+
+class TestLoadWeatherRollup:
+    """Tests function load_weather_rollup()"""
+
+    def test_fallback_equals_rollup_table(self, frame_weather, tmp_path):
+        frame_weather.write_parquet(Path(tmp_path, 'weather_data.parquet'))
+        frame_fallback: pl.DataFrame = load_weather_rollup(tmp_path)
+        save_weather_rollups(frame_weather.lazy(), tmp_path)
+        assert_frame_equal(
+            load_weather_rollup(tmp_path), frame_fallback, check_row_order=False
+        )
+
+
+class TestCreateDataSignature:
+    """Tests function create_data_signature()"""
+
+    def test_signature_changes_after_atomic_rewrite(self, frame_weather, tmp_path):
+        file_path: Path = Path(tmp_path, 'weather_data.parquet')
+        sink_parquet_atomic(frame_weather.lazy(), file_path)
+        signature_before = create_data_signature(file_path)
+        sink_parquet_atomic(frame_weather.lazy().head(10), file_path)
+        assert create_data_signature(file_path) != signature_before
+        assert not Path(tmp_path, 'weather_data.parquet.part').exists()
+
+    def test_missing_files_are_skipped(self, tmp_path):
+        assert create_data_signature(Path(tmp_path, 'metrics.parquet')) == ()
+
+    def test_rollup_falls_back_to_weather_data(self, frame_weather, tmp_path):
+        frame_weather.write_parquet(Path(tmp_path, 'weather_data.parquet'))
+        signature_weather = weather_rollup_signature(tmp_path)
+        save_weather_rollups(frame_weather.lazy(), tmp_path)
+        assert weather_rollup_signature(tmp_path) != signature_weather
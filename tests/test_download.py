@@ -0,0 +1,207 @@
+"""Tests module meteoshrooms.data_preparation.download.py"""
+
+import hashlib
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from meteoshrooms.data_preparation.download import (
+    DownloadCache,
+    DownloadResult,
+    download_files,
+)
+
+LATENCY_SECONDS: float = 0.2
+NUMBER_OF_FILES: int = 8
+
+
+class LatencyRequestHandler(SimpleHTTPRequestHandler):
+    """Serves files with an ETag from a directory after an artificial delay"""
+
+    failures_before_success: ClassVar[dict[str, int]] = {}
+    status_codes: ClassVar[list[int]] = []
+    in_flight_lock: ClassVar[threading.Lock] = threading.Lock()
+    in_flight: ClassVar[int] = 0
+    peak_in_flight: ClassVar[int] = 0
+
+    def do_GET(self):
+        with self.in_flight_lock:
+            LatencyRequestHandler.in_flight += 1
+            LatencyRequestHandler.peak_in_flight = max(
+                self.peak_in_flight, self.in_flight
+            )
+        time.sleep(LATENCY_SECONDS)
+        with self.in_flight_lock:
+            LatencyRequestHandler.in_flight -= 1
+        if self.failures_before_success.get(self.path, 0) > 0:
+            self.failures_before_success[self.path] -= 1
+            self.send_error(503)
+            return
+        if self.path == '/truncated.csv':
+            self.send_truncated_response()
+            return
+        if self.headers.get('If-None-Match') == self.etag():
+            self.send_response(304)
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def send_truncated_response(self):
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Length', '1000')
+        self.end_headers()
+        self.wfile.write(b'station_abbr;reference_timestamp;rre150h0\n')
+
+    def etag(self) -> str:
+        file_path: Path = Path(self.translate_path(self.path))
+        if not file_path.is_file():
+            return ''
+        return f'"{hashlib.md5(file_path.read_bytes()).hexdigest()}"'  # noqa: S324
+
+    def send_response(self, code, message=None):
+        self.status_codes.append(code)
+        super().send_response(code, message)
+        if code in {200, 304}:
+            self.send_header('ETag', self.etag())
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def served_path(tmp_path) -> Path:
+    served_path: Path = Path(tmp_path, 'served')
+    served_path.mkdir()
+    for i in range(NUMBER_OF_FILES):
+        Path(served_path, f'ogd-smn_st{i}_h_now.csv').write_text(
+            f'station_abbr;reference_timestamp;rre150h0\nST{i};01.01.2025 00:00;{i}\n',
+            encoding='utf-8',
+        )
+    return served_path
+
+
+@pytest.fixture
+def local_server(served_path):
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0),
+        partial(LatencyRequestHandler, directory=str(served_path)),
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def urls(local_server, served_path) -> list[str]:
+    return [f'{local_server}/{p.name}' for p in sorted(served_path.iterdir())]
+
+
+class TestDownloadFiles:
+    """Tests function download_files()"""
+
+    def test_download_files_writes_all_files(self, urls, served_path, tmp_path):
+        down_path: Path = Path(tmp_path, 'down')
+        down_path.mkdir()
+        download_files(urls, down_path, max_workers=4)
+        for served_file in served_path.iterdir():
+            assert (
+                Path(down_path, served_file.name).read_bytes()
+                == served_file.read_bytes()
+            )
+
+    def test_download_files_requests_concurrently(self, urls, tmp_path):
+        down_path: Path = Path(tmp_path, 'down')
+        down_path.mkdir()
+        LatencyRequestHandler.peak_in_flight = 0
+        download_files(urls, down_path, max_workers=NUMBER_OF_FILES)
+        assert LatencyRequestHandler.peak_in_flight > 1
+
+    def test_download_files_retries_server_errors(self, urls, tmp_path):
+        down_path: Path = Path(tmp_path, 'down')
+        down_path.mkdir()
+        LatencyRequestHandler.failures_before_success['/' + Path(urls[0]).name] = 2
+        download_files(urls[:1], down_path, max_workers=1)
+        assert Path(down_path, Path(urls[0]).name).exists()
+
+    def test_download_files_returns_result_per_url(self, urls, tmp_path):
+        results: list[DownloadResult] = download_files(urls, tmp_path)
+        assert [result.url for result in results] == urls
+        for result in results:
+            assert result.ok
+            assert result.status == 200
+            assert result.file_path is not None
+            assert result.bytes_written == result.file_path.stat().st_size
+
+    def test_download_files_reports_http_error(self, local_server, tmp_path):
+        (result,) = download_files([f'{local_server}/missing.csv'], tmp_path)
+        assert not result.ok
+        assert result.status == 404
+        assert not Path(tmp_path, 'missing.csv').exists()
+
+    def test_download_files_discards_truncated_file(self, local_server, tmp_path):
+        down_path: Path = Path(tmp_path, 'down')
+        down_path.mkdir()
+        (result,) = download_files([f'{local_server}/truncated.csv'], down_path)
+        assert not result.ok
+        assert result.file_path is None
+        assert list(down_path.iterdir()) == []
+
+
+class TestDownloadCache:
+    """Tests conditional downloads through DownloadCache"""
+
+    @pytest.fixture(autouse=True)
+    def reset_status_codes(self):
+        LatencyRequestHandler.status_codes.clear()
+
+    def download_twice(self, urls, tmp_path) -> tuple[Path, Path]:
+        cache_path: Path = Path(tmp_path, 'cache')
+        down_paths: tuple[Path, Path] = (
+            Path(tmp_path, 'first'),
+            Path(tmp_path, 'second'),
+        )
+        for down_path in down_paths:
+            down_path.mkdir()
+            download_files(urls, down_path, cache_path=cache_path)
+        return down_paths
+
+    def test_unchanged_files_are_not_modified(self, urls, tmp_path):
+        self.download_twice(urls, tmp_path)
+        assert LatencyRequestHandler.status_codes == [200] * len(urls) + [304] * len(
+            urls
+        )
+
+    def test_unchanged_files_restored_from_cache(self, urls, served_path, tmp_path):
+        _, second_path = self.download_twice(urls, tmp_path)
+        for served_file in served_path.iterdir():
+            assert (
+                Path(second_path, served_file.name).read_bytes()
+                == served_file.read_bytes()
+            )
+
+    def test_changed_file_is_downloaded_again(self, urls, served_path, tmp_path):
+        cache_path: Path = Path(tmp_path, 'cache')
+        download_files(urls[:1], tmp_path, cache_path=cache_path)
+        changed_file: Path = Path(served_path, Path(urls[0]).name)
+        changed_file.write_text('station_abbr;reference_timestamp;rre150h0\n')
+        second_path: Path = Path(tmp_path, 'second')
+        second_path.mkdir()
+        download_files(urls[:1], second_path, cache_path=cache_path)
+        assert LatencyRequestHandler.status_codes == [200, 200]
+        assert (
+            Path(second_path, changed_file.name).read_bytes()
+            == changed_file.read_bytes()
+        )
+
+    def test_index_persists_validators(self, urls, tmp_path):
+        cache_path: Path = Path(tmp_path, 'cache')
+        download_files(urls[:1], tmp_path, cache_path=cache_path)
+        assert 'If-None-Match' in DownloadCache(cache_path).conditional_headers(urls[0])
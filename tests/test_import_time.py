@@ -0,0 +1,50 @@
+"""Tests module meteoshrooms.benchmark.import_time.py"""
+
+import pytest
+
+from meteoshrooms.benchmark.import_time import (
+    ImportTimeEntry,
+    calculate_package_import_us,
+    measure_import_times,
+    parse_import_times,
+)
+
+
+class TestParseImportTimes:
+    """Tests function parse_import_times()"""
+
+    def test_report_lines_parsed(self):
+        assert parse_import_times(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       235 |        235 |     meteoshrooms\n'
+            'import time:      1332 |    1042123 | meteoshrooms.dashboard.dashboard\n'
+        ) == [
+            ImportTimeEntry('meteoshrooms', 235, 235, 2),
+            ImportTimeEntry('meteoshrooms.dashboard.dashboard', 1332, 1042123, 0),
+        ]
+
+
+def test_calculate_package_import_us_excludes_other_packages():
+    assert (
+        calculate_package_import_us(
+            [
+                ImportTimeEntry('polars', 900, 900, 1),
+                ImportTimeEntry('meteoshrooms', 235, 235, 2),
+                ImportTimeEntry('meteoshrooms_extra', 700, 700, 1),
+                ImportTimeEntry('meteoshrooms.dashboard.dashboard', 1332, 3367, 0),
+            ]
+        )
+        == 235 + 1332
+    )
+
+
+class TestMeasureImportTimes:
+    """Tests function measure_import_times()"""
+
+    @pytest.mark.performance
+    def test_dashboard_imported_last(self):
+        entries: list[ImportTimeEntry] = measure_import_times(
+            'meteoshrooms.dashboard.dashboard'
+        )
+        assert entries[-1].module == 'meteoshrooms.dashboard.dashboard'
+        assert calculate_package_import_us(entries) > 0
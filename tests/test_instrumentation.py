@@ -0,0 +1,142 @@
+"""Tests module meteoshrooms.data_preparation.instrumentation.py"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.data_preparation.data_preparation import DataPreparation
+from meteoshrooms.data_preparation.instrumentation import (
+    StageProfiler,
+    count_parquet_rows,
+    measure_bytes,
+)
+from meteoshrooms.data_preparation.retention import RetentionPolicy
+
+
+class TestStageProfiler:
+    """Tests class StageProfiler"""
+
+    def test_stage_recorded(self):
+        profiler: StageProfiler = StageProfiler()
+        with profiler.stage('parse') as stage:
+            stage.rows_out = sum(range(100_000))
+        [record] = profiler.records
+        assert record.stage == 'parse'
+        assert record.wall_seconds > 0
+        assert record.cpu_seconds >= 0
+        assert record.peak_rss_bytes > 0
+        assert record.rows_in is None
+
+    def test_stage_recorded_when_raising(self):
+        profiler: StageProfiler = StageProfiler()
+        with pytest.raises(ValueError), profiler.stage('download'):
+            raise ValueError
+        assert [record.stage for record in profiler.records] == ['download']
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler: StageProfiler = StageProfiler(enabled=False)
+        with profiler.stage('parse'):
+            pass
+        assert profiler.records == []
+
+    def test_write_json(self, tmp_path):
+        profiler: StageProfiler = StageProfiler()
+        with profiler.stage('sink') as stage:
+            stage.bytes_written = 10
+        file_path: Path = Path(tmp_path, 'profile.json')
+        profiler.write_json(file_path)
+        with file_path.open(encoding='utf-8') as f:
+            assert json.load(f) == {'stages': profiler.to_dicts()}
+
+
+def test_measure_bytes_sums_files_and_parquet_in_directories(tmp_path):
+    Path(tmp_path, 'a.parquet').write_bytes(b'x' * 3)
+    Path(tmp_path, 'part').mkdir()
+    Path(tmp_path, 'part', 'b.parquet').write_bytes(b'x' * 5)
+    Path(tmp_path, 'part', 'c.txt').write_bytes(b'x' * 7)
+    assert (
+        measure_bytes(
+            Path(tmp_path, 'a.parquet'),
+            Path(tmp_path, 'part'),
+            Path(tmp_path, 'missing.parquet'),
+        )
+        == 8
+    )
+
+
+def test_count_parquet_rows_of_file_and_dataset(tmp_path):
+    frame: pl.DataFrame = pl.DataFrame({'station_abbr': ['AAA', 'AAB', 'AAB']})
+    frame.write_parquet(Path(tmp_path, 'a.parquet'))
+    frame.write_parquet(Path(tmp_path, 'dataset'), partition_by='station_abbr')
+    assert count_parquet_rows(Path(tmp_path, 'a.parquet')) == 3
+    assert count_parquet_rows(Path(tmp_path, 'dataset')) == 3
+
+
+@pytest.mark.parametrize(
+    'layout_flags',
+    [{}, {'compact_flag': True}, {'partitioned_flag': True}],
+    ids=['plain', 'compact', 'partitioned'],
+)
+def test_data_preparation_records_stages(tmp_path, layout_flags):
+    profiler: StageProfiler = StageProfiler()
+    preparation: DataPreparation = DataPreparation(
+        data_path=tmp_path,
+        parquet_flag=True,
+        metrics_flag=True,
+        profiler=profiler,
+        **layout_flags,
+    )
+    frame_weather: pl.DataFrame = generate_weather_frame(n_stations=4, n_days=35)
+    # Set as load_weather_data() does, without downloading
+    preparation.weather_data = frame_weather.lazy()
+    preparation.watermarks = None
+    preparation.download_results = []
+    preparation.meta_stations = generate_meta_stations_frame(n_stations=4).lazy()
+    preparation.meta_parameters = pl.LazyFrame(
+        schema={
+            'parameter_shortname': pl.String,
+            'parameter_datatype': pl.String,
+            'parameter_decimals': pl.Int8,
+        }
+    )
+    preparation.save_weather_data()
+    preparation.load_metrics()
+    preparation.save_metrics()
+    assert [record.stage for record in profiler.records] == [
+        'aggregate hourly and sink',
+        'rollup',
+        'metrics',
+    ]
+    sink, rollup, metrics = profiler.records
+    assert sink.rows_out == rollup.rows_in == metrics.rows_in == frame_weather.height
+    assert all(record.bytes_written > 0 for record in profiler.records)
+    assert 0 < metrics.rows_out < metrics.rows_in
+
+
+def test_data_preparation_records_history_stages(tmp_path):
+    profiler: StageProfiler = StageProfiler()
+    preparation: DataPreparation = DataPreparation(
+        data_path=tmp_path,
+        parquet_flag=True,
+        profiler=profiler,
+        retention=RetentionPolicy(history_days=60),
+    )
+    frame_weather: pl.DataFrame = generate_weather_frame(n_stations=4, n_days=35)
+    preparation.weather_data = frame_weather.lazy()
+    preparation.watermarks = None
+    preparation.download_results = []
+    preparation.save_weather_data()
+    assert [record.stage for record in profiler.records] == [
+        'aggregate hourly',
+        'history',
+        'sink',
+        'rollup',
+    ]
+    assert profiler.records[0].rows_out == frame_weather.height
+    assert 0 < profiler.records[1].rows_out < frame_weather.height
@@ -0,0 +1,101 @@
+"""Tests module meteoshrooms.dashboard.map_figure.py"""
+
+import numpy as np
+import polars as pl
+import pytest
+from plotly import graph_objects as go
+
+from meteoshrooms.benchmark.map_render import benchmark_map_render, generate_map_frame
+from meteoshrooms.dashboard import map_figure
+from meteoshrooms.dashboard.constants import WEATHER_SHORT_LABEL_DICT
+from meteoshrooms.dashboard.map_figure import (
+    create_base_map_figure_json,
+    create_map_figure_express,
+    recolor_map_figure,
+)
+from meteoshrooms.data_preparation.constants import MAP_FRAME_STATION_COLUMNS
+
+TRACE_KEYS: tuple[str, ...] = ('lat', 'lon', 'hovertext', 'customdata')
+
+
+@pytest.fixture(scope='module')
+def frame_map() -> pl.DataFrame:
+    return generate_map_frame(n_stations=12)
+
+
+@pytest.fixture(scope='module')
+def base_figure_json(frame_map) -> str:
+    return create_base_map_figure_json(
+        frame_map.select(MAP_FRAME_STATION_COLUMNS).unique(
+            subset='station_name', maintain_order=True
+        )
+    )
+
+
+def select_time_period(frame_map: pl.DataFrame, time_period: int) -> pl.DataFrame:
+    return (
+        frame_map.filter(pl.col('time_period') == time_period)
+        .drop('time_period')
+        .rename(WEATHER_SHORT_LABEL_DICT)
+        .sort('station_name')
+    )
+
+
+def assert_traces_equal(figure: go.Figure, figure_expected: go.Figure):
+    trace, trace_expected = figure.data[0], figure_expected.data[0]
+    for key in TRACE_KEYS:
+        np.testing.assert_array_equal(
+            np.asarray(trace[key], dtype=object),
+            np.asarray(trace_expected[key], dtype=object),
+        )
+    np.testing.assert_allclose(trace.marker.color, trace_expected.marker.color)
+    assert trace.hovertemplate == trace_expected.hovertemplate
+
+
+class TestRecolorMapFigure:
+    """Tests function recolor_map_figure() against Plotly Express"""
+
+    @pytest.mark.parametrize(
+        ('param_short_code', 'time_period'), [('rre150h0', 7), ('tre200h0', 30)]
+    )
+    def test_equals_express_figure(
+        self, frame_map, base_figure_json, param_short_code, time_period
+    ):
+        frame_period: pl.DataFrame = select_time_period(frame_map, time_period)
+        figure: go.Figure = recolor_map_figure(
+            base_figure_json, frame_period, param_short_code, time_period
+        )
+        figure_expected: go.Figure = create_map_figure_express(
+            frame_period, param_short_code, time_period
+        )
+        assert_traces_equal(figure, figure_expected)
+        assert figure.layout.title == figure_expected.layout.title
+        assert figure.layout.coloraxis == figure_expected.layout.coloraxis
+        assert figure.layout.map == figure_expected.layout.map
+
+    def test_stations_without_metrics_left_out(self, frame_map, base_figure_json):
+        frame_period: pl.DataFrame = select_time_period(frame_map, 3).slice(2)
+        assert_traces_equal(
+            recolor_map_figure(base_figure_json, frame_period, 'rre150h0', 3),
+            create_map_figure_express(frame_period, 'rre150h0', 3),
+        )
+
+    def test_builds_no_express_figure(self, frame_map, base_figure_json, monkeypatch):
+        express_calls: list[pl.DataFrame] = []
+        monkeypatch.setattr(
+            map_figure.px,
+            'scatter_map',
+            lambda data_frame, **kwargs: express_calls.append(data_frame),
+        )
+        recolor_map_figure(
+            base_figure_json, select_time_period(frame_map, 7), 'rre150h0', 7
+        )
+        assert express_calls == []
+
+    @pytest.mark.performance
+    def test_benchmark_times_both_renderings(self):
+        results: dict[str, float] = benchmark_map_render(
+            generate_map_frame(n_stations=20), repeat=1
+        )
+        assert set(results) == {'express', 'prebuilt', 'prebuilt (base figure, once)'}
+        assert all(seconds > 0 for seconds in results.values())
@@ -0,0 +1,110 @@
+"""Tests module meteoshrooms.data_preparation.map_frame.py"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.synthetic import (
+    generate_meta_stations_frame,
+    generate_weather_frame,
+)
+from meteoshrooms.dashboard.constants import WEATHER_SHORT_LABEL_DICT
+from meteoshrooms.dashboard.dataframe_io import (
+    load_map_frame,
+    load_metric_data,
+    scan_map_frames,
+)
+from meteoshrooms.data_preparation.constants import TIME_PERIODS
+from meteoshrooms.data_preparation.data_preparation import create_metrics
+from meteoshrooms.data_preparation.map_frame import create_map_frame, save_map_frame
+
+
+@pytest.fixture
+def data_path(tmp_path) -> Path:
+    generate_meta_stations_frame(n_stations=6).write_parquet(
+        Path(tmp_path, 'meta_stations.parquet')
+    )
+    create_metrics(
+        generate_weather_frame(n_stations=5, n_days=31).lazy(), TIME_PERIODS
+    ).sink_parquet(Path(tmp_path, 'metrics.parquet'))
+    return tmp_path
+
+
+def create_station_frame_for_map(data_path: Path, time_period: int) -> pl.DataFrame:
+    """Previous dashboard implementation, joining on every request"""
+    return (
+        pl.scan_parquet(Path(data_path, 'meta_stations.parquet'))
+        .with_columns(
+            pl.col('station_type_en').alias('Station Type'),
+            pl.col('station_abbr').alias('Short Code'),
+            Altitude=pl.col('station_height_masl')
+            .cast(pl.Int16)
+            .cast(pl.String)
+            .add(' m.a.s.l'),
+        )
+        .select(
+            'Short Code',
+            'Station Type',
+            'station_name',
+            'station_coordinates_wgs84_lat',
+            'station_coordinates_wgs84_lon',
+            'Altitude',
+        )
+        .join(
+            load_metric_data(data_path)
+            .lazy()
+            .filter(pl.col('time_period') == time_period),
+            left_on='Short Code',
+            right_on='station_abbr',
+        )
+        .drop('station_name_right', 'time_period')
+        .rename(WEATHER_SHORT_LABEL_DICT)
+        .collect()
+    )
+
+
+class TestCreateMapFrame:
+    """Tests function create_map_frame()"""
+
+    def test_equals_join_per_request(self, data_path):
+        frame_map: pl.DataFrame = create_map_frame(
+            pl.scan_parquet(Path(data_path, 'meta_stations.parquet')),
+            pl.scan_parquet(Path(data_path, 'metrics.parquet')),
+        ).collect()
+        assert frame_map.height == 5 * len(TIME_PERIODS)
+        for time_period in TIME_PERIODS:
+            assert_frame_equal(
+                frame_map.filter(pl.col('time_period') == time_period)
+                .drop('time_period')
+                .rename(WEATHER_SHORT_LABEL_DICT),
+                create_station_frame_for_map(data_path, time_period),
+                check_row_order=False,
+                check_column_order=False,
+            )
+
+
+class TestScanMapFrames:
+    """Tests functions save_map_frame() and scan_map_frames()"""
+
+    def test_filtered_read_of_one_time_period(self, data_path):
+        save_map_frame(
+            pl.scan_parquet(Path(data_path, 'meta_stations.parquet')),
+            pl.scan_parquet(Path(data_path, 'metrics.parquet')),
+            data_path,
+        )
+        frame_map: pl.LazyFrame = scan_map_frames(data_path).filter(
+            pl.col('time_period') == 7
+        )
+        assert 'JOIN' not in frame_map.explain()
+        assert frame_map.collect().height == 5
+
+    def test_load_falls_back_to_join(self, data_path):
+        frame_fallback: pl.DataFrame = load_map_frame(14, data_path)
+        save_map_frame(
+            pl.scan_parquet(Path(data_path, 'meta_stations.parquet')),
+            pl.scan_parquet(Path(data_path, 'metrics.parquet')),
+            data_path,
+        )
+        assert_frame_equal(load_map_frame(14, data_path), frame_fallback)
@@ -0,0 +1,195 @@
+"""Tests module meteoshrooms.benchmark.ogd_server.py"""
+
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark import ogd_server
+from meteoshrooms.benchmark.ogd_server import (
+    OGDServerConfig,
+    OGDServerStats,
+    generate_station_urls,
+    serve_ogd_files,
+    write_ogd_files,
+)
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.compact_schema import scan_weather_data
+from meteoshrooms.data_preparation.data_preparation import DataPreparation
+from meteoshrooms.data_preparation.download import DownloadResult, download_files
+from meteoshrooms.data_preparation.retention import RetentionPolicy
+
+N_STATIONS: int = 6
+N_DAYS: int = 35
+
+
+@pytest.fixture(scope='module')
+def served_path(tmp_path_factory) -> Path:
+    served_path: Path = tmp_path_factory.mktemp('served')
+    write_ogd_files(served_path, N_STATIONS, N_DAYS)
+    return served_path
+
+
+def test_station_files_served_under_endpoint_urls(served_path, tmp_path):
+    with serve_ogd_files(served_path) as base_url:
+        urls: list[str] = generate_station_urls(served_path, base_url)
+        results: list[DownloadResult] = download_files(urls, tmp_path)
+    assert len(urls) == 2 * N_STATIONS
+    assert all(result.ok for result in results)
+    assert any('/ch.meteoschweiz.ogd-smn-precip/' in url for url in urls)
+
+
+def test_server_errors_are_retried(served_path, tmp_path):
+    stats: OGDServerStats = OGDServerStats()
+    with serve_ogd_files(
+        served_path, OGDServerConfig(error_rate=0.3, seed=1), stats
+    ) as base_url:
+        results: list[DownloadResult] = download_files(
+            generate_station_urls(served_path, base_url), tmp_path, max_workers=1
+        )
+    assert all(result.ok for result in results)
+    assert stats.status_counts[200] == len(results)
+    assert sum(stats.status_counts.values()) > len(results)
+
+
+def test_bandwidth_limit(served_path, tmp_path, monkeypatch):
+    file_path: Path = min(served_path.glob('*_h_recent.csv'))
+    bandwidth: int = file_path.stat().st_size * 4
+    sleeps: list[float] = []
+    monkeypatch.setattr(ogd_server.time, 'sleep', sleeps.append)
+    with serve_ogd_files(
+        served_path, OGDServerConfig(bandwidth_bytes_per_second=bandwidth)
+    ) as base_url:
+        (result,) = download_files([f'{base_url}/{file_path.name}'], tmp_path)
+    assert result.ok
+    assert sum(sleeps) == pytest.approx(0.25)
+
+
+@pytest.mark.integration
+def test_data_preparation_end_to_end(served_path, tmp_path):
+    with serve_ogd_files(served_path) as base_url:
+        DataPreparation(
+            data_path=tmp_path,
+            parquet_flag=True,
+            weather_flag=True,
+            metrics_flag=True,
+            base_url=base_url,
+        ).prepare_data()
+    frame_weather: pl.DataFrame = pl.read_parquet(
+        Path(tmp_path, 'weather_data.parquet')
+    )
+    assert frame_weather['station_abbr'].n_unique() == N_STATIONS
+    assert Path(tmp_path, 'metrics.parquet').exists()
+
+
+@pytest.mark.integration
+def test_data_preparation_compact_update(served_path, tmp_path):
+    with serve_ogd_files(served_path) as base_url:
+        for update_flag in (False, True):
+            DataPreparation(
+                data_path=tmp_path,
+                parquet_flag=True,
+                weather_flag=True,
+                metrics_flag=True,
+                update_flag=update_flag,
+                base_url=base_url,
+                compact_flag=True,
+            ).prepare_data()
+    frame_weather: pl.DataFrame = pl.read_parquet(
+        Path(tmp_path, 'weather_data.parquet')
+    )
+    assert isinstance(frame_weather.schema['station_abbr'], pl.Enum)
+    assert 'station_name' not in frame_weather.columns
+    assert frame_weather['station_abbr'].n_unique() == N_STATIONS
+    assert (
+        pl.read_parquet(Path(tmp_path, 'metrics.parquet'))['station_name'].n_unique()
+        == N_STATIONS
+    )
+
+
+@pytest.mark.integration
+def test_data_preparation_compact_update_station_removed(served_path, tmp_path):
+    served_path_update: Path = Path(tmp_path, 'served')
+    shutil.copytree(served_path, served_path_update)
+    stations_file_path: Path = Path(served_path_update, 'ogd-smn_meta_stations.csv')
+    frame_stations: pl.DataFrame = pl.read_csv(
+        stations_file_path, separator=';', infer_schema=False
+    )
+    station_removed: str = frame_stations['station_abbr'][0]
+    frame_stations.slice(1).write_csv(stations_file_path, separator=';')
+    data_path: Path = Path(tmp_path, 'data')
+    data_path.mkdir()
+    for path, update_flag in ((served_path, False), (served_path_update, True)):
+        with serve_ogd_files(path) as base_url:
+            DataPreparation(
+                data_path=data_path,
+                parquet_flag=True,
+                weather_flag=True,
+                update_flag=update_flag,
+                base_url=base_url,
+                compact_flag=True,
+            ).prepare_data()
+    frame_removed: pl.DataFrame = (
+        scan_weather_data(Path(data_path, 'weather_data.parquet'))
+        .filter(pl.col('station_abbr') == station_removed)
+        .collect()
+    )
+    assert frame_removed.height > 0
+    assert frame_removed['station_name'].is_not_null().all()
+
+
+@pytest.mark.integration
+def test_metrics_unchanged_by_history(served_path, tmp_path):
+    frames_metrics: list[pl.DataFrame] = []
+    with serve_ogd_files(served_path) as base_url:
+        for history_days in (0, 60):
+            data_path: Path = Path(tmp_path, str(history_days))
+            data_path.mkdir()
+            DataPreparation(
+                data_path=data_path,
+                parquet_flag=True,
+                weather_flag=True,
+                metrics_flag=True,
+                base_url=base_url,
+                retention=RetentionPolicy(history_days=history_days),
+            ).prepare_data()
+            frames_metrics.append(
+                pl.read_parquet(Path(data_path, 'metrics.parquet'))
+                .filter(pl.col('time_period') == 30)
+                .sort('station_abbr', 'parameter')
+            )
+    assert_frame_equal(*frames_metrics)
+
+
+@pytest.mark.integration
+def test_data_preparation_history_beyond_hourly_window(served_path, tmp_path):
+    retention: RetentionPolicy = RetentionPolicy(hourly_days=30, history_days=60)
+    with serve_ogd_files(served_path) as base_url:
+        for update_flag in (False, True):
+            DataPreparation(
+                data_path=tmp_path,
+                parquet_flag=True,
+                weather_flag=True,
+                update_flag=update_flag,
+                base_url=base_url,
+                retention=retention,
+            ).prepare_data()
+    frame_weather: pl.DataFrame = pl.read_parquet(
+        Path(tmp_path, 'weather_data.parquet')
+    )
+    frame_history: pl.DataFrame = pl.read_parquet(
+        Path(tmp_path, 'weather_history.parquet')
+    )
+    assert frame_weather['reference_timestamp'].min() >= datetime.now(
+        tz=ZoneInfo(TIMEZONE_SWITZERLAND_STRING)
+    ) - timedelta(days=30)
+    assert (
+        frame_history['reference_timestamp'].min()
+        < frame_weather['reference_timestamp'].min()
+    )
+    assert frame_history['reference_timestamp'].n_unique() >= N_DAYS - 2
+    assert frame_history['station_abbr'].n_unique() == N_STATIONS
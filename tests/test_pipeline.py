@@ -0,0 +1,91 @@
+"""Tests module meteoshrooms.benchmark.pipeline.py"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from meteoshrooms.benchmark.pipeline import (
+    StepResult,
+    benchmark_pipeline_scale,
+    compare_results,
+    load_results_json,
+    write_results_json,
+)
+from meteoshrooms.benchmark.synthetic import (
+    generate_weather_frame,
+    write_station_csv_dataset,
+)
+
+
+def create_step_result(step: str, seconds: float) -> StepResult:
+    return StepResult(
+        scale='small', n_stations=2, n_days=3, step=step, seconds=seconds, rows=10
+    )
+
+
+def test_write_station_csv_dataset_splits_now_and_recent(tmp_path):
+    frame_weather: pl.DataFrame = generate_weather_frame(n_stations=2, n_days=3)
+    write_station_csv_dataset(frame_weather, tmp_path, precipitation_stations=['AAA'])
+    assert sorted(file_path.name for file_path in tmp_path.iterdir()) == [
+        'ogd-smn-precip_aaa_h_now.csv',
+        'ogd-smn-precip_aaa_h_recent.csv',
+        'ogd-smn_aab_h_now.csv',
+        'ogd-smn_aab_h_recent.csv',
+    ]
+    assert pl.read_csv(
+        Path(tmp_path, 'ogd-smn-precip_aaa_h_now.csv'), separator=';'
+    ).columns == ['station_abbr', 'reference_timestamp', 'rre150h0']
+    assert (
+        sum(
+            pl.read_csv(file_path, separator=';').height
+            for file_path in tmp_path.iterdir()
+        )
+        == frame_weather.height
+    )
+
+
+class TestCompareResults:
+    """Tests function compare_results()"""
+
+    def test_slowdown_beyond_tolerance_is_regression(self):
+        [regression] = compare_results(
+            [create_step_result('parse', 1.0), create_step_result('sink', 1.0)],
+            [create_step_result('parse', 1.5), create_step_result('sink', 1.1)],
+            tolerance=0.2,
+        )
+        assert regression.step == 'parse'
+        assert regression.ratio == pytest.approx(1.5)
+
+    def test_slowdown_below_noise_floor_is_ignored(self):
+        assert not compare_results(
+            [create_step_result('parse', 0.001)], [create_step_result('parse', 0.005)]
+        )
+
+    def test_steps_missing_from_baseline_are_ignored(self):
+        assert not compare_results([], [create_step_result('parse', 1.0)])
+
+
+def test_results_json_round_trip(tmp_path):
+    results: list[StepResult] = [create_step_result('parse', 0.5)]
+    file_path: Path = Path(tmp_path, 'results.json')
+    write_results_json(results, file_path)
+    assert load_results_json(file_path) == results
+
+
+@pytest.mark.performance
+def test_benchmark_pipeline_scale_times_every_step(tmp_path):
+    results: list[StepResult] = benchmark_pipeline_scale(
+        'tiny', n_stations=5, n_days=3, work_path=tmp_path, repeat=1
+    )
+    assert [result.step for result in results] == [
+        'load_weather',
+        'concat_rainfall_weather_lazyframes',
+        'sink weather_data',
+        'update_weather_data',
+        'create_metrics',
+        'sink metrics',
+        'sink weather rollups',
+    ]
+    assert all(result.seconds > 0 and result.rows > 0 for result in results)
+    assert results[0].rows == results[1].rows == results[2].rows
@@ -0,0 +1,124 @@
+"""Tests module meteoshrooms.data_preparation.retention.py"""
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.retention import (
+    RetentionPolicy,
+    create_weather_history,
+    save_weather_history,
+    scan_weather_history,
+)
+
+END: datetime = datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+
+
+@pytest.fixture
+def frame_weather() -> pl.LazyFrame:
+    return generate_weather_frame(n_stations=3, n_days=10, end=END).lazy()
+
+
+class TestRetentionPolicy:
+    """Tests class RetentionPolicy"""
+
+    @pytest.mark.parametrize(
+        'history_days, keeps_history', [(0, False), (31, False), (365, True)]
+    )
+    def test_history_kept_beyond_hourly_window(self, history_days, keeps_history):
+        assert (
+            RetentionPolicy(hourly_days=31, history_days=history_days).keeps_history
+            is keeps_history
+        )
+
+    @pytest.mark.parametrize('hourly_days', [0, 10, 29])
+    def test_hourly_window_shorter_than_time_periods_raises(self, hourly_days):
+        with pytest.raises(ValueError):
+            RetentionPolicy(hourly_days=hourly_days)
+
+
+class TestCreateWeatherHistory:
+    """Tests function create_weather_history()"""
+
+    def test_day_cut_off_by_since_left_out(self, frame_weather):
+        since: datetime = END - timedelta(days=5, hours=6)
+        frame_history: pl.DataFrame = create_weather_history(
+            frame_weather.filter(pl.col('reference_timestamp') >= since), since
+        ).collect()
+        assert frame_history['reference_timestamp'].min() == END - timedelta(days=5)
+        assert frame_history.height == 3 * 6
+
+    def test_precipitation_totals_of_complete_days(self, frame_weather):
+        since: datetime = END - timedelta(days=10)
+        assert_frame_equal(
+            create_weather_history(frame_weather, since)
+            .filter(pl.col('reference_timestamp') < END)
+            .group_by('station_abbr')
+            .agg(pl.sum('rre150h0'))
+            .collect(),
+            frame_weather.filter(pl.col('reference_timestamp') < END)
+            .group_by('station_abbr')
+            .agg(pl.sum('rre150h0'))
+            .collect(),
+            check_row_order=False,
+            rel_tol=1e-4,
+        )
+
+
+class TestSaveWeatherHistory:
+    """Tests function save_weather_history()"""
+
+    def test_history_extends_beyond_hourly_window(self, frame_weather, tmp_path):
+        history_since: datetime = END - timedelta(days=30)
+        for days_before_end in (10, 3):
+            since: datetime = END - timedelta(days=days_before_end)
+            save_weather_history(
+                frame_weather.filter(pl.col('reference_timestamp') >= since),
+                tmp_path,
+                since=since,
+                history_since=history_since,
+            )
+        frame_history: pl.DataFrame = scan_weather_history(tmp_path).collect()
+        assert frame_history['reference_timestamp'].min() == END - timedelta(days=10)
+        assert frame_history.height == 3 * 11
+        assert (
+            frame_history.select('station_abbr', 'reference_timestamp')
+            .is_unique()
+            .all()
+        )
+
+    def test_buckets_replaced_and_old_ones_removed(self, frame_weather, tmp_path):
+        since: datetime = END - timedelta(days=10)
+        save_weather_history(frame_weather, tmp_path, since, history_since=since)
+        save_weather_history(
+            frame_weather.with_columns(pl.col('tre200h0') + 1),
+            tmp_path,
+            since,
+            history_since=END - timedelta(days=4),
+        )
+        frame_history: pl.DataFrame = scan_weather_history(tmp_path).collect()
+        assert frame_history['reference_timestamp'].min() == END - timedelta(days=4)
+        assert_frame_equal(
+            frame_history,
+            create_weather_history(
+                frame_weather.with_columns(pl.col('tre200h0') + 1), since
+            )
+            .filter(pl.col('reference_timestamp') >= END - timedelta(days=4))
+            .collect(),
+            check_row_order=False,
+        )
+
+    def test_scan_since_skips_older_days(self, frame_weather, tmp_path):
+        since: datetime = END - timedelta(days=10)
+        save_weather_history(frame_weather, tmp_path, since, history_since=since)
+        assert (
+            scan_weather_history(tmp_path, since=END - timedelta(days=2))
+            .collect()['reference_timestamp']
+            .n_unique()
+            == 3
+        )
@@ -0,0 +1,64 @@
+"""Tests module meteoshrooms.data_preparation.rollups.py"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.rollups import (
+    create_weather_rollups,
+    save_weather_rollups,
+    scan_weather_rollups,
+)
+
+END: datetime = datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+
+
+@pytest.fixture
+def frame_weather() -> pl.LazyFrame:
+    return generate_weather_frame(n_stations=3, n_days=10, end=END).lazy()
+
+
+class TestCreateWeatherRollups:
+    """Tests function create_weather_rollups()"""
+
+    def test_precipitation_totals_preserved(self, frame_weather):
+        frame_rollup: pl.DataFrame = create_weather_rollups(frame_weather).collect()
+        totals: pl.DataFrame = (
+            frame_weather.group_by('station_abbr').agg(pl.sum('rre150h0')).collect()
+        )
+        for interval in ('6h', '1d'):
+            assert_frame_equal(
+                frame_rollup.filter(pl.col('interval') == interval)
+                .group_by('station_abbr')
+                .agg(pl.sum('rre150h0')),
+                totals,
+                check_row_order=False,
+                rel_tol=1e-4,
+            )
+
+    def test_one_bucket_per_interval(self, frame_weather):
+        assert dict(
+            create_weather_rollups(frame_weather)
+            .filter(pl.col('station_abbr') == 'AAA')
+            .group_by('interval')
+            .len()
+            .collect()
+            .iter_rows()
+        ) == {'6h': 10 * 4 + 1, '1d': 10 + 1}
+
+
+class TestScanWeatherRollups:
+    """Tests function scan_weather_rollups()"""
+
+    def test_scan_returns_one_interval_since(self, frame_weather, tmp_path):
+        save_weather_rollups(frame_weather, tmp_path)
+        frame_rollup: pl.DataFrame = scan_weather_rollups(
+            tmp_path, '1d', since=datetime(2025, 9, 28, tzinfo=END.tzinfo)
+        ).collect()
+        assert 'interval' not in frame_rollup.columns
+        assert frame_rollup.height == 3 * 4
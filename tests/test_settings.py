@@ -0,0 +1,28 @@
+"""Tests module meteoshrooms.dashboard.settings.py"""
+
+import subprocess
+import sys
+
+from meteoshrooms.dashboard import settings
+
+
+class TestGetArgs:
+    """Tests function get_args()"""
+
+    def test_foreign_arguments_ignored(self, monkeypatch):
+        monkeypatch.setattr(sys, 'argv', ['meta_map', '--help', '--debug'])
+        settings.get_args.cache_clear()
+        try:
+            assert settings.get_args().debug
+        finally:
+            settings.get_args.cache_clear()
+
+    def test_importing_cli_keeps_its_help(self):
+        result: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, '-m', 'meteoshrooms.benchmark.meta_map', '--help'],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert '--map-render' not in result.stdout
+        assert 'Usage: ' in result.stdout
@@ -0,0 +1,21 @@
+"""Tests module meteoshrooms.benchmark.streaming_pipeline.py"""
+
+import pytest
+
+from meteoshrooms.benchmark.streaming_pipeline import (
+    PipelineResult,
+    benchmark_streaming_pipeline,
+)
+
+
+@pytest.mark.performance
+class TestBenchmarkStreamingPipeline:
+    """Tests function benchmark_streaming_pipeline()"""
+
+    def test_both_modes_prepare_same_rows(self, tmp_path):
+        results: list[PipelineResult] = benchmark_streaming_pipeline(
+            n_stations=3, n_days=40, work_path=tmp_path
+        )
+        assert [result.mode for result in results] == ['in-memory', 'streaming']
+        assert results[0].rows == results[1].rows > 0
+        assert all(result.peak_rss_bytes > 0 for result in results)
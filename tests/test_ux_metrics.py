@@ -1 +1,127 @@
-# Will contain tests for ux_metrics.py
+"""Tests module meteoshrooms.dashboard.ux_metrics.py"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+
+from meteoshrooms.benchmark.metric_tiles import evaluate_metric_tiles_per_tile
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.constants import TIME_PERIOD_VALUES, TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.dashboard.constants import (
+    METRICS_STRINGS,
+    NUM_DAYS_DELTA,
+    NUM_DAYS_VAL,
+)
+from meteoshrooms.dashboard.ux_metrics import (
+    MetricsIndex,
+    MetricTile,
+    create_metric_tooltips,
+    evaluate_metric_tiles,
+    format_metric_delta,
+)
+from meteoshrooms.data_preparation.data_preparation import create_metrics
+
+END: datetime = datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING))
+
+
+@pytest.fixture(scope='module')
+def metrics() -> pl.DataFrame:
+    return (
+        create_metrics(
+            generate_weather_frame(n_stations=6, n_days=31, end=END).lazy(),
+            {period: END - timedelta(days=period) for period in TIME_PERIOD_VALUES},
+        )
+        .collect()
+        .pivot(
+            'parameter',
+            index=('station_abbr', 'station_name', 'time_period'),
+            values='value',
+        )
+        .with_columns(
+            pl.when(pl.col('station_name') == 'Aab')
+            .then(None)
+            .otherwise(pl.col('tre200h0'))
+            .alias('tre200h0')
+        )
+        .filter(
+            (pl.col('station_name') != 'Aac')
+            | (pl.col('time_period') != NUM_DAYS_DELTA)
+        )
+    )
+
+
+@pytest.fixture(scope='module')
+def metrics_index(metrics) -> MetricsIndex:
+    return MetricsIndex.from_metrics(metrics)
+
+
+class TestMetricsIndex:
+    """Tests class MetricsIndex built from evaluate_metric_tiles()"""
+
+    def test_tiles_equal_per_tile_queries(self, metrics, metrics_index):
+        station_names: list[str] = metrics['station_name'].unique().sort().to_list()
+        tiles: list[MetricTile] = [
+            tile
+            for station_name in station_names
+            for tile in metrics_index.tiles(station_name, NUM_DAYS_VAL, METRICS_STRINGS)
+        ]
+        for tile, (val, delta) in zip(
+            tiles,
+            evaluate_metric_tiles_per_tile(metrics.lazy(), station_names),
+            strict=True,
+        ):
+            assert tile.value == pytest.approx(val)
+            if val is not None:
+                assert format_metric_delta(tile.delta) == delta
+
+    def test_missing_keys_return_none(self, metrics_index):
+        assert metrics_index.get('Aab', NUM_DAYS_VAL, 'tre200h0') is None
+        assert metrics_index.get('Aac', NUM_DAYS_DELTA, 'rre150h0') is None
+        assert metrics_index.get_delta('Aac', NUM_DAYS_VAL, 'rre150h0') is None
+        assert metrics_index.get('Unknown', NUM_DAYS_VAL, 'rre150h0') is None
+
+    def test_duplicated_station_has_no_values(self, metrics):
+        metrics_index: MetricsIndex = MetricsIndex.from_metrics(
+            pl.concat((metrics, metrics.filter(pl.col('station_name') == 'Aaa')))
+        )
+        assert metrics_index.get('Aaa', NUM_DAYS_VAL, 'rre150h0') is None
+
+
+class TestEvaluateMetricTiles:
+    """Tests function evaluate_metric_tiles()"""
+
+    def test_batch_runs_one_query_instead_of_one_per_tile(self, metrics, monkeypatch):
+        station_names: list[str] = metrics['station_name'].unique().sort()[:5].to_list()
+        collect_counts: Counter[str] = Counter()
+        collect = pl.LazyFrame.collect
+        for path, evaluate in (
+            ('per_tile', evaluate_metric_tiles_per_tile),
+            ('batch', evaluate_metric_tiles),
+        ):
+
+            def count_collect(self, *args, _path: str = path, **kwargs):
+                collect_counts[_path] += 1
+                return collect(self, *args, **kwargs)
+
+            monkeypatch.setattr(pl.LazyFrame, 'collect', count_collect)
+            evaluate(metrics.lazy(), station_names)
+            monkeypatch.undo()
+        assert collect_counts['batch'] == 1
+        assert collect_counts['per_tile'] >= 10 * len(station_names)
+
+
+def test_create_metric_tooltips():
+    meta_parameters: pl.DataFrame = pl.DataFrame(
+        {
+            'parameter_shortname': ['rre150h0', 'tre200h0', 'ure200h0'],
+            'parameter_unit': ['mm', '°C', '%'],
+        }
+    )
+    assert create_metric_tooltips(
+        meta_parameters,
+        {'rre150h0': 'Precipitation', 'tre200h0': 'Air temperature'},
+        metric_names=('rre150h0', 'tre200h0'),
+    ) == {'rre150h0': 'Precipitation in mm', 'tre200h0': 'Air temperature in °C'}
@@ -0,0 +1,157 @@
+"""Tests module meteoshrooms.data_preparation.watermarks.py"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.constants import SCHEMA_WATERMARKS
+from meteoshrooms.data_preparation.data_preparation import (
+    create_kwargs_lazyframe,
+    update_weather_data,
+)
+from meteoshrooms.data_preparation.download import DownloadResult
+from meteoshrooms.data_preparation.watermarks import (
+    filter_changed_urls,
+    filter_stations_due,
+    load_watermarks,
+    save_watermarks,
+    update_watermarks,
+)
+
+TZ: ZoneInfo = ZoneInfo(TIMEZONE_SWITZERLAND_STRING)
+NOW: datetime = datetime.now(tz=TZ).replace(minute=0, second=0, microsecond=0)
+WEATHER_COLUMNS: tuple[str, ...] = (
+    'rre150h0',
+    'tre200h0',
+    'ure200h0',
+    'fu3010h0',
+    'tde200h0',
+)
+URL_BASE: str = 'https://data.geo.admin.ch/ch.meteoschweiz.ogd-smn'
+
+
+def create_weather_frame(station_abbr: str, hours: range) -> pl.LazyFrame:
+    return pl.LazyFrame(
+        {
+            'station_abbr': station_abbr,
+            'reference_timestamp': [NOW - timedelta(hours=h) for h in hours],
+        }
+        | {column: 1.0 for column in WEATHER_COLUMNS}
+    ).with_columns(
+        pl.col('reference_timestamp').dt.convert_time_zone(TIMEZONE_SWITZERLAND_STRING),
+        pl.col(WEATHER_COLUMNS).cast(pl.Float32),
+        pl.lit(station_abbr.title()).alias('station_name'),
+    )
+
+
+def write_now_csv(down_path: Path, station_abbr: str, hours: range) -> None:
+    create_weather_frame(station_abbr, hours).drop('station_name').with_columns(
+        pl.col('reference_timestamp').dt.strftime('%d.%m.%Y %H:%M')
+    ).collect().write_csv(
+        Path(down_path, f'ogd-smn_{station_abbr.lower()}_h_now.csv'), separator=';'
+    )
+
+
+@pytest.fixture
+def watermarks() -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            'station_abbr': ['ABO', 'BER'],
+            'last_timestamp': [NOW - timedelta(hours=5), NOW - timedelta(hours=10)],
+            'source_url': [f'{URL_BASE}/abo/ogd-smn_abo_h_now.csv', None],
+            'source_fingerprint': ['abc', None],
+        },
+    ).cast(SCHEMA_WATERMARKS)
+
+
+class TestFilterStationsDue:
+    """Tests function filter_stations_due()"""
+
+    def test_up_to_date_stations_are_skipped(self, watermarks):
+        up_to_date: pl.DataFrame = watermarks.with_columns(
+            pl.when(pl.col('station_abbr') == 'ABO')
+            .then(pl.lit(NOW))
+            .otherwise(pl.col('last_timestamp'))
+            .alias('last_timestamp')
+        )
+        assert filter_stations_due(
+            pl.Series(['abo', 'ber', 'cha']), up_to_date, NOW
+        ).to_list() == ['ber', 'cha']
+
+
+class TestFilterChangedUrls:
+    """Tests function filter_changed_urls()"""
+
+    def test_unchanged_fingerprint_is_skipped(self, watermarks):
+        urls: pl.Series = pl.Series(
+            [
+                f'{URL_BASE}/abo/ogd-smn_abo_h_now.csv',
+                f'{URL_BASE}/ber/ogd-smn_ber_h_now.csv',
+            ]
+        )
+        download_results: list[DownloadResult] = [
+            DownloadResult(url, None, 200, 0, 0.0, fingerprint='abc') for url in urls
+        ]
+        assert filter_changed_urls(urls, download_results, watermarks).to_list() == [
+            urls[1]
+        ]
+
+
+class TestUpdateWeatherData:
+    """Tests function update_weather_data() with per-station watermarks"""
+
+    def test_lagging_station_keeps_rows_after_its_watermark(self, watermarks, tmp_path):
+        for station_abbr in ('ABO', 'BER'):
+            write_now_csv(tmp_path, station_abbr, range(12, 0, -1))
+        weather: pl.LazyFrame = pl.concat(
+            (
+                create_weather_frame('ABO', range(30, 4, -1)),
+                create_weather_frame('BER', range(30, 9, -1)),
+            )
+        )
+        weather_appended: pl.DataFrame = update_weather_data(
+            tmp_path,
+            create_kwargs_lazyframe(dict.fromkeys(WEATHER_COLUMNS, pl.Float32)),
+            pl.LazyFrame(
+                {'station_abbr': ['ABO', 'BER'], 'station_name': ['Abo', 'Ber']}
+            ),
+            pl.Series(['ber'], dtype=pl.String).clear(),
+            pl.Series(['abo', 'ber']),
+            weather=weather,
+            append_only=True,
+            watermarks=watermarks,
+        ).collect()
+        assert dict(weather_appended.group_by('station_abbr').len().iter_rows()) == {
+            'ABO': 4,
+            'BER': 9,
+        }
+
+
+class TestSaveWatermarks:
+    """Tests functions update_watermarks(), save_watermarks() and load_watermarks()"""
+
+    def test_watermarks_advance_and_persist(self, watermarks, tmp_path):
+        url: str = f'{URL_BASE}/ber/ogd-smn_ber_h_now.csv'
+        save_watermarks(
+            update_watermarks(
+                watermarks,
+                create_weather_frame('BER', range(3, 0, -1)),
+                [DownloadResult(url, None, 200, 0, 0.0, fingerprint='def')],
+            ),
+            tmp_path,
+        )
+        loaded: pl.DataFrame | None = load_watermarks(tmp_path)
+        assert loaded is not None
+        assert loaded.row(by_predicate=pl.col('station_abbr') == 'BER') == (
+            'BER',
+            NOW - timedelta(hours=1),
+            url,
+            'def',
+        )
+        assert loaded.row(by_predicate=pl.col('station_abbr') == 'ABO') == tuple(
+            watermarks.row(0)
+        )
@@ -0,0 +1,132 @@
+"""Tests module meteoshrooms.data_preparation.weather_store.py"""
+
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.weather_store import (
+    create_partition_path,
+    prune_weather_partitions,
+    scan_weather_dataset,
+    write_weather_partitions,
+)
+
+TZ: ZoneInfo = ZoneInfo(TIMEZONE_SWITZERLAND_STRING)
+
+
+def create_weather_frame(
+    station_abbrs: tuple[str, ...], start: datetime, end: datetime, value: float
+) -> pl.LazyFrame:
+    return (
+        pl.LazyFrame({'station_abbr': station_abbrs})
+        .join(
+            pl.LazyFrame(
+                {
+                    'reference_timestamp': pl.datetime_range(
+                        start, end, interval='1h', eager=True, time_zone=str(TZ)
+                    )
+                }
+            ),
+            how='cross',
+        )
+        .with_columns(
+            pl.lit(value, dtype=pl.Float32).alias('rre150h0'),
+            pl.col('station_abbr').str.to_lowercase().alias('station_name'),
+        )
+    )
+
+
+@pytest.fixture
+def dataset_path(tmp_path) -> Path:
+    dataset_path: Path = Path(tmp_path, 'weather_data')
+    write_weather_partitions(
+        create_weather_frame(
+            ('ABO', 'BER'),
+            datetime(2025, 9, 29, tzinfo=TZ),
+            datetime(2025, 10, 2, tzinfo=TZ),
+            value=1.0,
+        ),
+        dataset_path,
+    )
+    return dataset_path
+
+
+class TestWriteWeatherPartitions:
+    """Tests function write_weather_partitions()"""
+
+    def test_partitions_created_per_station_and_month(self, dataset_path):
+        assert sorted(
+            p.relative_to(dataset_path).as_posix()
+            for p in dataset_path.rglob('*.parquet')
+        ) == [
+            'station_abbr=ABO/month=2025-09/data.parquet',
+            'station_abbr=ABO/month=2025-10/data.parquet',
+            'station_abbr=BER/month=2025-09/data.parquet',
+            'station_abbr=BER/month=2025-10/data.parquet',
+        ]
+
+    def test_update_only_writes_affected_partitions(self, dataset_path):
+        written_paths: list[Path] = write_weather_partitions(
+            create_weather_frame(
+                ('ABO',),
+                datetime(2025, 10, 2, 1, tzinfo=TZ),
+                datetime(2025, 10, 2, 3, tzinfo=TZ),
+                value=2.0,
+            ),
+            dataset_path,
+        )
+        assert written_paths == [create_partition_path(dataset_path, 'ABO', '2025-10')]
+
+    def test_merge_replaces_rows_of_same_timestamp(self, dataset_path):
+        write_weather_partitions(
+            create_weather_frame(
+                ('ABO',),
+                datetime(2025, 10, 2, tzinfo=TZ),
+                datetime(2025, 10, 2, 1, tzinfo=TZ),
+                value=2.0,
+            ),
+            dataset_path,
+        )
+        frame_weather: pl.DataFrame = (
+            scan_weather_dataset(dataset_path)
+            .filter(pl.col('station_abbr') == 'ABO')
+            .collect()
+        )
+        assert frame_weather.height == 74
+        assert frame_weather.filter(pl.col('rre150h0') == 2.0).height == 2
+
+
+class TestScanWeatherDataset:
+    """Tests function scan_weather_dataset()"""
+
+    def test_scan_returns_written_rows(self, dataset_path):
+        assert_frame_equal(
+            scan_weather_dataset(dataset_path),
+            create_weather_frame(
+                ('ABO', 'BER'),
+                datetime(2025, 9, 29, tzinfo=TZ),
+                datetime(2025, 10, 2, tzinfo=TZ),
+                value=1.0,
+            ),
+            check_row_order=False,
+        )
+
+    def test_scan_since_prunes_month_partitions(self, dataset_path):
+        frame_weather: pl.LazyFrame = scan_weather_dataset(
+            dataset_path, since=datetime(2025, 10, 1, 12, tzinfo=TZ)
+        )
+        assert 'month=2025-09' not in frame_weather.explain()
+        assert frame_weather.collect().height == 2 * 13
+
+
+class TestPruneWeatherPartitions:
+    """Tests function prune_weather_partitions()"""
+
+    def test_prune_removes_months_before_cutoff(self, dataset_path):
+        prune_weather_partitions(dataset_path, datetime(2025, 10, 1, 12, tzinfo=TZ))
+        assert {p.name for p in dataset_path.glob('*/*')} == {'month=2025-10'}
@@ -0,0 +1,66 @@
+"""Tests module meteoshrooms.benchmark.write_profiles.py"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import polars as pl
+import pytest
+
+from meteoshrooms.benchmark.synthetic import generate_weather_frame
+from meteoshrooms.benchmark.write_profiles import (
+    WriteProfileResult,
+    benchmark_write_profiles,
+)
+from meteoshrooms.constants import TIMEZONE_SWITZERLAND_STRING
+from meteoshrooms.data_preparation.constants import (
+    PARQUET_WRITE_PROFILES,
+    ParquetWriteProfile,
+)
+
+
+@pytest.fixture(scope='module')
+def frame_weather() -> pl.DataFrame:
+    return generate_weather_frame(
+        n_stations=20,
+        n_days=7,
+        end=datetime(2025, 10, 1, tzinfo=ZoneInfo(TIMEZONE_SWITZERLAND_STRING)),
+    )
+
+
+class TestGenerateWeatherFrame:
+    """Tests function generate_weather_frame()"""
+
+    def test_one_row_per_station_and_hour(self, frame_weather):
+        assert frame_weather.height == 20 * (7 * 24 + 1)
+        assert (
+            frame_weather.select('station_abbr', 'reference_timestamp')
+            .is_unique()
+            .all()
+        )
+
+
+class TestBenchmarkWriteProfiles:
+    """Tests function benchmark_write_profiles()"""
+
+    @pytest.mark.performance
+    def test_every_profile_reported(self, frame_weather):
+        results: list[WriteProfileResult] = benchmark_write_profiles(
+            frame_weather, repeat=1
+        )
+        assert [result.profile for result in results] == list(PARQUET_WRITE_PROFILES)
+        assert all(result.file_bytes > 0 for result in results)
+
+    def test_profiles_round_trip(self, frame_weather, tmp_path):
+        for profile, parquet_kwargs in PARQUET_WRITE_PROFILES.items():
+            frame_weather.write_parquet(
+                f'{tmp_path}/{profile}.parquet', **parquet_kwargs
+            )
+            assert pl.read_parquet(f'{tmp_path}/{profile}.parquet').equals(
+                frame_weather
+            )
+
+
+def test_write_profile_choices_match_profiles():
+    assert [profile.value for profile in ParquetWriteProfile] == list(
+        PARQUET_WRITE_PROFILES
+    )